@@ -0,0 +1,110 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-08-21 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "teams",
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("settings", sa.String(1000), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("idx_teams_name", "teams", ["name"])
+
+    op.create_table(
+        "users",
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("avatar", sa.String(500), nullable=True),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_verified", sa.Boolean(), nullable=False),
+        sa.Column("role", sa.String(50), nullable=False),
+        sa.Column("team_id", UUID(as_uuid=True), sa.ForeignKey("teams.id"), nullable=False),
+        *_timestamps(),
+        sa.UniqueConstraint("email", name="uq_users_email"),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("idx_users_team_id", "users", ["team_id"])
+    op.create_index("idx_users_role", "users", ["role"])
+
+    op.create_table(
+        "projects",
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("settings", sa.String(1000), nullable=True),
+        sa.Column("owner_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("team_id", UUID(as_uuid=True), sa.ForeignKey("teams.id"), nullable=False),
+        *_timestamps(),
+    )
+    op.create_index("idx_projects_owner_id", "projects", ["owner_id"])
+    op.create_index("idx_projects_team_id", "projects", ["team_id"])
+    op.create_index("idx_projects_status", "projects", ["status"])
+
+    op.create_table(
+        "sprints",
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("goal", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("start_date", sa.DateTime(), nullable=False),
+        sa.Column("end_date", sa.DateTime(), nullable=False),
+        sa.Column("project_id", UUID(as_uuid=True), sa.ForeignKey("projects.id"), nullable=False),
+        *_timestamps(),
+    )
+    op.create_index("idx_sprints_project_id", "sprints", ["project_id"])
+    op.create_index("idx_sprints_status", "sprints", ["status"])
+    op.create_index("idx_sprints_start_date", "sprints", ["start_date"])
+    op.create_index("idx_sprints_end_date", "sprints", ["end_date"])
+
+    op.create_table(
+        "tasks",
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("priority", sa.String(50), nullable=False),
+        sa.Column("estimated_hours", sa.Integer(), nullable=True),
+        sa.Column("actual_hours", sa.Integer(), nullable=True),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("project_id", UUID(as_uuid=True), sa.ForeignKey("projects.id"), nullable=False),
+        sa.Column("assignee_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("sprint_id", UUID(as_uuid=True), sa.ForeignKey("sprints.id"), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("idx_tasks_project_id", "tasks", ["project_id"])
+    op.create_index("idx_tasks_assignee_id", "tasks", ["assignee_id"])
+    op.create_index("idx_tasks_sprint_id", "tasks", ["sprint_id"])
+    op.create_index("idx_tasks_status", "tasks", ["status"])
+    op.create_index("idx_tasks_priority", "tasks", ["priority"])
+    op.create_index("idx_tasks_due_date", "tasks", ["due_date"])
+    op.create_index("idx_tasks_updated_at", "tasks", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("tasks")
+    op.drop_table("sprints")
+    op.drop_table("projects")
+    op.drop_table("users")
+    op.drop_table("teams")
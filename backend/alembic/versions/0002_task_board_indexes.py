@@ -0,0 +1,65 @@
+"""Composite, partial and covering indexes for the task board
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-08-28 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tasks table writable while large tenants build
+    # the new indexes; it cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_tasks_project_updated", "tasks",
+            ["project_id", "updated_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_tasks_project_status_updated", "tasks",
+            ["project_id", "status", "updated_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_tasks_project_assignee_status", "tasks",
+            ["project_id", "assignee_id", "status", "updated_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_tasks_assignee_status_due_date", "tasks",
+            ["assignee_id", "status", "due_date"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_tasks_open_due_date", "tasks",
+            ["project_id", "due_date"],
+            postgresql_where=sa.text("status <> 'done'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_tasks_board_column", "tasks",
+            ["project_id", "status", "due_date", "id"],
+            postgresql_include=["title", "priority", "assignee_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in (
+            "idx_tasks_board_column",
+            "idx_tasks_open_due_date",
+            "idx_tasks_assignee_status_due_date",
+            "idx_tasks_project_assignee_status",
+            "idx_tasks_project_status_updated",
+            "idx_tasks_project_updated",
+        ):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
@@ -0,0 +1,84 @@
+"""Per-project and per-sprint task stats rollups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-09-04 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = (
+    "task_count",
+    "todo_count",
+    "in_progress_count",
+    "review_count",
+    "done_count",
+    "low_priority_count",
+    "medium_priority_count",
+    "high_priority_count",
+    "urgent_priority_count",
+    "estimated_hours_total",
+    "actual_hours_total",
+    "overdue_count",
+)
+
+
+def _rollup_columns():
+    return [
+        *(sa.Column(name, sa.Integer(), nullable=False, server_default="0") for name in COUNTER_COLUMNS),
+        sa.Column("overdue_as_of", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_stats",
+        sa.Column(
+            "project_id", UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        *_rollup_columns(),
+    )
+    op.create_table(
+        "sprint_stats",
+        sa.Column(
+            "sprint_id", UUID(as_uuid=True),
+            sa.ForeignKey("sprints.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        *_rollup_columns(),
+    )
+    # Backfill from existing tasks; later drift is repaired by scripts.rebuild_stats
+    for table, key in (("project_stats", "project_id"), ("sprint_stats", "sprint_id")):
+        op.execute(
+            f"""
+            INSERT INTO {table} ({key}, task_count, todo_count, in_progress_count, review_count,
+                done_count, low_priority_count, medium_priority_count, high_priority_count,
+                urgent_priority_count, estimated_hours_total, actual_hours_total, overdue_count)
+            SELECT {key}, count(*),
+                count(*) FILTER (WHERE status = 'todo'),
+                count(*) FILTER (WHERE status = 'in_progress'),
+                count(*) FILTER (WHERE status = 'review'),
+                count(*) FILTER (WHERE status = 'done'),
+                count(*) FILTER (WHERE priority = 'low'),
+                count(*) FILTER (WHERE priority = 'medium'),
+                count(*) FILTER (WHERE priority = 'high'),
+                count(*) FILTER (WHERE priority = 'urgent'),
+                coalesce(sum(estimated_hours), 0),
+                coalesce(sum(actual_hours), 0),
+                count(*) FILTER (WHERE status <> 'done' AND due_date < now())
+            FROM tasks WHERE {key} IS NOT NULL GROUP BY {key}
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("sprint_stats")
+    op.drop_table("project_stats")
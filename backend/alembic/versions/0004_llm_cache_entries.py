@@ -0,0 +1,42 @@
+"""Semantic LLM response cache
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-09-11 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+from pgvector.sqlalchemy import Vector
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.create_table(
+        "llm_cache_entries",
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("temperature", sa.Float(), nullable=False),
+        sa.Column("prompt_hash", sa.String(64), nullable=False),
+        sa.Column("embedding", Vector(1536), nullable=False),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+    )
+    op.create_index("idx_llm_cache_entries_model", "llm_cache_entries", ["model", "temperature"])
+    op.create_index("idx_llm_cache_entries_created_at", "llm_cache_entries", ["created_at"])
+    op.create_index(
+        "idx_llm_cache_entries_embedding", "llm_cache_entries", ["embedding"],
+        postgresql_using="hnsw",
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("llm_cache_entries")
@@ -0,0 +1,27 @@
+"""External ids for imported tasks
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-09-18 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("external_id", sa.String(100), nullable=True))
+    # Re-importing an export updates the tasks it created instead of duplicating them
+    op.create_index(
+        "uq_tasks_project_external_id", "tasks", ["project_id", "external_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_tasks_project_external_id", table_name="tasks")
+    op.drop_column("tasks", "external_id")
@@ -0,0 +1,37 @@
+"""Task dependency graph
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-09-22 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_dependencies",
+        sa.Column(
+            "task_id", UUID(as_uuid=True),
+            sa.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column(
+            "depends_on_id", UUID(as_uuid=True),
+            sa.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    # Reverse lookups: what does finishing this task unblock
+    op.create_index("idx_task_dependencies_depends_on_id", "task_dependencies", ["depends_on_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_task_dependencies_depends_on_id", table_name="task_dependencies")
+    op.drop_table("task_dependencies")
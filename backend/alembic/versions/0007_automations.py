@@ -0,0 +1,41 @@
+"""Automation rules
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-09-26 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "automations",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("enabled", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("trigger_type", sa.String(50), nullable=False),
+        sa.Column("trigger_config", sa.JSON(), nullable=False),
+        sa.Column("conditions", sa.JSON(), nullable=False),
+        sa.Column("actions", sa.JSON(), nullable=False),
+        sa.Column(
+            "team_id", UUID(as_uuid=True),
+            sa.ForeignKey("teams.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("idx_automations_team_id_trigger_type", "automations", ["team_id", "trigger_type"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_automations_team_id_trigger_type", table_name="automations")
+    op.drop_table("automations")
@@ -0,0 +1,58 @@
+"""Transactional outbox for domain events
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-09-30 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column("event_type", sa.String(50), nullable=False),
+        sa.Column("aggregate_type", sa.String(50), nullable=False),
+        sa.Column("aggregate_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("project_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("failed_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "idx_outbox_events_pending", "outbox_events", ["id"],
+        postgresql_where=sa.text("failed_at IS NULL"),
+    )
+    # Wake the dispatchers when a transaction that wrote events commits;
+    # notifications repeated within a transaction are delivered once
+    op.execute("""
+        CREATE FUNCTION notify_outbox_events() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('outbox_events', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER outbox_events_notify AFTER INSERT ON outbox_events
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_outbox_events()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER outbox_events_notify ON outbox_events")
+    op.execute("DROP FUNCTION notify_outbox_events()")
+    op.drop_index("idx_outbox_events_pending", table_name="outbox_events")
+    op.drop_table("outbox_events")
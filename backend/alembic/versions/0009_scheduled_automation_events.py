@@ -0,0 +1,26 @@
+"""Team-level outbox events for scheduled automations
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-10-07 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column("outbox_events", "project_id", existing_type=UUID(as_uuid=True), nullable=True)
+    op.add_column("outbox_events", sa.Column("team_id", UUID(as_uuid=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM outbox_events WHERE project_id IS NULL")
+    op.drop_column("outbox_events", "team_id")
+    op.alter_column("outbox_events", "project_id", existing_type=UUID(as_uuid=True), nullable=False)
@@ -0,0 +1,41 @@
+"""Delivered event history for automation replay
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-10-09 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_history",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column("event_type", sa.String(50), nullable=False),
+        sa.Column("aggregate_type", sa.String(50), nullable=False),
+        sa.Column("aggregate_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("project_id", UUID(as_uuid=True), nullable=True),
+        sa.Column("team_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "idx_event_history_team_id_event_type_occurred_at", "event_history",
+        ["team_id", "event_type", "occurred_at", "id"],
+    )
+    op.create_index("idx_event_history_occurred_at", "event_history", ["occurred_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_event_history_occurred_at", table_name="event_history")
+    op.drop_index("idx_event_history_team_id_event_type_occurred_at", table_name="event_history")
+    op.drop_table("event_history")
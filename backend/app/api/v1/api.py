@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import projects, tasks, sprints, users, auth, ai, automations
+from app.api.v1.endpoints import projects, tasks, sprints, users, auth, ai, automations, jobs, imports
 
 api_router = APIRouter()
 
@@ -10,4 +10,6 @@ api_router.include_router(projects.router, prefix="/projects", tags=["projects"]
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 api_router.include_router(sprints.router, prefix="/sprints", tags=["sprints"])
 api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(imports.router, prefix="/imports", tags=["imports"])
 api_router.include_router(automations.router, prefix="/automations", tags=["automations"])
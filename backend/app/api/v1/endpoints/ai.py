@@ -1,54 +1,242 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Literal, Optional
+from contextlib import aclosing
+import json
+import logging
+from uuid import UUID
 from app.core.database import get_db
+from app.schemas.job import JobResponse
+from app.services.ai.llm_service import (
+    CLAUDE_DEFAULT_MODEL, OPENAI_DEFAULT_MODEL, LLMService, get_llm_service,
+)
+from app.services.ai.project_context import load_project_context
+from app.services.jobs.queue import JobQueue, get_job_queue
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(chunks: AsyncIterator[str], model: str) -> StreamingResponse:
+    """Wrap a text stream as server-sent events: `token`* then `done` or `error`.
+
+    When the client disconnects the response task is cancelled, which closes
+    `chunks` and with it the upstream provider request.
+    """
+    async def events():
+        # Flush headers straight away so clients see the stream open
+        yield ": stream open\n\n"
+        received = False
+        try:
+            async with aclosing(chunks) as stream:
+                async for text in stream:
+                    received = True
+                    yield sse_event("token", {"text": text})
+        except Exception as e:
+            logger.error(f"AI stream error: {e}")
+            yield sse_event("error", {"model": model, "status": "error"})
+            return
+        status_value = "success" if received else "error"
+        yield sse_event("done", {"model": model, "status": status_value})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def load_project_data(db: AsyncSession, project_id: UUID) -> dict:
+    project_data = await load_project_context(db, project_id)
+    # Return the connection to the pool before the (much slower) LLM call
+    await db.close()
+    if project_data is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project_data
+
+
 @router.post("/plan")
 async def generate_project_plan(
     plan_data: dict,
-    db: AsyncSession = Depends(get_db)
+    use_cache: bool = True,
+    llm: LLMService = Depends(get_llm_service)
 ):
     """
     Generate project plan using AI.
     """
-    # TODO: Implement AI project planning logic
-    return {
-        "plan": "AI-generated project plan placeholder",
-        "tasks": [],
-        "timeline": "2024-01-01 to 2024-06-30",
-        "risks": []
-    }
+    return await llm.generate_project_plan(
+        plan_data.get("description", ""),
+        constraints=plan_data.get("constraints"),
+        use_cache=use_cache,
+    )
 
 
 @router.post("/analyze")
 async def analyze_project_health(
-    project_id: str,
-    db: AsyncSession = Depends(get_db)
+    project_id: UUID,
+    use_cache: bool = True,
+    db: AsyncSession = Depends(get_db),
+    llm: LLMService = Depends(get_llm_service)
 ):
     """
     Analyze project health and risks.
     """
-    # TODO: Implement AI project analysis logic
-    return {
-        "health_score": 85,
-        "risks": ["Resource constraints", "Timeline delays"],
-        "recommendations": ["Add more developers", "Extend timeline"]
-    }
+    project_data = await load_project_data(db, project_id)
+    return await llm.analyze_project_health(project_data, use_cache=use_cache)
 
 
 @router.post("/summarize")
 async def generate_standup_summary(
     summary_data: dict,
-    db: AsyncSession = Depends(get_db)
+    use_cache: bool = True,
+    llm: LLMService = Depends(get_llm_service)
 ):
     """
     Generate standup summaries.
     """
-    # TODO: Implement AI summarization logic
-    return {
-        "summary": "AI-generated standup summary placeholder",
-        "key_points": ["Task A completed", "Task B in progress"],
-        "blockers": ["Waiting for design approval"]
+    return await llm.generate_standup_summary(summary_data.get("updates", []), use_cache=use_cache)
+
+
+@router.post("/summarize/batch")
+async def summarize_standups(
+    batch_data: dict,
+    use_cache: bool = True,
+    llm: LLMService = Depends(get_llm_service)
+):
+    """
+    Summarize standups for many teams, streamed as NDJSON.
+
+    Body: `{"teams": [{"team_id": ..., "updates": [...]}, ...]}`. Each line is
+    one team's summary, written as soon as it completes.
+    """
+    async def lines():
+        async with aclosing(llm.summarize_standups(batch_data.get("teams", []), use_cache=use_cache)) as results:
+            async for result in results:
+                yield json.dumps(result) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/plan/stream")
+async def stream_project_plan(
+    plan_data: dict,
+    use_cache: bool = True,
+    llm: LLMService = Depends(get_llm_service)
+):
+    """
+    Stream a project plan as server-sent events.
+    """
+    chunks = llm.stream_project_plan(
+        plan_data.get("description", ""),
+        constraints=plan_data.get("constraints"),
+        use_cache=use_cache,
+    )
+    return sse_response(chunks, OPENAI_DEFAULT_MODEL)
+
+
+@router.post("/analyze/stream")
+async def stream_project_health(
+    project_id: UUID,
+    use_cache: bool = True,
+    db: AsyncSession = Depends(get_db),
+    llm: LLMService = Depends(get_llm_service)
+):
+    """
+    Stream a project health analysis as server-sent events.
+    """
+    project_data = await load_project_data(db, project_id)
+    chunks = llm.stream_project_health(project_data, use_cache=use_cache)
+    return sse_response(chunks, CLAUDE_DEFAULT_MODEL)
+
+
+@router.post("/summarize/stream")
+async def stream_standup_summary(
+    summary_data: dict,
+    use_cache: bool = True,
+    llm: LLMService = Depends(get_llm_service)
+):
+    """
+    Stream a standup summary as server-sent events.
+    """
+    chunks = llm.stream_standup_summary(summary_data.get("updates", []), use_cache=use_cache)
+    return sse_response(chunks, OPENAI_DEFAULT_MODEL)
+
+
+@router.post("/plan/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_project_plan(
+    plan_data: dict,
+    lane: Literal["interactive", "batch"] = "interactive",
+    use_cache: bool = True,
+    idempotency_key: Optional[str] = Header(None),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """
+    Queue project plan generation; poll GET /jobs/{id} for the result.
+    """
+    payload = {
+        "description": plan_data.get("description", ""),
+        "constraints": plan_data.get("constraints"),
+        "use_cache": use_cache,
+    }
+    return await jobs.submit("ai.plan", payload, lane=lane, idempotency_key=idempotency_key)
+
+
+@router.post("/analyze/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_project_health(
+    project_id: UUID,
+    lane: Literal["interactive", "batch"] = "interactive",
+    use_cache: bool = True,
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """
+    Queue a project health analysis; poll GET /jobs/{id} for the result.
+    """
+    payload = {
+        "project_data": await load_project_data(db, project_id),
+        "use_cache": use_cache,
+    }
+    return await jobs.submit("ai.analyze", payload, lane=lane, idempotency_key=idempotency_key)
+
+
+@router.post("/summarize/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_standup_summary(
+    summary_data: dict,
+    lane: Literal["interactive", "batch"] = "interactive",
+    use_cache: bool = True,
+    idempotency_key: Optional[str] = Header(None),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """
+    Queue standup summary generation; poll GET /jobs/{id} for the result.
+    """
+    payload = {
+        "updates": summary_data.get("updates", []),
+        "use_cache": use_cache,
+    }
+    return await jobs.submit("ai.summarize", payload, lane=lane, idempotency_key=idempotency_key)
+
+
+@router.post("/summarize/batch/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_standup_batch(
+    batch_data: dict,
+    lane: Literal["interactive", "batch"] = "batch",
+    use_cache: bool = True,
+    idempotency_key: Optional[str] = Header(None),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """
+    Queue a multi-team standup batch (e.g. the morning digest); poll GET /jobs/{id} for the results.
+    """
+    payload = {
+        "teams": batch_data.get("teams", []),
+        "use_cache": use_cache,
     }
+    return await jobs.submit("ai.summarize_batch", payload, lane=lane, idempotency_key=idempotency_key)
@@ -1,80 +1,178 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Any, Dict, Optional
+from uuid import UUID
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortKey, build_page, paginate, resolve_sort_key
+from app.core.replicas import get_read_db
+from app.models.automation import Automation
+from app.models.team import Team
+from app.schemas.automation import AutomationCreate, AutomationResponse, AutomationUpdate
+from app.schemas.job import JobResponse
+from app.schemas.pagination import CursorPage
+from app.services.automations.engine import (
+    AutomationEngine, RuleError, compile_automation, get_automation_engine,
+)
+from app.services.jobs.queue import JobQueue, get_job_queue
 
 router = APIRouter()
 
+AUTOMATION_SORT_KEYS = (
+    SortKey("updated_at", Automation.updated_at, Automation.id, descending=True),
+    SortKey("created_at", Automation.created_at, Automation.id, descending=True),
+)
 
-@router.get("/")
+
+def automation_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Request body fields as Automation columns: the trigger is stored as type + config."""
+    trigger = data.pop("trigger", None)
+    if trigger is not None:
+        data["trigger_type"] = trigger["type"]
+        data["trigger_config"] = trigger["config"]
+    return data
+
+
+def check_rule(automation: Automation) -> None:
+    """Compile the rule before saving it, so a rule that cannot run is rejected up front."""
+    try:
+        compile_automation(automation)
+    except RuleError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+
+@router.get("/", response_model=CursorPage[AutomationResponse])
 async def get_automations(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    team_id: Optional[UUID] = None,
+    trigger_type: Optional[str] = None,
+    enabled: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: str = "updated_at",
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Retrieve all automations.
+    Retrieve automations with filtering and keyset pagination.
     """
-    # TODO: Implement automation retrieval logic
-    return []
+    sort_key = resolve_sort_key(AUTOMATION_SORT_KEYS, sort)
+    query = select(Automation)
+    if team_id:
+        query = query.where(Automation.team_id == team_id)
+    if trigger_type:
+        query = query.where(Automation.trigger_type == trigger_type)
+    if enabled is not None:
+        query = query.where(Automation.enabled.is_(enabled))
+    result = await db.execute(paginate(query, sort_key, cursor, limit))
+    return build_page(result.scalars().all(), sort_key, limit)
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=AutomationResponse, status_code=status.HTTP_201_CREATED)
 async def create_automation(
-    automation_data: dict,
-    db: AsyncSession = Depends(get_db)
+    automation_data: AutomationCreate,
+    db: AsyncSession = Depends(get_db),
+    engine: AutomationEngine = Depends(get_automation_engine)
 ):
     """
     Create a new automation rule.
+
+    The conditions are compiled on save; unknown triggers, operators or actions
+    and operands of the wrong type are rejected with 422.
     """
-    # TODO: Implement automation creation logic
-    return {"id": "placeholder", "name": automation_data.get("name")}
+    if await db.get(Team, automation_data.team_id) is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    automation = Automation(
+        team_id=automation_data.team_id,
+        **automation_fields(automation_data.model_dump(mode="json", exclude={"team_id"})),
+    )
+    check_rule(automation)
+    db.add(automation)
+    await db.commit()
+    engine.apply(automation)
+    await engine.publish()
+    return automation
 
 
-@router.get("/{automation_id}")
+@router.get("/{automation_id}", response_model=AutomationResponse)
 async def get_automation(
-    automation_id: str,
+    automation_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve a specific automation.
     """
-    # TODO: Implement automation retrieval logic
-    raise HTTPException(status_code=404, detail="Automation not found")
+    automation = await db.get(Automation, automation_id)
+    if automation is None:
+        raise HTTPException(status_code=404, detail="Automation not found")
+    return automation
 
 
-@router.put("/{automation_id}")
+@router.put("/{automation_id}", response_model=AutomationResponse)
 async def update_automation(
-    automation_id: str,
-    automation_data: dict,
-    db: AsyncSession = Depends(get_db)
+    automation_id: UUID,
+    automation_data: AutomationUpdate,
+    db: AsyncSession = Depends(get_db),
+    engine: AutomationEngine = Depends(get_automation_engine)
 ):
     """
-    Update an automation.
+    Update an automation; only the fields sent are changed.
     """
-    # TODO: Implement automation update logic
-    raise HTTPException(status_code=404, detail="Automation not found")
+    automation = await db.get(Automation, automation_id, with_for_update=True)
+    if automation is None:
+        raise HTTPException(status_code=404, detail="Automation not found")
+
+    fields = automation_fields(automation_data.model_dump(mode="json", exclude_unset=True))
+    for field, value in fields.items():
+        setattr(automation, field, value)
+    check_rule(automation)
+    await db.commit()
+    engine.apply(automation)
+    await engine.publish()
+    return automation
 
 
 @router.delete("/{automation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_automation(
-    automation_id: str,
-    db: AsyncSession = Depends(get_db)
+    automation_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    engine: AutomationEngine = Depends(get_automation_engine)
 ):
     """
     Delete an automation.
     """
-    # TODO: Implement automation deletion logic
-    raise HTTPException(status_code=404, detail="Automation not found")
+    automation = await db.get(Automation, automation_id)
+    if automation is None:
+        raise HTTPException(status_code=404, detail="Automation not found")
+    await db.delete(automation)
+    await db.commit()
+    engine.remove(automation_id)
+    await engine.publish()
 
 
-@router.post("/{automation_id}/test")
+@router.post("/{automation_id}/test", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def test_automation(
-    automation_id: str,
-    db: AsyncSession = Depends(get_db)
+    automation_id: UUID,
+    days: int = Query(settings.EVENT_HISTORY_RETENTION_DAYS, ge=1, le=settings.EVENT_HISTORY_RETENTION_DAYS),
+    samples: int = Query(10, ge=0, le=settings.AUTOMATION_REPLAY_MAX_SAMPLES),
+    db: AsyncSession = Depends(get_db),
+    jobs: JobQueue = Depends(get_job_queue)
 ):
     """
-    Test an automation rule.
+    Dry-run an automation rule against the last `days` days of events.
+
+    Queues a replay job; poll GET /jobs/{id} for its progress and result (match
+    counts and sample matches). No action is run, and the rule may be disabled.
     """
-    # TODO: Implement automation testing logic
-    return {"result": "Automation test completed successfully"}
+    automation = await db.get(Automation, automation_id)
+    if automation is None:
+        raise HTTPException(status_code=404, detail="Automation not found")
+    check_rule(automation)
+    if automation.trigger_type == "schedule":
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Scheduled automations have no events to replay",
+        )
+    payload = {"automation_id": str(automation_id), "days": days, "samples": samples}
+    # Repeating a test of the same version of the rule returns the same job
+    key = f"{automation_id}:{automation.updated_at.isoformat()}:{days}:{samples}"
+    return await jobs.submit("automations.replay", payload, lane="batch", idempotency_key=key)
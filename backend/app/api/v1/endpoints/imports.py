@@ -0,0 +1,61 @@
+import json
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.query_stats import query_budget
+from app.models.team import Team
+from app.models.user import User
+from app.services.imports.loader import run_import
+from app.services.imports.readers import IMPORT_FORMATS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+# Merging and rollup rebuilds scale with the number of projects imported
+@router.post("/tasks", dependencies=[Depends(query_budget(None, None))])
+async def import_tasks(
+    file: UploadFile = File(...),
+    team_id: UUID = Form(...),
+    owner_id: UUID = Form(...),
+    format: Optional[str] = Form(None),
+    default_project: Optional[str] = Form(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import tasks, sprints, projects and assignees from a Jira CSV or JSONL export.
+
+    Streams NDJSON progress events while the file is staged and merged, ending
+    with a "done" summary (or "failed"). Projects created by the import are
+    owned by `owner_id`; rows without a project go to `default_project`.
+    The format defaults to the file's extension.
+    """
+    fmt = format or (file.filename or "").rsplit(".", 1)[-1].lower()
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Format must be one of: {', '.join(IMPORT_FORMATS)}",
+        )
+    if await db.get(Team, team_id) is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    if await db.get(User, owner_id) is None:
+        raise HTTPException(status_code=404, detail="Owner not found")
+    # The import runs on its own connection for as long as it takes
+    await db.close()
+
+    async def events():
+        try:
+            async for event in run_import(file.file, fmt, team_id, owner_id, default_project):
+                yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            logger.exception("Task import failed")
+            yield json.dumps({"stage": "failed", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.schemas.job import JobResponse
+from app.services.jobs.queue import JobQueue, get_job_queue
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """
+    Get a background job's status and result.
+
+    With `wait`, hold the request open for up to that many seconds until the
+    job finishes (long polling).
+    """
+    job = await jobs.wait(job_id, wait) if wait else await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,24 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime, timezone
+from app.core.cache import read_cache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortKey, build_page, paginate, resolve_sort_key,
+)
+from app.core.replicas import get_read_db
 from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.models.sprint import Sprint
+from app.schemas.forecast import ForecastResponse
+from app.schemas.pagination import CursorPage
+from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectWithStats
+from app.services.forecasting.forecast import forecast
 
 router = APIRouter()
 
+PROJECT_SORT_KEYS = (
+    SortKey("updated_at", Project.updated_at, Project.id, descending=True),
+    SortKey("created_at", Project.created_at, Project.id, descending=True),
+)
 
-@router.get("/", response_model=List[ProjectResponse])
+
+@router.get("/", response_model=CursorPage[ProjectWithStats])
 async def get_projects(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: str = "updated_at",
+    status: Optional[str] = None,
+    team_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Retrieve all projects with pagination.
+    Retrieve projects with task stats and keyset pagination.
+
+    Stats come from the project_stats rollup, joined on its primary key.
     """
-    # TODO: Implement project retrieval logic
-    return []
+    sort_key = resolve_sort_key(PROJECT_SORT_KEYS, sort)
+    query = select(Project).options(joinedload(Project.stats))
+    if status:
+        query = query.where(Project.status == status)
+    if team_id:
+        query = query.where(Project.team_id == team_id)
+    result = await db.execute(paginate(query, sort_key, cursor, limit))
+    return build_page(result.scalars().all(), sort_key, limit)
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -33,16 +63,56 @@ async def create_project(
     return {"id": "placeholder", "name": project.name, "description": project.description}
 
 
-@router.get("/{project_id}", response_model=ProjectResponse)
+@router.get("/{project_id}", response_model=ProjectWithStats)
 async def get_project(
-    project_id: str,
+    project_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve a specific project by ID.
+    Retrieve a specific project by ID, with its task stats.
+
+    Cached under the project's scope, which task writes invalidate.
     """
-    # TODO: Implement project retrieval logic
-    raise HTTPException(status_code=404, detail="Project not found")
+    async def load():
+        project = await db.get(Project, project_id, options=[joinedload(Project.stats)])
+        if project is None:
+            return None
+        return ProjectWithStats.model_validate(project).model_dump(mode="json")
+
+    project = await read_cache.get_or_load(f"project:{project_id}", [f"project:{project_id}"], load)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+
+@router.get("/{project_id}/forecast", response_model=ForecastResponse)
+async def forecast_project(
+    project_id: UUID,
+    sprint_id: Optional[UUID] = None,
+    trials: int = Query(settings.FORECAST_TRIALS, ge=100, le=settings.FORECAST_MAX_TRIALS),
+    seed: Optional[int] = Query(None, ge=0, lt=2 ** 32),
+    target_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Forecast when the project's open tasks (or one sprint's) will be done.
+
+    Runs a Monte Carlo simulation over the team's estimate errors and weekly
+    throughput and returns P50/P85/P95 completion dates, with the chance of
+    finishing by `target_date` and by the sprint's end. Pass `seed` for a
+    reproducible run; results are cached until the project's tasks change.
+    """
+    project = await db.get(Project, project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    sprint = None
+    if sprint_id is not None:
+        sprint = await db.get(Sprint, sprint_id)
+        if sprint is None or sprint.project_id != project_id:
+            raise HTTPException(status_code=404, detail="Sprint not found")
+    if target_date is not None and target_date.tzinfo is not None:
+        target_date = target_date.astimezone(timezone.utc).replace(tzinfo=None)
+    return await forecast(db, project, sprint, trials=trials, seed=seed, target_date=target_date)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
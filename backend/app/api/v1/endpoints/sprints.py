@@ -1,23 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from sqlalchemy.orm import joinedload
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
 from app.core.database import get_db
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortKey, build_page, paginate, resolve_sort_key,
+)
+from app.core.replicas import get_read_db
+from app.models.sprint import Sprint
+from app.schemas.pagination import CursorPage
+from app.schemas.sprint import SprintResponse, SprintUpdate, SprintWithStats
+from app.services.events.outbox import record_event, sprint_payload
 
 router = APIRouter()
 
+SPRINT_SORT_KEYS = (
+    SortKey("start_date", Sprint.start_date, Sprint.id, descending=True),
+    SortKey("updated_at", Sprint.updated_at, Sprint.id, descending=True),
+)
 
-@router.get("/")
+
+@router.get("/", response_model=CursorPage[SprintWithStats])
 async def get_sprints(
-    project_id: str = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    project_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: str = "start_date",
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Retrieve all sprints for a project.
+    Retrieve sprints for a project with task stats and keyset pagination.
+
+    Stats come from the sprint_stats rollup, joined on its primary key.
     """
-    # TODO: Implement sprint retrieval logic
-    return []
+    sort_key = resolve_sort_key(SPRINT_SORT_KEYS, sort)
+    query = select(Sprint).options(joinedload(Sprint.stats))
+    if project_id:
+        query = query.where(Sprint.project_id == project_id)
+    result = await db.execute(paginate(query, sort_key, cursor, limit))
+    return build_page(result.scalars().all(), sort_key, limit)
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
@@ -32,26 +56,67 @@ async def create_sprint(
     return {"id": "placeholder", "name": sprint_data.get("name")}
 
 
-@router.get("/{sprint_id}")
+@router.get("/{sprint_id}", response_model=SprintWithStats)
 async def get_sprint(
-    sprint_id: str,
+    sprint_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve a specific sprint.
+    Retrieve a specific sprint, with its task stats.
     """
-    # TODO: Implement sprint retrieval logic
-    raise HTTPException(status_code=404, detail="Sprint not found")
+    sprint = await db.get(Sprint, sprint_id, options=[joinedload(Sprint.stats)])
+    if sprint is None:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+    return sprint
+
+
+# Status changes that get their own event type, for automations to trigger on
+SPRINT_STATUS_EVENTS = {'active': 'sprint_started', 'completed': 'sprint_completed'}
+
 
+def naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
-@router.put("/{sprint_id}")
+
+@router.put("/{sprint_id}", response_model=SprintResponse)
 async def update_sprint(
-    sprint_id: str,
-    sprint_data: dict,
+    sprint_id: UUID,
+    sprint_data: SprintUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Update a sprint.
+    Update a sprint; only the fields sent are changed.
+
+    Starting or completing a sprint records a `sprint_started` or
+    `sprint_completed` event, any other change a `sprint_updated` one.
     """
-    # TODO: Implement sprint update logic
-    raise HTTPException(status_code=404, detail="Sprint not found")
+    sprint = await db.get(Sprint, sprint_id, with_for_update=True)
+    if sprint is None:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+
+    fields = sprint_data.model_dump(exclude_unset=True)
+    for name in ("start_date", "end_date"):
+        if fields.get(name) is not None:
+            fields[name] = naive_utc(fields[name])
+        elif name in fields:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"{name} cannot be null")
+    if fields.get("end_date", sprint.end_date) <= fields.get("start_date", sprint.start_date):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="End date must be after start date"
+        )
+
+    previous = sprint_payload(sprint)
+    # start_date first: the end_date validator compares against it
+    for field in sorted(fields, key=lambda name: name != "start_date"):
+        setattr(sprint, field, fields[field])
+    await db.flush()
+    data = sprint_payload(sprint)
+    if data != previous:
+        event_type = 'sprint_updated'
+        if data['status'] != previous['status']:
+            event_type = SPRINT_STATUS_EVENTS.get(data['status'], event_type)
+        record_event(db, event_type, "sprint", data, previous)
+    await db.commit()
+    return sprint
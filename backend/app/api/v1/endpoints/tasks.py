@@ -1,71 +1,321 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from app.core.cache import read_cache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortKey, build_page, paginate, resolve_sort_key,
+)
+from app.core.query_stats import query_budget
+from app.core.replicas import get_read_db, uses_read_cache
+from app.models.task import TASK_STATUSES, Task
+from app.schemas.pagination import CursorPage
+from app.schemas.task import (
+    TaskBoard, TaskBulkCreate, TaskBulkMove, TaskBulkPatch, TaskBulkResult, TaskCard,
+    TaskCreate, TaskResponse, TaskUpdate,
+)
+from app.services.events.outbox import record_event, task_payload
+from app.services.stats.rollup import apply_task_change, snapshot_task
+from app.services.tasks import bulk
 
 router = APIRouter()
 
+TASK_SORT_KEYS = (
+    SortKey("updated_at", Task.updated_at, Task.id, descending=True),
+    SortKey("due_date", Task.due_date, Task.id, nullable=True),
+)
 
-@router.get("/")
+# Rows fetched per round-trip from the server-side cursor during exports
+EXPORT_CHUNK_SIZE = 1000
+
+
+def task_scopes(task_id: UUID, *snapshots) -> List[str]:
+    """Cache scopes a task write touches: the task and every project it was or is in."""
+    projects = {snapshot['project_id'] for snapshot in snapshots if snapshot is not None}
+    return [f"task:{task_id}", *(f"project:{project_id}" for project_id in projects)]
+
+
+async def check_task_values(db: AsyncSession, project_id: UUID, task_values: dict, task_id: Optional[UUID] = None):
+    """The bulk endpoints' checks for one task, before anything is written: 422 or 404."""
+    problem = bulk.check_required(task_values) or bulk.check_due_date(task_values, datetime.utcnow())
+    if problem:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=problem)
+    result = bulk.BulkResult()
+    if not await bulk.check_references(db, [(0, task_id, task_values)], {0: project_id}, result):
+        raise HTTPException(status_code=404, detail=result.errors[0]["detail"])
+
+
+def filter_tasks_query(
+    query,
+    project_id: Optional[UUID],
+    assignee_id: Optional[UUID],
+    status: Optional[str],
+    priority: Optional[str],
+):
+    if project_id:
+        query = query.where(Task.project_id == project_id)
+    if assignee_id:
+        query = query.where(Task.assignee_id == assignee_id)
+    if status:
+        query = query.where(Task.status == status)
+    if priority:
+        query = query.where(Task.priority == priority)
+    return query
+
+
+@router.get("/", response_model=CursorPage[TaskResponse])
 async def get_tasks(
-    skip: int = 0,
-    limit: int = 100,
-    project_id: str = None,
-    assignee_id: str = None,
-    status: str = None,
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: str = "updated_at",
+    project_id: Optional[UUID] = None,
+    assignee_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Retrieve tasks with filtering and keyset pagination.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
+    Pages filtered by project and read from the primary are cached until a
+    task in that project changes.
+    """
+    sort_key = resolve_sort_key(TASK_SORT_KEYS, sort)
+    query = filter_tasks_query(select(Task), project_id, assignee_id, status, priority)
+
+    async def load():
+        result = await db.execute(paginate(query, sort_key, cursor, limit))
+        page = build_page(result.scalars().all(), sort_key, limit)
+        return CursorPage[TaskResponse].model_validate(page).model_dump(mode="json")
+
+    if project_id is None or not uses_read_cache(request, db):
+        return await load()
+    name = f"tasks:{project_id}:{sort_key.name}:{limit}:{assignee_id}:{status}:{priority}:{cursor}"
+    return await read_cache.get_or_load(name, [f"project:{project_id}"], load)
+
+
+def board_column_query(project_id: UUID, status: str, limit: int):
+    """One Kanban column, answered by an index-only scan of idx_tasks_board_column."""
+    return (
+        select(
+            Task.id, Task.title, Task.status, Task.priority, Task.due_date, Task.assignee_id,
+        )
+        .where(Task.project_id == project_id, Task.status == status)
+        .order_by(Task.due_date.asc().nulls_last(), Task.id.asc())
+        .limit(limit)
+    )
+
+
+@router.get("/board", response_model=TaskBoard)
+async def get_task_board(
+    project_id: UUID,
+    per_column: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve the first cards of every Kanban column for a project in one round-trip.
+
+    Cached until a task in the project changes.
+    """
+    async def load():
+        query = union_all(
+            *(board_column_query(project_id, column, per_column) for column in TASK_STATUSES)
+        )
+        result = await db.execute(query)
+
+        columns = {column: [] for column in TASK_STATUSES}
+        for row in result.mappings():
+            columns[row["status"]].append(TaskCard.model_validate(dict(row)))
+        board = TaskBoard(project_id=project_id, columns=columns)
+        return board.model_dump(mode="json")
+
+    return await read_cache.get_or_load(
+        f"board:{project_id}:{per_column}", [f"project:{project_id}"], load
+    )
+
+
+@router.get("/export")
+async def export_tasks(
+    project_id: Optional[UUID] = None,
+    assignee_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream all matching tasks as NDJSON.
+
+    Rows are read from a server-side cursor in chunks and serialized as plain
+    column rows, so memory stays flat regardless of how many tasks match.
+    """
+    query = filter_tasks_query(
+        select(*Task.__table__.columns), project_id, assignee_id, status, priority
+    ).order_by(*TASK_SORT_KEYS[0].order_by())
+
+    async def rows():
+        result = await db.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for row in result.mappings():
+            yield TaskResponse.model_validate(dict(row)).model_dump_json() + "\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+# Statements repeat once per TASK_BULK_BATCH_SIZE chunk
+BULK_QUERY_BUDGET = Depends(query_budget(None, None))
+
+
+def check_bulk_size(count: int) -> None:
+    if count > settings.TASK_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.TASK_BULK_MAX_ITEMS} tasks per request",
+        )
+
+
+async def commit_bulk(db: AsyncSession, result: bulk.BulkResult) -> dict:
+    await db.commit()
+    await read_cache.invalidate(*result.cache_scopes())
+    return {"tasks": result.tasks, "errors": result.errors}
+
+
+@router.post("/bulk", response_model=TaskBulkResult, dependencies=[BULK_QUERY_BUDGET])
+async def create_tasks_bulk(
+    data: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many tasks in one transaction.
+
+    Each item is validated as a task creation body. Invalid items are listed in
+    `errors` by their index; the rest are created and returned in request order.
+    """
+    check_bulk_size(len(data.tasks))
+    return await commit_bulk(db, await bulk.create_tasks(db, data.tasks))
+
+
+@router.patch("/bulk", response_model=TaskBulkResult, dependencies=[BULK_QUERY_BUDGET])
+async def update_tasks_bulk(
+    data: TaskBulkPatch,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve all tasks with filtering and pagination.
+    Update many tasks in one transaction.
+
+    Each item is a task update body plus the task's `id`; only the fields it
+    contains are changed. Invalid or unknown items are listed in `errors`.
     """
-    # TODO: Implement task retrieval logic with filters
-    return []
+    check_bulk_size(len(data.tasks))
+    return await commit_bulk(db, await bulk.patch_tasks(db, data.tasks))
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/bulk/move", response_model=TaskBulkResult, dependencies=[BULK_QUERY_BUDGET])
+async def move_tasks_bulk(
+    data: TaskBulkMove,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Move many tasks to a sprint (or the backlog, with `sprint_id: null`) and/or a status column.
+    """
+    check_bulk_size(len(data.task_ids))
+    fields = {name: getattr(data, name) for name in ("sprint_id", "status") if name in data.model_fields_set}
+    if not fields:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Set sprint_id and/or status",
+        )
+    return await commit_bulk(db, await bulk.move_tasks(db, data.task_ids, fields))
+
+
+@router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
-    task_data: dict,
+    task_data: TaskCreate,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new task.
     """
-    # TODO: Implement task creation logic
-    return {"id": "placeholder", "title": task_data.get("title")}
+    task_values = task_data.model_dump()
+    await check_task_values(db, task_values["project_id"], task_values)
+    task = Task(**task_values)
+    db.add(task)
+    await db.flush()
+    after = snapshot_task(task)
+    await apply_task_change(db, None, after)
+    record_event(db, "task_created", "task", task_payload(task))
+    await db.commit()
+    await read_cache.invalidate(*task_scopes(task.id, after))
+    return task
 
 
-@router.get("/{task_id}")
+@router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
-    task_id: str,
+    task_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve a specific task by ID.
     """
-    # TODO: Implement task retrieval logic
-    raise HTTPException(status_code=404, detail="Task not found")
+    async def load():
+        task = await db.get(Task, task_id)
+        return None if task is None else TaskResponse.model_validate(task).model_dump(mode="json")
 
+    task = await read_cache.get_or_load(f"task:{task_id}", [f"task:{task_id}"], load)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
 
-@router.put("/{task_id}")
+
+@router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
-    task_id: str,
-    task_data: dict,
+    task_id: UUID,
+    task_data: TaskUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Update a task.
     """
-    # TODO: Implement task update logic
-    raise HTTPException(status_code=404, detail="Task not found")
+    task = await db.get(Task, task_id, with_for_update=True)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    task_values = task_data.model_dump(exclude_unset=True)
+    await check_task_values(db, task.project_id, task_values, task.id)
+    before, previous = snapshot_task(task), task_payload(task)
+    for field, value in task_values.items():
+        setattr(task, field, value)
+    await db.flush()
+    after, data = snapshot_task(task), task_payload(task)
+    await apply_task_change(db, before, after)
+    if data != previous:
+        record_event(db, "task_updated", "task", data, previous)
+    await db.commit()
+    await read_cache.invalidate(*task_scopes(task.id, before, after))
+    return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
-    task_id: str,
+    task_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a task.
     """
-    # TODO: Implement task deletion logic
-    raise HTTPException(status_code=404, detail="Task not found")
+    task = await db.get(Task, task_id, with_for_update=True)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    before, previous = snapshot_task(task), task_payload(task)
+    await db.delete(task)
+    await db.flush()
+    await apply_task_change(db, before, None)
+    record_event(db, "task_deleted", "task", previous)
+    await db.commit()
+    await read_cache.invalidate(*task_scopes(task_id, before))
@@ -1,23 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
+from uuid import UUID
+from app.core.cache import read_cache
 from app.core.database import get_db
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortKey, build_page, paginate, resolve_sort_key,
+)
+from app.core.replicas import get_read_db, uses_read_cache
+from app.models.user import User
+from app.schemas.pagination import CursorPage
+from app.schemas.user import UserResponse
 
 router = APIRouter()
 
+USER_SORT_KEYS = (
+    SortKey("updated_at", User.updated_at, User.id, descending=True),
+    SortKey("created_at", User.created_at, User.id, descending=True),
+)
 
-@router.get("/")
+
+@router.get("/", response_model=CursorPage[UserResponse])
 async def get_users(
-    skip: int = 0,
-    limit: int = 100,
-    team_id: str = None,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: str = "updated_at",
+    team_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Retrieve all users with pagination.
+    Retrieve users with keyset pagination.
+
+    Pages filtered by team and read from the primary are cached under the
+    team's scope.
     """
-    # TODO: Implement user retrieval logic
-    return []
+    sort_key = resolve_sort_key(USER_SORT_KEYS, sort)
+    query = select(User)
+    if team_id:
+        query = query.where(User.team_id == team_id)
+
+    async def load():
+        result = await db.execute(paginate(query, sort_key, cursor, limit))
+        page = build_page(result.scalars().all(), sort_key, limit)
+        return CursorPage[UserResponse].model_validate(page).model_dump(mode="json")
+
+    if team_id is None or not uses_read_cache(request, db):
+        return await load()
+    name = f"users:{team_id}:{sort_key.name}:{limit}:{cursor}"
+    return await read_cache.get_or_load(name, [f"team:{team_id}"], load)
 
 
 @router.get("/me")
@@ -38,13 +70,19 @@ async def update_current_user(user_data: dict):
     return {"message": "Profile updated successfully"}
 
 
-@router.get("/{user_id}")
+@router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
-    user_id: str,
+    user_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve a specific user by ID.
     """
-    # TODO: Implement user retrieval logic
-    raise HTTPException(status_code=404, detail="User not found")
+    async def load():
+        user = await db.get(User, user_id)
+        return None if user is None else UserResponse.model_validate(user).model_dump(mode="json")
+
+    user = await read_cache.get_or_load(f"user:{user_id}", [f"user:{user_id}"], load)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
@@ -0,0 +1,182 @@
+"""
+Read-through cache for API reads, in Redis with an optional in-process LRU tier.
+
+Every cached value depends on one or more scopes ("project:<id>", "team:<id>",
+"task:<id>"), and the current version of each scope is part of its key. Writes
+call `invalidate()` with the scopes they touched after committing, which bumps
+those versions: older entries are never read again and simply expire, so a task
+update only invalidates its own project's cached pages.
+
+The local tier keeps decoded values and scope versions for
+`CACHE_LOCAL_TTL_SECONDS`. Writes made by this worker are visible immediately;
+writes made by another worker can take that long to show up here.
+
+Cache failures are logged and treated as misses: they never fail the request.
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cache:"
+VERSION_PREFIX = "cache:version:"
+
+# Version keys must outlive every entry keyed on them, or a reset version could
+# resurrect an old entry
+VERSION_TTL_SECONDS = 7 * 24 * 3600
+
+Loader = Callable[[], Awaitable[Any]]
+
+_MISSING = object()
+
+
+class LocalLRU:
+    """Size-bounded in-process tier with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self.bytes = 0
+
+    def get(self, key: str) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self.pop(key)
+            return _MISSING
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, size: int = 0) -> None:
+        if self.max_entries <= 0:
+            return
+        self.pop(key)
+        self.entries[key] = (time.monotonic() + self.ttl, value, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries:
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            metrics.incr("cache.local.evicted")
+
+    def pop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+
+class ReadThroughCache:
+    """Versioned read-through/write-invalidate cache for JSON-serializable reads."""
+
+    def __init__(self, redis, local_max_entries: int, local_ttl: float):
+        self.redis = redis
+        self.local = LocalLRU(local_max_entries, local_ttl)
+        metrics.gauge("cache.hit_ratio", lambda: metrics.ratio("cache.hit", "cache.miss"))
+        metrics.gauge("cache.local.entries", lambda: len(self.local.entries))
+        metrics.gauge("cache.local.bytes", lambda: self.local.bytes)
+
+    async def versions(self, scopes: Sequence[str]) -> List[int]:
+        versions = [self.local.get(VERSION_PREFIX + scope) for scope in scopes]
+        missing = [scope for scope, version in zip(scopes, versions) if version is _MISSING]
+        if missing:
+            fetched = dict(zip(missing, await self.redis.mget([VERSION_PREFIX + scope for scope in missing])))
+            for index, scope in enumerate(scopes):
+                if versions[index] is _MISSING:
+                    versions[index] = int(fetched[scope] or 0)
+                    self.local.set(VERSION_PREFIX + scope, versions[index])
+        return versions
+
+    async def key(self, name: str, scopes: Sequence[str]) -> str:
+        versions = await self.versions(scopes)
+        return KEY_PREFIX + name + "".join(
+            f"|{scope}={version}" for scope, version in zip(scopes, versions)
+        )
+
+    async def get_or_load(
+        self,
+        name: str,
+        scopes: Sequence[str],
+        load: Loader,
+        ttl: Optional[int] = None,
+    ) -> Any:
+        """
+        Return the cached value for `name`, or `await load()` and cache it.
+
+        `load` must return something JSON-serializable; None (not found) is
+        returned as-is and never cached.
+        """
+        if not settings.CACHE_ENABLED:
+            return await load()
+
+        try:
+            key = await self.key(name, scopes)
+            value = self.local.get(key)
+            if value is not _MISSING:
+                metrics.incr("cache.hit")
+                metrics.incr("cache.local.hit")
+                return value
+
+            encoded = await self.redis.get(key)
+            if encoded is not None:
+                value = json.loads(encoded)
+                self.local.set(key, value, len(encoded))
+                metrics.incr("cache.hit")
+                metrics.incr("cache.redis.hit")
+                return value
+        except Exception as e:
+            logger.warning(f"Cache read failed for {name}: {e}")
+            metrics.incr("cache.error")
+            return await load()
+
+        metrics.incr("cache.miss")
+        value = await load()
+        if value is None:
+            return None
+
+        try:
+            encoded = json.dumps(value, separators=(",", ":"))
+            await self.redis.set(key, encoded, ex=ttl or settings.CACHE_TTL_SECONDS)
+            self.local.set(key, value, len(encoded))
+            metrics.incr("cache.bytes_written", len(encoded))
+        except Exception as e:
+            logger.warning(f"Cache write failed for {name}: {e}")
+            metrics.incr("cache.error")
+        return value
+
+    async def invalidate(self, *scopes: str) -> None:
+        """Bump the version of every scope a committed write touched."""
+        scopes = list(dict.fromkeys(scopes))
+        if not scopes or not settings.CACHE_ENABLED:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for scope in scopes:
+                    pipe.incr(VERSION_PREFIX + scope)
+                    pipe.expire(VERSION_PREFIX + scope, VERSION_TTL_SECONDS)
+                results = await pipe.execute()
+            for scope, version in zip(scopes, results[::2]):
+                self.local.set(VERSION_PREFIX + scope, version)
+            metrics.incr("cache.invalidated", len(scopes))
+        except Exception as e:
+            # The entries still expire on their TTL; drop what this worker holds
+            logger.warning(f"Cache invalidation failed for {scopes}: {e}")
+            metrics.incr("cache.error")
+            for scope in scopes:
+                self.local.pop(VERSION_PREFIX + scope)
+
+
+read_cache = ReadThroughCache(
+    redis_client,
+    local_max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+    local_ttl=settings.CACHE_LOCAL_TTL_SECONDS,
+)
@@ -1,14 +1,65 @@
+import time
+from collections import deque
+
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.query_stats import install_query_stats
+
+# Recent checkout waits kept for the pool status percentiles
+POOL_WAIT_SAMPLES = 1000
+
+checkout_waits = deque(maxlen=POOL_WAIT_SAMPLES)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and when it overflows."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        overflow = max(self._overflow, 0)
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            metrics.incr("db.pool.timeouts")
+            raise
+        waited = time.perf_counter() - started
+        checkout_waits.append(waited)
+        metrics.incr("db.pool.checkouts")
+        metrics.incr("db.pool.wait_seconds", waited)
+        if self._overflow > overflow:
+            metrics.incr("db.pool.overflow_events")
+        return connection
+
+
+def build_engine(url: str):
+    """Async engine with the configured pool; used for the primary and any replicas."""
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        # asyncpg prepares every statement; keep the prepared statements per connection
+        connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        future=True,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        connect_args=connect_args,
+    )
+    install_query_stats(engine)
+    return engine
+
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-)
+engine = build_engine(settings.DATABASE_URL)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -20,9 +71,41 @@ AsyncSessionLocal = async_sessionmaker(
 # Create declarative base
 Base = declarative_base()
 
+metrics.gauge("db.pool.checked_out", lambda: engine.pool.checkedout())
+metrics.gauge("db.pool.overflow", lambda: max(engine.pool.overflow(), 0))
+
+
+def pool_status() -> dict:
+    """Connection pool occupancy plus checkout wait statistics for this worker."""
+    pool = engine.pool
+    waits = sorted(checkout_waits)
+
+    def wait_ms(fraction: float) -> float:
+        return round(waits[min(len(waits) - 1, int(fraction * len(waits)))] * 1000, 2) if waits else 0.0
+
+    return {
+        "size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": int(metrics.counters["db.pool.checkouts"]),
+        "overflow_events": int(metrics.counters["db.pool.overflow_events"]),
+        "timeouts": int(metrics.counters["db.pool.timeouts"]),
+        "wait_ms": {"p50": wait_ms(0.5), "p99": wait_ms(0.99), "max": wait_ms(1.0)},
+    }
+
 
 # Dependency to get database session
 async def get_db():
+    """
+    Request-scoped session.
+
+    A session only holds a pooled connection from its first query until the
+    next commit, rollback or close. Endpoints that go on to slow non-database
+    work (LLM calls, streaming) must commit or `await db.close()` first; the
+    session stays usable and checks out a new connection if queried again.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -0,0 +1,35 @@
+"""
+In-process counters and gauges for operational metrics.
+
+Each worker keeps its own values; `GET /metrics` returns this worker's snapshot.
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class MetricsRegistry:
+    """Named counters plus gauges that are computed when a snapshot is taken."""
+
+    def __init__(self):
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.gauges: Dict[str, Callable[[], float]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        self.counters[name] += value
+
+    def gauge(self, name: str, read: Callable[[], float]) -> None:
+        self.gauges[name] = read
+
+    def ratio(self, hits: str, misses: str) -> float:
+        total = self.counters[hits] + self.counters[misses]
+        return self.counters[hits] / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        values = dict(self.counters)
+        for name, read in self.gauges.items():
+            values[name] = read()
+        return dict(sorted(values.items()))
+
+
+metrics = MetricsRegistry()
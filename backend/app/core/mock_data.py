@@ -1,242 +1,323 @@
 """
-Mock data for development and testing purposes.
-This file contains sample data that can be used to populate the database
-during development or for testing scenarios.
+Mock data for development, testing and load tests.
+
+`MockDataGenerator` builds a whole tenant from a `TenantSpec`: teams, users,
+projects, overlapping sprints, tasks and a task dependency graph, with the
+skew real tenants have (a few busy projects and assignees, old sprints mostly
+done). Everything, ids included, is derived from the spec's seed, so the same
+spec always produces the same rows. Rows are yielded one at a time and can be
+streamed into the database with `app.services.imports.fixtures.load_tenant`.
+
+The MOCK_* constants are a small sample tenant built the same way.
 """
 
+import random
+import string
+import uuid
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from uuid import uuid4
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-# Mock Teams
-MOCK_TEAMS = [
-    {
-        "id": str(uuid4()),
-        "name": "Engineering Team",
-        "description": "Core engineering team responsible for product development",
-        "settings": '{"theme": "dark", "notifications": true}'
-    },
-    {
-        "id": str(uuid4()),
-        "name": "Design Team", 
-        "description": "UI/UX design team focused on user experience",
-        "settings": '{"theme": "light", "notifications": false}'
-    },
-    {
-        "id": str(uuid4()),
-        "name": "Product Team",
-        "description": "Product management and strategy team",
-        "settings": '{"theme": "auto", "notifications": true}'
-    }
+TEAM_NAMES = ["Engineering", "Design", "Product", "Platform", "Mobile", "Data", "Growth", "Infrastructure"]
+FIRST_NAMES = ["Alice", "Bob", "Carol", "David", "Eva", "Frank", "Grace", "Henry", "Iris", "Jack", "Kara", "Liam"]
+LAST_NAMES = ["Johnson", "Smith", "Davis", "Wilson", "Brown", "Lee", "Garcia", "Martin", "Clark", "Young"]
+
+PROJECT_NAMES = [
+    "E-commerce Platform Redesign", "Mobile App Development", "API Integration Project",
+    "Analytics Dashboard", "Billing Overhaul", "Search Relaunch", "Customer Portal", "Data Warehouse",
+]
+PROJECT_DESCRIPTIONS = [
+    "Complete redesign of the e-commerce platform with modern UI/UX",
+    "Native mobile app for iOS and Android platforms with offline capabilities",
+    "Integration with third-party APIs for payment processing and shipping",
+    "Real-time analytics dashboard for business intelligence and reporting",
+]
+SPRINT_GOALS = [
+    "Set up project foundation and basic architecture",
+    "Implement core features",
+    "Polish the user experience and fix reported bugs",
+    "Harden performance and prepare the release",
 ]
 
-# Mock Users
-MOCK_USERS = [
-    {
-        "id": str(uuid4()),
-        "email": "alice.johnson@company.com",
-        "name": "Alice Johnson",
-        "role": "admin",
-        "team_id": MOCK_TEAMS[0]["id"],
-        "avatar": "https://example.com/avatars/alice.jpg",
-        "is_active": True,
-        "is_verified": True
-    },
-    {
-        "id": str(uuid4()),
-        "email": "bob.smith@company.com", 
-        "name": "Bob Smith",
-        "role": "pm",
-        "team_id": MOCK_TEAMS[0]["id"],
-        "avatar": "https://example.com/avatars/bob.jpg",
-        "is_active": True,
-        "is_verified": True
-    },
-    {
-        "id": str(uuid4()),
-        "email": "carol.davis@company.com",
-        "name": "Carol Davis",
-        "role": "contributor", 
-        "team_id": MOCK_TEAMS[1]["id"],
-        "avatar": "https://example.com/avatars/carol.jpg",
-        "is_active": True,
-        "is_verified": True
-    },
-    {
-        "id": str(uuid4()),
-        "email": "david.wilson@company.com",
-        "name": "David Wilson",
-        "role": "contributor",
-        "team_id": MOCK_TEAMS[0]["id"], 
-        "avatar": "https://example.com/avatars/david.jpg",
-        "is_active": True,
-        "is_verified": True
-    },
-    {
-        "id": str(uuid4()),
-        "email": "eva.brown@company.com",
-        "name": "Eva Brown",
-        "role": "viewer",
-        "team_id": MOCK_TEAMS[2]["id"],
-        "avatar": "https://example.com/avatars/eva.jpg", 
-        "is_active": True,
-        "is_verified": True
-    }
+TASK_VERBS = ["Design", "Implement", "Fix", "Refactor", "Review", "Test", "Document", "Migrate", "Optimize", "Set up"]
+TASK_SUBJECTS = [
+    "user interface mockups", "development environment", "authentication system", "API documentation",
+    "database schema", "mobile app wireframes", "checkout flow", "notification service", "search indexing",
+    "reporting dashboard", "CI pipeline", "permissions model", "billing webhooks", "onboarding emails",
+]
+TASK_DESCRIPTIONS = [
+    "Create wireframes and mockups for the new dashboard with modern design principles",
+    "Configure local development environment for the team with Docker and CI/CD",
+    "Build JWT-based authentication with refresh tokens and OAuth integration",
+    "Review and update API documentation for v2.0 with OpenAPI specification",
+    "Design and implement the new database schema with proper indexing and constraints",
+    "Create wireframes for the mobile app with focus on user experience",
 ]
 
+PRIORITY_WEIGHTS = {"low": 20, "medium": 50, "high": 22, "urgent": 8}
+
+# Status mix by where the task's sprint is relative to today
+STATUS_WEIGHTS = {
+    "completed": {"todo": 4, "in_progress": 4, "review": 4, "done": 88},
+    "active": {"todo": 35, "in_progress": 30, "review": 15, "done": 20},
+    "planning": {"todo": 90, "in_progress": 8, "review": 0, "done": 2},
+    "backlog": {"todo": 80, "in_progress": 8, "review": 2, "done": 10},
+}
+
+ESTIMATES = [1, 2, 3, 5, 8, 13, 21]
+
+# Dependencies point at one of this many earlier tasks of the same project
+DEPENDENCY_WINDOW = 200
+
+
+@dataclass
+class TenantSpec:
+    """Size and shape of a generated tenant."""
+    seed: int = 0
+    teams: int = 3
+    users: int = 12
+    projects: int = 4
+    tasks: int = 60
+    sprints_per_project: int = 6
+    sprint_days: int = 14
+    # Consecutive sprints of a project overlap by up to this many days
+    sprint_overlap_days: int = 3
+    unassigned_rate: float = 0.1
+    backlog_rate: float = 0.15
+    # Share of tasks that depend on earlier tasks, and how many at most
+    dependency_rate: float = 0.3
+    max_dependencies: int = 3
+    # Timestamps are laid out around this moment (today by default)
+    anchor: Optional[datetime] = None
+
+
+def seeded_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def zipf_weights(count: int, exponent: float = 1.0) -> List[float]:
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def pick(rng: random.Random, weights: Dict[str, float]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class MockDataGenerator:
+    """
+    Deterministic rows for one tenant, as dicts keyed by column name.
+
+    Teams, users, projects and sprints are small enough to keep in memory;
+    tasks and their dependencies are generated lazily. Each kind of row has its
+    own random stream, so changing the task count does not change the users.
+    """
+
+    def __init__(self, spec: TenantSpec):
+        self.spec = spec
+        if spec.users < spec.teams:
+            raise ValueError("Every team needs at least one user")
+        self.anchor = spec.anchor or datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0)
+        self.created_at = self.anchor - timedelta(days=spec.sprints_per_project * spec.sprint_days)
+        self.teams = self._teams()
+        self.users = self._users()
+        self.projects = self._projects()
+        self.sprints = self._sprints()
+
+    def rng(self, kind: str) -> random.Random:
+        return random.Random(f"{self.spec.seed}:{kind}")
+
+    def _teams(self) -> List[Dict[str, Any]]:
+        rng = self.rng("teams")
+        return [
+            {
+                "id": seeded_uuid(rng),
+                "name": f"{TEAM_NAMES[index % len(TEAM_NAMES)]} Team {index // len(TEAM_NAMES) + 1}",
+                "description": None,
+                "settings": None,
+                "created_at": self.created_at,
+                "updated_at": self.created_at,
+            }
+            for index in range(self.spec.teams)
+        ]
+
+    def _users(self) -> List[Dict[str, Any]]:
+        """A few large teams and many small ones; the first member of every team is its admin."""
+        rng = self.rng("users")
+        team_weights = zipf_weights(len(self.teams), 0.8)
+        users = []
+        for index in range(self.spec.users):
+            team = self.teams[index] if index < len(self.teams) else rng.choices(self.teams, weights=team_weights)[0]
+            first, last = FIRST_NAMES[index % len(FIRST_NAMES)], LAST_NAMES[rng.randrange(len(LAST_NAMES))]
+            if index < len(self.teams):
+                role = "admin"
+            else:
+                role = rng.choices(["pm", "contributor", "viewer"], weights=[10, 80, 10])[0]
+            users.append({
+                "id": seeded_uuid(rng),
+                "email": f"{first}.{last}.{index}@tenant{self.spec.seed}.example.com".lower(),
+                "name": f"{first} {last}",
+                "avatar": None,
+                # Not a hash of anything: generated users cannot sign in
+                "hashed_password": "!",
+                "is_active": True,
+                "is_verified": True,
+                "role": role,
+                "team_id": team["id"],
+                "created_at": self.created_at,
+                "updated_at": self.created_at,
+            })
+        return users
+
+    def team_members(self) -> Dict[uuid.UUID, List[Dict[str, Any]]]:
+        members: Dict[uuid.UUID, List[Dict[str, Any]]] = {team["id"]: [] for team in self.teams}
+        for user in self.users:
+            members[user["team_id"]].append(user)
+        return members
+
+    def _projects(self) -> List[Dict[str, Any]]:
+        rng = self.rng("projects")
+        members = self.team_members()
+        projects = []
+        for index in range(self.spec.projects):
+            team = self.teams[index % len(self.teams)]
+            managers = [user for user in members[team["id"]] if user["role"] in ("admin", "pm")]
+            projects.append({
+                "id": seeded_uuid(rng),
+                "name": f"{PROJECT_NAMES[index % len(PROJECT_NAMES)]} {index + 1}",
+                "description": rng.choice(PROJECT_DESCRIPTIONS),
+                "status": "active" if rng.random() < 0.85 else "completed",
+                "settings": None,
+                "owner_id": rng.choice(managers)["id"],
+                "team_id": team["id"],
+                "created_at": self.created_at,
+                "updated_at": self.created_at,
+            })
+        return projects
+
+    def _sprints(self) -> List[Dict[str, Any]]:
+        """Two thirds of each project's sprints are over; neighbours overlap by a few days."""
+        rng = self.rng("sprints")
+        spec = self.spec
+        sprints = []
+        for project in self.projects:
+            start = self.anchor - timedelta(days=spec.sprints_per_project * 2 // 3 * spec.sprint_days)
+            start += timedelta(days=rng.randrange(spec.sprint_days))
+            for number in range(1, spec.sprints_per_project + 1):
+                end = start + timedelta(days=spec.sprint_days)
+                if end < self.anchor:
+                    status = "completed"
+                elif start <= self.anchor:
+                    status = "active"
+                else:
+                    status = "planning"
+                sprints.append({
+                    "id": seeded_uuid(rng),
+                    "name": f"Sprint {number}",
+                    "goal": rng.choice(SPRINT_GOALS),
+                    "status": status,
+                    "start_date": start,
+                    "end_date": end,
+                    "project_id": project["id"],
+                    "created_at": min(start, self.anchor),
+                    "updated_at": min(end, self.anchor),
+                })
+                start = end - timedelta(days=rng.randint(0, spec.sprint_overlap_days))
+        return sprints
+
+    def task_counts(self) -> List[int]:
+        """Tasks per project: a couple of projects hold most of the work."""
+        rng = self.rng("task-counts")
+        counts = [0] * len(self.projects)
+        weights = zipf_weights(len(self.projects))
+        for index in rng.choices(range(len(self.projects)), weights=weights, k=self.spec.tasks):
+            counts[index] += 1
+        return counts
+
+    def tasks(self) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Yield (task, dependency rows) one task at a time.
+
+        Dependencies only point at earlier tasks of the same project, so the
+        graph is acyclic and every dependency is yielded after both its tasks.
+        """
+        rng = self.rng("tasks")
+        spec = self.spec
+        members = self.team_members()
+        sprints_of: Dict[uuid.UUID, List[Dict[str, Any]]] = {}
+        for sprint in self.sprints:
+            sprints_of.setdefault(sprint["project_id"], []).append(sprint)
+
+        for project, count in zip(self.projects, self.task_counts()):
+            assignees = members[project["team_id"]]
+            assignee_weights = zipf_weights(len(assignees), 1.1)
+            sprints = sprints_of.get(project["id"], [])
+            recent: deque = deque(maxlen=DEPENDENCY_WINDOW)
+            for _ in range(count):
+                sprint = None if not sprints or rng.random() < spec.backlog_rate else rng.choice(sprints)
+                if sprint is not None:
+                    created_at = sprint["start_date"] - timedelta(days=rng.random() * spec.sprint_days)
+                    due_date = sprint["end_date"] - timedelta(days=rng.random() * spec.sprint_days / 2)
+                    status = pick(rng, STATUS_WEIGHTS[sprint["status"]])
+                else:
+                    created_at = self.created_at + (self.anchor - self.created_at) * rng.random()
+                    due_date = created_at + timedelta(days=rng.randrange(7, 60)) if rng.random() < 0.5 else None
+                    status = pick(rng, STATUS_WEIGHTS["backlog"])
+                created_at = min(created_at, self.anchor)
+                estimate = rng.choice(ESTIMATES)
+                task = {
+                    "id": seeded_uuid(rng),
+                    "title": f"{rng.choice(TASK_VERBS)} {rng.choice(TASK_SUBJECTS)}",
+                    "description": rng.choice(TASK_DESCRIPTIONS),
+                    "status": status,
+                    "priority": pick(rng, PRIORITY_WEIGHTS),
+                    "estimated_hours": estimate,
+                    "actual_hours": round(estimate * rng.lognormvariate(0, 0.4)) if status == "done" else None,
+                    "due_date": due_date,
+                    "external_id": None,
+                    "project_id": project["id"],
+                    "assignee_id": (
+                        None if rng.random() < spec.unassigned_rate
+                        else rng.choices(assignees, weights=assignee_weights)[0]["id"]
+                    ),
+                    "sprint_id": sprint["id"] if sprint else None,
+                    "created_at": created_at,
+                    "updated_at": created_at + (self.anchor - created_at) * rng.random(),
+                }
+                dependencies = []
+                if recent and rng.random() < spec.dependency_rate:
+                    upstream = rng.sample(list(recent), min(len(recent), rng.randint(1, spec.max_dependencies)))
+                    dependencies = [
+                        {"task_id": task["id"], "depends_on_id": depends_on_id, "created_at": created_at}
+                        for depends_on_id in upstream
+                    ]
+                recent.append(task["id"])
+                yield task, dependencies
+
+
+# Small sample tenant for development and tests
+SAMPLE_TENANT = MockDataGenerator(TenantSpec(anchor=datetime(2025, 9, 1, 9, 0)))
+_sample_rng = random.Random("sample")
+
+# Mock Teams
+MOCK_TEAMS = SAMPLE_TENANT.teams
+
+# Mock Users
+MOCK_USERS = SAMPLE_TENANT.users
+
 # Mock Projects
-MOCK_PROJECTS = [
-    {
-        "id": str(uuid4()),
-        "name": "E-commerce Platform Redesign",
-        "description": "Complete redesign of the main e-commerce platform with modern UI/UX and improved performance",
-        "status": "active",
-        "owner_id": MOCK_USERS[0]["id"],
-        "team_id": MOCK_TEAMS[0]["id"],
-        "settings": '{"theme": "modern", "features": ["search", "cart", "checkout"]}'
-    },
-    {
-        "id": str(uuid4()),
-        "name": "Mobile App Development",
-        "description": "Native mobile app for iOS and Android platforms with offline capabilities",
-        "status": "active", 
-        "owner_id": MOCK_USERS[1]["id"],
-        "team_id": MOCK_TEAMS[0]["id"],
-        "settings": '{"platforms": ["ios", "android"], "offline": true}'
-    },
-    {
-        "id": str(uuid4()),
-        "name": "API Integration Project",
-        "description": "Integration with third-party APIs for payment processing and shipping",
-        "status": "completed",
-        "owner_id": MOCK_USERS[2]["id"], 
-        "team_id": MOCK_TEAMS[1]["id"],
-        "settings": '{"apis": ["stripe", "shippo"], "webhooks": true}'
-    },
-    {
-        "id": str(uuid4()),
-        "name": "Analytics Dashboard",
-        "description": "Real-time analytics dashboard for business intelligence and reporting",
-        "status": "active",
-        "owner_id": MOCK_USERS[3]["id"],
-        "team_id": MOCK_TEAMS[2]["id"], 
-        "settings": '{"charts": ["line", "bar", "pie"], "real_time": true}'
-    }
-]
+MOCK_PROJECTS = SAMPLE_TENANT.projects
 
 # Mock Sprints
-MOCK_SPRINTS = [
-    {
-        "id": str(uuid4()),
-        "name": "Sprint 1 - Foundation",
-        "goal": "Set up project foundation and basic architecture",
-        "status": "completed",
-        "project_id": MOCK_PROJECTS[0]["id"],
-        "start_date": datetime.now() - timedelta(days=30),
-        "end_date": datetime.now() - timedelta(days=16)
-    },
-    {
-        "id": str(uuid4()),
-        "name": "Sprint 2 - Core Features", 
-        "goal": "Implement core e-commerce features",
-        "status": "active",
-        "project_id": MOCK_PROJECTS[0]["id"],
-        "start_date": datetime.now() - timedelta(days=15),
-        "end_date": datetime.now() + timedelta(days=1)
-    },
-    {
-        "id": str(uuid4()),
-        "name": "Sprint 1 - Mobile UI",
-        "goal": "Design and implement mobile user interface",
-        "status": "planning",
-        "project_id": MOCK_PROJECTS[1]["id"], 
-        "start_date": datetime.now() + timedelta(days=1),
-        "end_date": datetime.now() + timedelta(days=14)
-    }
-]
+MOCK_SPRINTS = SAMPLE_TENANT.sprints
 
 # Mock Tasks
-MOCK_TASKS = [
-    {
-        "id": str(uuid4()),
-        "title": "Design user interface mockups",
-        "description": "Create wireframes and mockups for the new dashboard with modern design principles",
-        "status": "todo",
-        "priority": "high",
-        "project_id": MOCK_PROJECTS[0]["id"],
-        "assignee_id": MOCK_USERS[2]["id"],
-        "sprint_id": MOCK_SPRINTS[1]["id"],
-        "estimated_hours": 16,
-        "due_date": datetime.now() + timedelta(days=5)
-    },
-    {
-        "id": str(uuid4()),
-        "title": "Set up development environment",
-        "description": "Configure local development environment for the team with Docker and CI/CD",
-        "status": "done",
-        "priority": "medium", 
-        "project_id": MOCK_PROJECTS[0]["id"],
-        "assignee_id": MOCK_USERS[3]["id"],
-        "sprint_id": MOCK_SPRINTS[0]["id"],
-        "estimated_hours": 8,
-        "actual_hours": 6,
-        "due_date": datetime.now() - timedelta(days=20)
-    },
-    {
-        "id": str(uuid4()),
-        "title": "Implement authentication system",
-        "description": "Build JWT-based authentication with refresh tokens and OAuth integration",
-        "status": "in_progress",
-        "priority": "high",
-        "project_id": MOCK_PROJECTS[0]["id"],
-        "assignee_id": MOCK_USERS[0]["id"],
-        "sprint_id": MOCK_SPRINTS[1]["id"],
-        "estimated_hours": 24,
-        "actual_hours": 12,
-        "due_date": datetime.now() + timedelta(days=2)
-    },
-    {
-        "id": str(uuid4()),
-        "title": "API documentation review",
-        "description": "Review and update API documentation for v2.0 with OpenAPI specification",
-        "status": "review",
-        "priority": "low",
-        "project_id": MOCK_PROJECTS[2]["id"],
-        "assignee_id": MOCK_USERS[1]["id"],
-        "estimated_hours": 4,
-        "actual_hours": 3,
-        "due_date": datetime.now() - timedelta(days=1)
-    },
-    {
-        "id": str(uuid4()),
-        "title": "Database schema design",
-        "description": "Design and implement the new database schema with proper indexing and constraints",
-        "status": "done",
-        "priority": "high",
-        "project_id": MOCK_PROJECTS[0]["id"],
-        "assignee_id": MOCK_USERS[3]["id"],
-        "sprint_id": MOCK_SPRINTS[0]["id"],
-        "estimated_hours": 12,
-        "actual_hours": 10,
-        "due_date": datetime.now() - timedelta(days=25)
-    },
-    {
-        "id": str(uuid4()),
-        "title": "Mobile app wireframes",
-        "description": "Create wireframes for the mobile app with focus on user experience",
-        "status": "todo",
-        "priority": "medium",
-        "project_id": MOCK_PROJECTS[1]["id"],
-        "assignee_id": MOCK_USERS[2]["id"],
-        "sprint_id": MOCK_SPRINTS[2]["id"],
-        "estimated_hours": 20,
-        "due_date": datetime.now() + timedelta(days=10)
-    }
-]
+MOCK_TASKS = [task for task, _ in SAMPLE_TENANT.tasks()]
 
 # Mock Automations
 MOCK_AUTOMATIONS = [
     {
-        "id": str(uuid4()),
+        "id": str(seeded_uuid(_sample_rng)),
         "name": "Auto-assign high priority tasks",
         "description": "Automatically assign high priority tasks to team lead",
         "trigger": {
@@ -261,7 +342,7 @@ MOCK_AUTOMATIONS = [
         "enabled": True
     },
     {
-        "id": str(uuid4()),
+        "id": str(seeded_uuid(_sample_rng)),
         "name": "Sprint completion notification",
         "description": "Send notification when sprint is completed",
         "trigger": {
@@ -285,7 +366,7 @@ MOCK_AUTOMATIONS = [
 # Mock AI Responses
 MOCK_AI_RESPONSES = [
     {
-        "id": str(uuid4()),
+        "id": str(seeded_uuid(_sample_rng)),
         "content": "Based on the project requirements, I recommend implementing a microservices architecture with the following components: 1) User Service for authentication, 2) Product Service for catalog management, 3) Order Service for transaction processing, and 4) Notification Service for communications.",
         "citations": [
             {
@@ -296,10 +377,10 @@ MOCK_AI_RESPONSES = [
         ],
         "confidence": 0.85,
         "model": "gpt-4",
-        "created_at": datetime.now() - timedelta(hours=2)
+        "created_at": SAMPLE_TENANT.anchor - timedelta(hours=2)
     },
     {
-        "id": str(uuid4()),
+        "id": str(seeded_uuid(_sample_rng)),
         "content": "The current sprint is at risk of not meeting its goals. Key blockers include: 1) Authentication system implementation is behind schedule, 2) Database schema changes are pending review, 3) Team capacity is reduced due to vacation. Recommendations: Extend sprint by 3 days or reduce scope by removing non-critical features.",
         "citations": [
             {
@@ -310,6 +391,53 @@ MOCK_AI_RESPONSES = [
         ],
         "confidence": 0.92,
         "model": "claude-3",
-        "created_at": datetime.now() - timedelta(hours=1)
+        "created_at": SAMPLE_TENANT.anchor - timedelta(hours=1)
     }
 ]
+
+# Jira-style CSV export rows, for exercising task imports at scale
+JIRA_EXPORT_HEADERS = [
+    "Issue key", "Summary", "Description", "Status", "Priority", "Assignee", "Sprint",
+    "Project name", "Created", "Updated", "Due date", "Original Estimate", "Time Spent",
+]
+JIRA_STATUSES = ["To Do", "In Progress", "In Review", "Done"]
+JIRA_PRIORITIES = ["Lowest", "Low", "Medium", "High", "Highest"]
+JIRA_DATE_FORMAT = "%d/%b/%y %I:%M %p"
+
+
+def generate_jira_export(count, seed=0, projects=3, users=50, sprints_per_project=12):
+    """
+    Yield `count` Jira export rows (header -> value), the same ones for a given seed.
+
+    Rows are produced one at a time, so any count can be written out in
+    constant memory. Work is skewed towards a few busy assignees, and about one
+    row in ten is unassigned or outside any sprint.
+    """
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 6, 9, 0)
+    keys = ["".join(rng.choice(string.ascii_uppercase) for _ in range(3)) + str(p) for p in range(projects)]
+    names = [f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[i // len(FIRST_NAMES) % len(LAST_NAMES)]} {i}"
+             for i in range(users)]
+    weights = [1 / (i + 1) for i in range(users)]
+
+    for number in range(1, count + 1):
+        project = rng.randrange(projects)
+        sprint = rng.randrange(sprints_per_project)
+        created = base + timedelta(days=sprint * 14 + rng.random() * 14, minutes=rng.randrange(600))
+        status = rng.choices(JIRA_STATUSES, weights=[3, 2, 1, 4])[0]
+        estimate = rng.choice([1, 2, 3, 5, 8, 13]) * 3600
+        yield {
+            "Issue key": f"{keys[project]}-{number}",
+            "Summary": f"{rng.choice(TASK_VERBS)} {rng.choice(TASK_SUBJECTS)} #{number}",
+            "Description": rng.choice(TASK_DESCRIPTIONS),
+            "Status": status,
+            "Priority": rng.choices(JIRA_PRIORITIES, weights=[1, 3, 6, 3, 1])[0],
+            "Assignee": "" if rng.random() < 0.1 else rng.choices(names, weights=weights)[0],
+            "Sprint": "" if rng.random() < 0.1 else f"{keys[project]} Sprint {sprint + 1}",
+            "Project name": PROJECT_NAMES[project % len(PROJECT_NAMES)] + f" {keys[project]}",
+            "Created": created.strftime(JIRA_DATE_FORMAT),
+            "Updated": (created + timedelta(days=rng.random() * 10)).strftime(JIRA_DATE_FORMAT),
+            "Due date": (created + timedelta(days=rng.randrange(3, 30))).strftime("%Y-%m-%d"),
+            "Original Estimate": estimate,
+            "Time Spent": int(estimate * rng.uniform(0.5, 1.5)) if status == "Done" else "",
+        }
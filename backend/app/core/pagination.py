@@ -0,0 +1,110 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are addressed by the last row seen rather than by an offset, so fetching
+page N costs the same as fetching page 1: the database seeks straight into the
+sort index instead of scanning and discarding every skipped row.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_, tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """A keyset ordering: one datetime sort column plus the primary key as tie-breaker.
+
+    Nullable columns always sort their NULLs last, whatever the direction.
+    """
+
+    name: str
+    column: Any
+    id_column: Any
+    descending: bool = False
+    nullable: bool = False
+
+    def order_by(self) -> Tuple[Any, Any]:
+        if self.descending:
+            column, id_column = self.column.desc(), self.id_column.desc()
+        else:
+            column, id_column = self.column.asc(), self.id_column.asc()
+        if self.nullable:
+            column = column.nulls_last()
+        return column, id_column
+
+    def after(self, value: Optional[datetime], last_id: UUID):
+        """Condition selecting the rows that sort strictly after (value, last_id)."""
+        if self.descending:
+            id_after = self.id_column < last_id
+            row_after = tuple_(self.column, self.id_column) < tuple_(value, last_id)
+        else:
+            id_after = self.id_column > last_id
+            row_after = tuple_(self.column, self.id_column) > tuple_(value, last_id)
+
+        if not self.nullable:
+            return row_after
+        if value is None:
+            return and_(self.column.is_(None), id_after)
+        return or_(row_after, self.column.is_(None))
+
+
+def encode_cursor(sort_key: SortKey, row: Any) -> str:
+    value = getattr(row, sort_key.column.key)
+    payload = {
+        "k": sort_key.name,
+        "v": value.isoformat() if value is not None else None,
+        "id": str(getattr(row, sort_key.id_column.key)),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(sort_key: SortKey, cursor: str) -> Tuple[Optional[datetime], UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        value = datetime.fromisoformat(payload["v"]) if payload["v"] is not None else None
+        last_id = UUID(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    if payload.get("k") != sort_key.name:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor was issued for a different sort order",
+        )
+    return value, last_id
+
+
+def resolve_sort_key(sort_keys: Sequence[SortKey], name: str) -> SortKey:
+    for sort_key in sort_keys:
+        if sort_key.name == name:
+            return sort_key
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Unsupported sort '{name}', expected one of: {', '.join(k.name for k in sort_keys)}",
+    )
+
+
+def paginate(query: Select, sort_key: SortKey, cursor: Optional[str], limit: int) -> Select:
+    """Apply keyset ordering, the cursor seek and a one-row lookahead to `query`."""
+    if cursor:
+        query = query.where(sort_key.after(*decode_cursor(sort_key, cursor)))
+    return query.order_by(*sort_key.order_by()).limit(limit + 1)
+
+
+def build_page(rows: Sequence[Any], sort_key: SortKey, limit: int) -> dict:
+    """Trim the lookahead row and derive `next_cursor` from the last row returned."""
+    items: List[Any] = list(rows[:limit])
+    next_cursor = encode_cursor(sort_key, items[-1]) if len(rows) > limit and items else None
+    return {"items": items, "next_cursor": next_cursor}
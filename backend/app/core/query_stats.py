@@ -0,0 +1,201 @@
+"""
+Per-request SQL accounting: query count, database time and repeated statements.
+
+`QueryStatsMiddleware` opens a `QueryStats` for every HTTP request and the
+engine events installed by `install_query_stats` add each statement the
+request runs to it, on any connection or replica. Every response carries the
+totals as `X-DB-Query-Count`, `X-DB-Time-Ms` and `X-DB-Max-Repeats` headers.
+
+A request that runs more than `QUERY_BUDGET_PER_REQUEST` statements, or the
+same statement shape `QUERY_REPEAT_THRESHOLD` times (the signature of an N+1
+loop), or runs an identical statement with identical parameters twice, is
+logged with the offending statement. With `QUERY_STATS_STRICT` (for
+tests) the statement that crosses the line raises `QueryBudgetExceeded`
+instead, so the traceback points at the code issuing it. Routes that
+legitimately run many statements declare their own budget with the
+`query_budget()` dependency.
+"""
+
+import contextvars
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+current_query_stats: contextvars.ContextVar[Optional["QueryStats"]] = contextvars.ContextVar(
+    "current_query_stats", default=None
+)
+
+# Longest statement text quoted in logs and errors
+STATEMENT_PREVIEW_CHARS = 300
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request ran more statements, or repeated one more often, than its budget allows."""
+
+
+class QueryStats:
+    """Statements run on behalf of one request (or one `track_queries` block)."""
+
+    def __init__(self, budget: Optional[int], repeat_threshold: Optional[int], strict: bool = False):
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+        self.strict = strict
+        self.queries = 0
+        self.seconds = 0.0
+        # Statement text (parameters are bound separately) -> executions
+        self.shapes: Counter = Counter()
+        self.duplicates = 0
+        self.seen = set()
+        self.reported = set()
+        self.problems = []
+
+    @property
+    def max_repeats(self) -> int:
+        return max(self.shapes.values(), default=0)
+
+    def record(self, statement: str, parameters) -> None:
+        self.queries += 1
+        self.shapes[statement] += 1
+        try:
+            key = hash((statement, tuple(parameters) if isinstance(parameters, (list, tuple)) else parameters))
+        except TypeError:
+            key = hash((statement, repr(parameters)))
+        if key in self.seen:
+            self.duplicates += 1
+            # Once per statement: the same query with the same parameters is a missed reuse
+            if key not in self.reported:
+                self.reported.add(key)
+                self.problem("identical statement repeated", statement)
+        self.seen.add(key)
+
+        if self.budget is not None and self.queries == self.budget + 1:
+            self.problem(f"more than {self.budget} queries", statement)
+        if self.repeat_threshold is not None and self.shapes[statement] == self.repeat_threshold:
+            self.problem(f"same statement run {self.repeat_threshold} times", statement)
+
+    def problem(self, reason: str, statement: str) -> None:
+        preview = " ".join(statement.split())[:STATEMENT_PREVIEW_CHARS]
+        self.problems.append((reason, preview))
+        if self.strict:
+            raise QueryBudgetExceeded(f"{reason}: {preview}")
+
+    def headers(self) -> dict:
+        return {
+            "x-db-query-count": str(self.queries),
+            "x-db-time-ms": f"{self.seconds * 1000:.1f}",
+            "x-db-max-repeats": str(self.max_repeats),
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    if stats is not None:
+        context._query_stats_started = time.perf_counter()
+        stats.record(statement, parameters)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    started = getattr(context, "_query_stats_started", None)
+    if stats is not None and started is not None:
+        stats.seconds += time.perf_counter() - started
+
+
+def install_query_stats(engine) -> None:
+    """Attribute every statement run on `engine` to the current request."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(
+    budget: Optional[int] = None,
+    repeat_threshold: Optional[int] = None,
+    strict: bool = False,
+) -> Iterator[QueryStats]:
+    """
+    Count the statements run inside the block, e.g. to assert on them in a test.
+
+    `strict` raises `QueryBudgetExceeded` as soon as a limit is crossed.
+    """
+    stats = QueryStats(budget, repeat_threshold, strict)
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def query_budget(queries: Optional[int] = None, repeats: Optional[int] = None):
+    """
+    Dependency replacing the query budget of one route; None lifts that limit.
+
+    For routes whose work legitimately scales with the input, such as batched
+    writes or imports.
+    """
+    async def apply_query_budget():
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.budget = queries
+            stats.repeat_threshold = repeats
+
+    return apply_query_budget
+
+
+class QueryStatsMiddleware:
+    """Tracks each HTTP request's statements, reports them in headers and logs budget overruns."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (name.encode(), value.encode()) for name, value in stats.headers().items()
+                ]
+            await send(message)
+
+        with track_queries(
+            settings.QUERY_BUDGET_PER_REQUEST, settings.QUERY_REPEAT_THRESHOLD, settings.QUERY_STATS_STRICT
+        ) as stats:
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                self.report(scope, stats)
+
+    @staticmethod
+    def report(scope, stats: QueryStats) -> None:
+        metrics.incr("db.request.queries", stats.queries)
+        metrics.incr("db.request.duplicate_queries", stats.duplicates)
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "db_queries": stats.queries,
+            "db_time_ms": round(stats.seconds * 1000, 1),
+            "db_max_repeats": stats.max_repeats,
+            "db_duplicate_queries": stats.duplicates,
+        }
+        summary = " ".join(f"{name}={value}" for name, value in fields.items())
+        if not stats.problems:
+            logger.debug(f"Request queries: {summary}", extra=fields)
+            return
+        metrics.incr("db.request.over_budget")
+        for reason, statement in stats.problems:
+            logger.warning(
+                f"Query budget exceeded ({reason}): {summary} statement={statement}",
+                extra={**fields, "db_problem": reason, "db_statement": statement},
+            )
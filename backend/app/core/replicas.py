@@ -0,0 +1,196 @@
+"""
+Routing of read-only endpoints to database read replicas.
+
+`get_read_db` yields a session on the next healthy replica (round-robin). It
+falls back to the primary when no replica is configured or healthy, and when
+the client wrote something in the last `DB_READ_YOUR_WRITES_SECONDS`, so users
+always see their own changes. `ReadYourWritesMiddleware` marks such clients
+with a short-lived cookie on every successful write.
+
+A background loop checks each replica every `DB_REPLICA_HEALTH_CHECK_SECONDS`
+and takes it out of rotation while it is unreachable or lags the primary by
+more than `DB_REPLICA_MAX_LAG_SECONDS`. A dropped connection during a request
+takes it out immediately.
+
+Only primary reads use the shared read cache (`uses_read_cache`); replica
+reads always go to the replica.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, build_engine, engine
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_COOKIE = "db_primary_until"
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+HEALTH_CHECK_TIMEOUT_SECONDS = 2.0
+
+# NULL on a server that is not replaying WAL, i.e. not lagging
+REPLICATION_LAG_QUERY = text(
+    "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+)
+
+
+class Replica:
+    """One read replica: its own engine and pool, plus its health."""
+
+    def __init__(self, url: str):
+        self.engine = build_engine(url)
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        self.sessions = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = True
+        self.lag = 0.0
+        event.listen(self.engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        if context.is_disconnect:
+            self.set_healthy(False, f"connection lost: {context.original_exception}")
+
+    def set_healthy(self, healthy: bool, reason: str = "") -> None:
+        if healthy != self.healthy:
+            if healthy:
+                logger.info(f"Read replica {self.name} back in rotation")
+            else:
+                logger.warning(f"Read replica {self.name} out of rotation: {reason}")
+                metrics.incr("db.replica.unhealthy")
+        self.healthy = healthy
+
+    async def check(self) -> None:
+        query = REPLICATION_LAG_QUERY if self.engine.dialect.name == "postgresql" else text("SELECT 0")
+        try:
+            async with self.engine.connect() as connection:
+                self.lag = float(await asyncio.wait_for(
+                    connection.scalar(query), HEALTH_CHECK_TIMEOUT_SECONDS
+                ))
+        except Exception as e:
+            self.set_healthy(False, str(e) or type(e).__name__)
+            return
+        if self.lag > settings.DB_REPLICA_MAX_LAG_SECONDS:
+            self.set_healthy(False, f"replication lag {self.lag:.1f}s")
+        else:
+            self.set_healthy(True)
+
+
+class ReplicaRouter:
+    """Round-robin over the healthy replicas, with a periodic health check."""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self.counter = itertools.count()
+        self.task: Optional[asyncio.Task] = None
+        metrics.gauge("db.replica.healthy", lambda: sum(replica.healthy for replica in self.replicas))
+
+    def pick(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self.counter) % len(healthy)]
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.DB_REPLICA_HEALTH_CHECK_SECONDS)
+            await self.check_all()
+
+    async def start(self) -> None:
+        await self.check_all()
+        self.task = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+class ReadYourWritesMiddleware:
+    """Sets the primary-stickiness cookie on successful writes."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or replica_router is None:
+            await self.app(scope, receive, send)
+            return
+
+        window = settings.DB_READ_YOUR_WRITES_SECONDS
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{PRIMARY_COOKIE}={time.time() + window:.3f}; Max-Age={math.ceil(window)}; "
+                    "Path=/; HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def uses_read_cache(request: Request, db: AsyncSession) -> bool:
+    """
+    Whether a read on `db` may go through the shared read cache.
+
+    Only primary reads do. A replica page can miss a write that already bumped
+    the cache version, and caching it would serve it to the writer once their
+    stickiness ends. A client that wrote recently skips the cache altogether.
+    """
+    return db.bind is engine and not wrote_recently(request)
+
+
+replica_router: Optional[ReplicaRouter] = None
+
+
+async def init_replicas() -> None:
+    global replica_router
+    if settings.DATABASE_REPLICA_URLS:
+        replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+        await replica_router.start()
+
+
+async def close_replicas() -> None:
+    global replica_router
+    if replica_router is not None:
+        await replica_router.close()
+        replica_router = None
+
+
+# Dependency for read-only endpoints
+async def get_read_db(request: Request):
+    replica = None
+    if replica_router is not None and not wrote_recently(request):
+        replica = replica_router.pick()
+    metrics.incr("db.reads.replica" if replica else "db.reads.primary")
+    sessions = replica.sessions if replica else AsyncSessionLocal
+    async with sessions() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
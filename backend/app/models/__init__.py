@@ -0,0 +1,12 @@
+# Model imports
+from app.models.base import Base
+from app.models.team import Team
+from app.models.user import User
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task, TaskDependency
+from app.models.stats import ProjectStats, SprintStats
+from app.models.ai import LLMCacheEntry
+from app.models.automation import Automation
+from app.models.outbox import OutboxEvent
+from app.models.event_history import EventHistory
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Text, Float, Index
+from pgvector.sqlalchemy import Vector
+from app.models.base import Base, TimestampMixin, UUIDMixin
+
+# Dimensions of LLM_EMBEDDING_MODEL (text-embedding-3-small)
+EMBEDDING_DIMENSIONS = 1536
+
+class LLMCacheEntry(Base, TimestampMixin, UUIDMixin):
+    """A cached completion, searchable by prompt embedding for near-duplicate hits."""
+    __tablename__ = "llm_cache_entries"
+    
+    model = Column(String(100), nullable=False)
+    temperature = Column(Float, nullable=False)
+    prompt_hash = Column(String(64), nullable=False)
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS), nullable=False)
+    response = Column(Text, nullable=False)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_llm_cache_entries_model', 'model', 'temperature'),
+        Index('idx_llm_cache_entries_created_at', 'created_at'),
+        Index(
+            'idx_llm_cache_entries_embedding', 'embedding',
+            postgresql_using='hnsw',
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+        ),
+    )
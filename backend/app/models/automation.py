@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, Text, Boolean, JSON, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import Base, TimestampMixin, UUIDMixin
+
+class Automation(Base, TimestampMixin, UUIDMixin):
+    """A no-code rule: when `trigger_type` fires and every condition holds, run the actions."""
+    __tablename__ = "automations"
+    
+    # Automation information
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    enabled = Column(Boolean, default=True, nullable=False)
+    
+    # Rule definition, compiled by app.services.automations.engine when saved
+    trigger_type = Column(String(50), nullable=False)
+    trigger_config = Column(JSON, nullable=False, default=dict)
+    conditions = Column(JSON, nullable=False, default=list)  # [{"field", "operator", "value"}]
+    actions = Column(JSON, nullable=False, default=list)  # [{"type", "config"}]
+    
+    # Relationships
+    team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    
+    team = relationship("Team")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_automations_team_id_trigger_type', 'team_id', 'trigger_type'),
+    )
+    
+    @property
+    def trigger(self):
+        return {"type": self.trigger_type, "config": self.trigger_config or {}}
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, DateTime
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, DateTime, func, select, true
+from sqlalchemy.ext.declarative import declarative_base, declared_attr
+from sqlalchemy.orm import query_expression, with_expression
 from datetime import datetime
+import logging
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 
 Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+
 class TimestampMixin:
     """Mixin to add created_at and updated_at timestamps to models."""
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -22,3 +26,69 @@ class SoftDeleteMixin:
     @property
     def is_deleted(self):
         return self.deleted_at is not None
+
+class TaskStatsMixin:
+    """Mixin adding task counts that can be aggregated in SQL for a whole page of rows.
+
+    Counts come from the eagerly loaded `stats` rollup row when present, then
+    from `with_task_stats()`, which attaches them with one COUNT ... FILTER
+    lateral subquery per row in the same round-trip, then from a `tasks`
+    collection that is already loaded. Nothing is lazy-loaded (that cannot
+    run under asyncio): with none of the three loaded, the counts are 0 and a
+    warning names the query to fix.
+    """
+    # Name of the Task column referencing this model
+    task_stats_foreign_key = None
+
+    @declared_attr
+    def loaded_task_count(cls):
+        return query_expression()
+
+    @declared_attr
+    def loaded_completed_task_count(cls):
+        return query_expression()
+
+    @classmethod
+    def with_task_stats(cls, query):
+        from app.models.task import Task
+
+        foreign_key = getattr(Task, cls.task_stats_foreign_key)
+        stats = (
+            select(
+                func.count(Task.id).label('task_count'),
+                func.count(Task.id).filter(Task.status == 'done').label('completed_count'),
+            )
+            .where(foreign_key == cls.id)
+            .lateral(f'{cls.__tablename__}_task_stats')
+        )
+        return query.join(stats, true()).options(
+            with_expression(cls.loaded_task_count, stats.c.task_count),
+            with_expression(cls.loaded_completed_task_count, stats.c.completed_count),
+        )
+
+    def _task_totals(self):
+        """(total, completed) from the cheapest source already loaded on this object."""
+        if 'stats' in self.__dict__:
+            stats = self.__dict__['stats']
+            return (stats.task_count, stats.done_count) if stats is not None else (0, 0)
+        if self.__dict__.get('loaded_task_count') is not None:
+            return self.loaded_task_count, self.loaded_completed_task_count
+        if 'tasks' in self.__dict__:
+            tasks = self.__dict__['tasks']
+            return len(tasks), len([t for t in tasks if t.status == 'done'])
+        logger.warning(
+            f"{type(self).__name__} task counts read without stats or tasks loaded; "
+            f"query with joinedload({type(self).__name__}.stats) or {type(self).__name__}.with_task_stats()"
+        )
+        return 0, 0
+
+    @property
+    def task_count(self):
+        return self._task_totals()[0]
+
+    @property
+    def completion_percentage(self):
+        total, completed = self._task_totals()
+        if not total:
+            return 0
+        return (completed / total) * 100
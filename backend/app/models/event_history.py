@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, JSON, Index, Identity
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import Base
+
+class EventHistory(Base):
+    """A delivered domain event, kept for EVENT_HISTORY_RETENTION_DAYS.
+
+    Automation rules are replayed against these before they are enabled
+    (POST /automations/{id}/test); nothing else reads them.
+    """
+    __tablename__ = "event_history"
+    
+    id = Column(BigInteger, Identity(), primary_key=True)
+    
+    # Event information, as delivered
+    event_type = Column(String(50), nullable=False)
+    aggregate_type = Column(String(50), nullable=False)
+    aggregate_id = Column(UUID(as_uuid=True), nullable=False)
+    project_id = Column(UUID(as_uuid=True), nullable=True)
+    team_id = Column(UUID(as_uuid=True), nullable=False)
+    payload = Column(JSON, nullable=False)  # {"data": {...}, "previous": {...}}
+    depth = Column(Integer, default=0, nullable=False)
+    # When the change was committed, not when it was delivered
+    occurred_at = Column(DateTime, nullable=False)
+    
+    # Indexes
+    __table_args__ = (
+        # Replay reads one team's events of one type, oldest first
+        Index('idx_event_history_team_id_event_type_occurred_at', 'team_id', 'event_type', 'occurred_at', 'id'),
+        Index('idx_event_history_occurred_at', 'occurred_at'),
+    )
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Text, Integer, BigInteger, DateTime, JSON, Index, Identity, text
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.models.base import Base
+
+class OutboxEvent(Base):
+    """A domain event written in the same transaction as the change it describes.
+
+    Rows are deleted once every consumer has handled them; rows that keep
+    failing stay behind with `failed_at` set.
+    """
+    __tablename__ = "outbox_events"
+    
+    # Insertion order is delivery order
+    id = Column(BigInteger, Identity(), primary_key=True)
+    
+    # Event information
+    event_type = Column(String(50), nullable=False)  # task_created, task_updated, sprint_completed, ...
+    aggregate_type = Column(String(50), nullable=False)  # task, sprint, automation
+    aggregate_id = Column(UUID(as_uuid=True), nullable=False)
+    project_id = Column(UUID(as_uuid=True), nullable=True)
+    # Set for events that belong to no project (scheduled automations); otherwise taken from the project
+    team_id = Column(UUID(as_uuid=True), nullable=True)
+    payload = Column(JSON, nullable=False)  # {"data": {...}, "previous": {...}}
+    # Automation actions that led to this event; stops rules from triggering each other forever
+    depth = Column(Integer, default=0, nullable=False)
+    
+    # Delivery state
+    attempts = Column(Integer, default=0, nullable=False)
+    available_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    failed_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_outbox_events_pending', 'id', postgresql_where=text('failed_at IS NULL')),
+    )
@@ -1,10 +1,11 @@
 from sqlalchemy import Column, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from app.models.base import Base, TimestampMixin, UUIDMixin
+from app.models.base import Base, TaskStatsMixin, TimestampMixin, UUIDMixin
 
-class Project(Base, TimestampMixin, UUIDMixin):
+class Project(Base, TimestampMixin, UUIDMixin, TaskStatsMixin):
     __tablename__ = "projects"
+    task_stats_foreign_key = 'project_id'
     
     # Project information
     name = Column(String(255), nullable=False)
@@ -22,6 +23,7 @@ class Project(Base, TimestampMixin, UUIDMixin):
     team = relationship("Team", back_populates="projects")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
     sprints = relationship("Sprint", back_populates="project", cascade="all, delete-orphan")
+    stats = relationship("ProjectStats", back_populates="project", uselist=False, passive_deletes=True)
     
     # Indexes
     __table_args__ = (
@@ -33,14 +35,3 @@ class Project(Base, TimestampMixin, UUIDMixin):
     @property
     def is_active(self):
         return self.status == 'active'
-    
-    @property
-    def task_count(self):
-        return len(self.tasks)
-    
-    @property
-    def completion_percentage(self):
-        if not self.tasks:
-            return 0
-        completed = len([t for t in self.tasks if t.status == 'done'])
-        return (completed / len(self.tasks)) * 100
@@ -2,10 +2,11 @@ from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship, validates
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
-from app.models.base import Base, TimestampMixin, UUIDMixin
+from app.models.base import Base, TaskStatsMixin, TimestampMixin, UUIDMixin
 
-class Sprint(Base, TimestampMixin, UUIDMixin):
+class Sprint(Base, TimestampMixin, UUIDMixin, TaskStatsMixin):
     __tablename__ = "sprints"
+    task_stats_foreign_key = 'sprint_id'
     
     # Sprint information
     name = Column(String(255), nullable=False)
@@ -21,6 +22,7 @@ class Sprint(Base, TimestampMixin, UUIDMixin):
     
     project = relationship("Project", back_populates="sprints")
     tasks = relationship("Task", back_populates="sprint")
+    stats = relationship("SprintStats", back_populates="sprint", uselist=False, passive_deletes=True)
     
     # Indexes
     __table_args__ = (
@@ -53,14 +55,3 @@ class Sprint(Base, TimestampMixin, UUIDMixin):
     @property
     def duration_days(self):
         return (self.end_date - self.start_date).days
-    
-    @property
-    def task_count(self):
-        return len(self.tasks)
-    
-    @property
-    def completion_percentage(self):
-        if not self.tasks:
-            return 0
-        completed = len([t for t in self.tasks if t.status == 'done'])
-        return (completed / len(self.tasks)) * 100
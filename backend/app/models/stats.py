@@ -0,0 +1,68 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.models.base import Base
+from app.models.task import TASK_STATUSES, TASK_PRIORITIES
+
+# Rollup counter columns, in the order they are declared on TaskRollupMixin
+STATUS_COUNT_COLUMNS = {status: f'{status}_count' for status in TASK_STATUSES}
+PRIORITY_COUNT_COLUMNS = {priority: f'{priority}_priority_count' for priority in TASK_PRIORITIES}
+
+class TaskRollupMixin:
+    """Mixin with task counters maintained incrementally on every task write.
+
+    `overdue_count` is evaluated against `overdue_as_of` rather than the wall
+    clock, so incremental deltas stay exact; the refresh job advances it.
+    """
+    task_count = Column(Integer, default=0, nullable=False)
+
+    # Counts by status
+    todo_count = Column(Integer, default=0, nullable=False)
+    in_progress_count = Column(Integer, default=0, nullable=False)
+    review_count = Column(Integer, default=0, nullable=False)
+    done_count = Column(Integer, default=0, nullable=False)
+
+    # Counts by priority
+    low_priority_count = Column(Integer, default=0, nullable=False)
+    medium_priority_count = Column(Integer, default=0, nullable=False)
+    high_priority_count = Column(Integer, default=0, nullable=False)
+    urgent_priority_count = Column(Integer, default=0, nullable=False)
+
+    # Time tracking
+    estimated_hours_total = Column(Integer, default=0, nullable=False)
+    actual_hours_total = Column(Integer, default=0, nullable=False)
+
+    # Overdue open tasks as of overdue_as_of
+    overdue_count = Column(Integer, default=0, nullable=False)
+    overdue_as_of = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    @property
+    def completion_percentage(self):
+        if not self.task_count:
+            return 0
+        return (self.done_count / self.task_count) * 100
+
+    @property
+    def status_counts(self):
+        return {status: getattr(self, column) for status, column in STATUS_COUNT_COLUMNS.items()}
+
+    @property
+    def priority_counts(self):
+        return {priority: getattr(self, column) for priority, column in PRIORITY_COUNT_COLUMNS.items()}
+
+class ProjectStats(Base, TaskRollupMixin):
+    __tablename__ = "project_stats"
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+
+    project = relationship("Project", back_populates="stats")
+
+class SprintStats(Base, TaskRollupMixin):
+    __tablename__ = "sprint_stats"
+
+    sprint_id = Column(UUID(as_uuid=True), ForeignKey("sprints.id", ondelete="CASCADE"), primary_key=True)
+
+    sprint = relationship("Sprint", back_populates="stats")
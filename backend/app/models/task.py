@@ -1,9 +1,12 @@
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship, validates
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 from app.models.base import Base, TimestampMixin, UUIDMixin
 
+TASK_STATUSES = ('todo', 'in_progress', 'review', 'done')
+TASK_PRIORITIES = ('low', 'medium', 'high', 'urgent')
+
 class Task(Base, TimestampMixin, UUIDMixin):
     __tablename__ = "tasks"
     
@@ -18,6 +21,9 @@ class Task(Base, TimestampMixin, UUIDMixin):
     actual_hours = Column(Integer, nullable=True)
     due_date = Column(DateTime, nullable=True)
     
+    # Key of the task in the system it was imported from (e.g. a Jira issue key)
+    external_id = Column(String(100), nullable=True)
+    
     # Relationships
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
     assignee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
@@ -35,17 +41,34 @@ class Task(Base, TimestampMixin, UUIDMixin):
         Index('idx_tasks_status', 'status'),
         Index('idx_tasks_priority', 'priority'),
         Index('idx_tasks_due_date', 'due_date'),
+        Index('idx_tasks_updated_at', 'updated_at'),
+        Index('uq_tasks_project_external_id', 'project_id', 'external_id', unique=True),
+        # Composite indexes matching the filter combinations of GET /tasks
+        Index('idx_tasks_project_updated', 'project_id', 'updated_at', 'id'),
+        Index('idx_tasks_project_status_updated', 'project_id', 'status', 'updated_at', 'id'),
+        Index('idx_tasks_project_assignee_status', 'project_id', 'assignee_id', 'status', 'updated_at', 'id'),
+        Index('idx_tasks_assignee_status_due_date', 'assignee_id', 'status', 'due_date'),
+        # Open work only: overdue and upcoming-deadline lookups never need done tasks
+        Index(
+            'idx_tasks_open_due_date', 'project_id', 'due_date',
+            postgresql_where=text("status <> 'done'"),
+        ),
+        # Covering index for a Kanban column: served by an index-only scan
+        Index(
+            'idx_tasks_board_column', 'project_id', 'status', 'due_date', 'id',
+            postgresql_include=['title', 'priority', 'assignee_id'],
+        ),
     )
     
     @validates('priority')
     def validate_priority(self, key, value):
-        if value not in ['low', 'medium', 'high', 'urgent']:
+        if value not in TASK_PRIORITIES:
             raise ValueError('Invalid priority level')
         return value
     
     @validates('status')
     def validate_status(self, key, value):
-        if value not in ['todo', 'in_progress', 'review', 'done']:
+        if value not in TASK_STATUSES:
             raise ValueError('Invalid status')
         return value
     
@@ -70,3 +93,17 @@ class Task(Base, TimestampMixin, UUIDMixin):
             'done': 100
         }
         return status_progress.get(self.status, 0)
+
+
+class TaskDependency(Base):
+    """`task_id` is blocked until `depends_on_id` is done."""
+    __tablename__ = "task_dependencies"
+    
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    depends_on_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_task_dependencies_depends_on_id', 'depends_on_id'),
+    )
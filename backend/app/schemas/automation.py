@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from uuid import UUID
+
+class AutomationTrigger(BaseModel):
+    type: str = Field(..., min_length=1, max_length=50)
+    config: Dict[str, Any] = Field(default_factory=dict)
+
+class AutomationCondition(BaseModel):
+    field: str = Field(..., min_length=1)
+    operator: str
+    value: Any = None
+
+class AutomationAction(BaseModel):
+    type: str
+    config: Dict[str, Any] = Field(default_factory=dict)
+
+class AutomationBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    trigger: AutomationTrigger
+    conditions: List[AutomationCondition] = Field(default_factory=list)
+    actions: List[AutomationAction] = Field(..., min_length=1)
+    enabled: bool = True
+
+class AutomationCreate(AutomationBase):
+    team_id: UUID
+
+class AutomationUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    trigger: Optional[AutomationTrigger] = None
+    conditions: Optional[List[AutomationCondition]] = None
+    actions: Optional[List[AutomationAction]] = Field(None, min_length=1)
+    enabled: Optional[bool] = None
+
+class AutomationResponse(AutomationBase):
+    id: UUID
+    team_id: UUID
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Optional, Dict
+from datetime import datetime
+
+class ForecastPoint(BaseModel):
+    days: float
+    date: datetime
+
+class ForecastInputs(BaseModel):
+    error_source: str  # project, team, default
+    error_samples: int
+    median_error_ratio: float
+    throughput_source: str  # project, default
+    throughput_weeks: int
+    mean_weekly_hours: float
+
+class ForecastResponse(BaseModel):
+    project_id: str
+    sprint_id: Optional[str] = None
+    task_set_version: str
+    trials: int
+    seed: int
+    start_date: datetime
+    tasks_remaining: int
+    tasks_without_estimate: int
+    remaining_estimated_hours: float
+    inputs: ForecastInputs
+    # p50, p85, p95; None when that share of trials runs past the horizon
+    percentiles: Dict[str, Optional[ForecastPoint]]
+    beyond_horizon: float
+    target_date: Optional[datetime] = None
+    probability_by_target: Optional[float] = None
+    sprint_end_date: Optional[datetime] = None
+    probability_by_sprint_end: Optional[float] = None
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
+from app.schemas.stats import TaskRollup
 
 class ProjectBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
@@ -31,3 +32,4 @@ class ProjectResponse(ProjectBase):
 class ProjectWithStats(ProjectResponse):
     task_count: int
     completion_percentage: float
+    stats: Optional[TaskRollup] = None
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+from app.schemas.stats import TaskRollup
+
+class SprintBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    goal: Optional[str] = None
+    status: str = Field(default='planning', pattern='^(planning|active|completed)$')
+    start_date: datetime
+    end_date: datetime
+
+class SprintCreate(SprintBase):
+    project_id: UUID
+
+class SprintUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    goal: Optional[str] = None
+    status: Optional[str] = Field(None, pattern='^(planning|active|completed)$')
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+
+class SprintResponse(SprintBase):
+    id: UUID
+    project_id: UUID
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class SprintWithStats(SprintResponse):
+    task_count: int
+    completion_percentage: float
+    stats: Optional[TaskRollup] = None
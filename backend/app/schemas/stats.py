@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Dict
+from datetime import datetime
+
+class TaskRollup(BaseModel):
+    task_count: int
+    status_counts: Dict[str, int]
+    priority_counts: Dict[str, int]
+    estimated_hours_total: int
+    actual_hours_total: int
+    overdue_count: int
+    overdue_as_of: datetime
+    
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -33,6 +33,7 @@ class TaskResponse(TaskBase):
     assignee_id: Optional[UUID] = None
     sprint_id: Optional[UUID] = None
     actual_hours: Optional[int] = None
+    external_id: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
@@ -45,3 +46,40 @@ class TaskWithDetails(TaskResponse):
     sprint_name: Optional[str] = None
     is_overdue: bool
     progress_percentage: int
+
+class TaskCard(BaseModel):
+    id: UUID
+    title: str
+    status: str
+    priority: str
+    due_date: Optional[datetime] = None
+    assignee_id: Optional[UUID] = None
+    
+    class Config:
+        from_attributes = True
+
+class TaskBoard(BaseModel):
+    project_id: UUID
+    columns: Dict[str, List[TaskCard]]
+
+class TaskBulkCreate(BaseModel):
+    # Validated one by one as TaskCreate so a bad item is reported, not fatal
+    tasks: List[Dict[str, Any]]
+
+class TaskBulkPatch(BaseModel):
+    # Each item is a TaskUpdate plus the task's "id"
+    tasks: List[Dict[str, Any]]
+
+class TaskBulkMove(BaseModel):
+    task_ids: List[UUID]
+    sprint_id: Optional[UUID] = None  # null moves the tasks to the backlog
+    status: Optional[str] = Field(None, pattern='^(todo|in_progress|review|done)$')
+
+class TaskBulkError(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    detail: Any
+
+class TaskBulkResult(BaseModel):
+    tasks: List[TaskResponse]
+    errors: List[TaskBulkError]
@@ -0,0 +1,124 @@
+"""
+Helpers for running many LLM calls as one batch.
+
+`AdaptiveLimiter` bounds in-flight calls and adapts to provider rate limits:
+each success raises the limit additively, each throttled call halves it and
+pauses new calls for the provider's Retry-After (or a backoff). `pack_teams()`
+groups small standup inputs so several teams share one prompt, and
+`parse_packed_summaries()` splits the combined answer back out per team.
+"""
+
+import asyncio
+import re
+from typing import Any, Dict, List, Optional
+
+import anthropic
+import openai
+
+from app.core.metrics import metrics
+from app.services.ai.tokens import count_tokens
+
+# Provider responses that mean "slow down" rather than "this request is bad"
+THROTTLE_STATUS_CODES = {429, 503, 529}
+
+# Backoff used when a throttled response carries no Retry-After
+DEFAULT_THROTTLE_BACKOFF_SECONDS = 1.0
+MAX_THROTTLE_BACKOFF_SECONDS = 60.0
+
+PACKED_TEAM_HEADER = re.compile(r"^#{2,3}\s*TEAM\s+(.+?)\s*$", re.MULTILINE)
+
+
+def is_throttled(error: Exception) -> bool:
+    if isinstance(error, (openai.RateLimitError, anthropic.RateLimitError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code in THROTTLE_STATUS_CODES
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class AdaptiveLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease."""
+
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.resume_at = 0.0
+        self.backoff = DEFAULT_THROTTLE_BACKOFF_SECONDS
+        self.changed = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pause = self.resume_at - loop.time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            async with self.changed:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                await self.changed.wait()
+
+    async def release(self, throttled: bool = False, delay: Optional[float] = None) -> None:
+        loop = asyncio.get_running_loop()
+        async with self.changed:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                pause = delay if delay is not None else self.backoff
+                self.resume_at = max(self.resume_at, loop.time() + pause)
+                self.backoff = min(self.backoff * 2, MAX_THROTTLE_BACKOFF_SECONDS)
+                metrics.incr("llm.batch.throttled")
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self.backoff = DEFAULT_THROTTLE_BACKOFF_SECONDS
+            self.changed.notify_all()
+
+
+def render_team_updates(updates: List[Dict[str, Any]]) -> str:
+    return "\n".join(
+        f"- {update.get('name', 'Unknown')}: {update.get('update', 'No update')}"
+        for update in updates
+    )
+
+
+def pack_teams(
+    teams: List[Dict[str, Any]],
+    max_tokens: int,
+    max_teams: int,
+) -> List[List[Dict[str, Any]]]:
+    """Group teams in order so each group's updates fit `max_tokens`; large teams go alone."""
+    groups: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    used = 0
+    for team in teams:
+        tokens = count_tokens(render_team_updates(team.get("updates", [])))
+        if current and (used + tokens > max_tokens or len(current) >= max_teams):
+            groups.append(current)
+            current, used = [], 0
+        current.append(team)
+        used += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def parse_packed_summaries(response: str) -> Dict[str, str]:
+    """Split a packed response on its `### TEAM <id>` headers."""
+    parts = PACKED_TEAM_HEADER.split(response)
+    # parts = [preamble, id1, body1, id2, body2, ...]
+    return {
+        team_id: body.strip()
+        for team_id, body in zip(parts[1::2], parts[2::2])
+        if body.strip()
+    }
@@ -0,0 +1,164 @@
+"""
+Two-tier response cache for LLM completions.
+
+The exact tier keys Redis entries on a hash of (model, temperature, prompt),
+with a TTL and an access-ordered index that evicts the least recently used
+entries once `LLM_CACHE_MAX_ENTRIES` is exceeded. The optional semantic tier
+stores prompt embeddings in pgvector and serves a cached response when a new
+prompt is close enough to one already answered.
+
+Cache failures are logged and treated as misses: they never fail the call.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.models.ai import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm:cache:"
+LRU_INDEX_KEY = "llm:cache:lru"
+
+Embedder = Callable[[str], Awaitable[Optional[List[float]]]]
+
+# Expired semantic rows are purged once every this many semantic writes
+PURGE_EVERY_WRITES = 100
+
+# Embeddings computed on a miss, kept so the following set() can reuse them
+PENDING_EMBEDDINGS_LIMIT = 1000
+
+
+def prompt_key(model: str, temperature: float, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\x00{temperature!r}\x00{prompt}".encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """Exact-match Redis cache with an optional pgvector similarity tier."""
+
+    def __init__(self, redis, embed: Optional[Embedder] = None):
+        self.redis = redis
+        self.embed = embed
+        self.semantic_enabled = settings.LLM_SEMANTIC_CACHE_ENABLED and embed is not None
+        self.semantic_writes = 0
+        self.pending_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        metrics.gauge("llm_cache.hit_ratio", lambda: metrics.ratio("llm_cache.hit", "llm_cache.miss"))
+
+    async def get(self, model: str, temperature: float, prompt: str) -> Optional[str]:
+        key = prompt_key(model, temperature, prompt)
+        response = await self._get_exact(key)
+        if response is not None:
+            metrics.incr("llm_cache.hit")
+            metrics.incr("llm_cache.exact.hit")
+            return response
+
+        if self.semantic_enabled:
+            response = await self._get_similar(key, model, temperature, prompt)
+            if response is not None:
+                metrics.incr("llm_cache.hit")
+                metrics.incr("llm_cache.semantic.hit")
+                # Promote so the next identical prompt skips the embedding call
+                await self._set_exact(key, response)
+                return response
+
+        metrics.incr("llm_cache.miss")
+        return None
+
+    async def set(self, model: str, temperature: float, prompt: str, response: str) -> None:
+        key = prompt_key(model, temperature, prompt)
+        await self._set_exact(key, response)
+        if self.semantic_enabled:
+            await self._set_similar(key, model, temperature, prompt, response)
+
+    async def _get_exact(self, key: str) -> Optional[str]:
+        try:
+            response = await self.redis.get(KEY_PREFIX + key)
+            if response is not None:
+                await self.redis.zadd(LRU_INDEX_KEY, {key: time.time()})
+            return response
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    async def _set_exact(self, key: str, response: str) -> None:
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(KEY_PREFIX + key, response, ex=settings.LLM_CACHE_TTL_SECONDS)
+                pipe.zadd(LRU_INDEX_KEY, {key: time.time()})
+                pipe.zcard(LRU_INDEX_KEY)
+                *_, size = await pipe.execute()
+
+            overflow = size - settings.LLM_CACHE_MAX_ENTRIES
+            if overflow > 0:
+                evicted = [k for k, _ in await self.redis.zpopmin(LRU_INDEX_KEY, overflow)]
+                if evicted:
+                    await self.redis.delete(*(KEY_PREFIX + k for k in evicted))
+                    metrics.incr("llm_cache.evicted", len(evicted))
+            metrics.incr("llm_cache.bytes_written", len(response.encode()))
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    async def _get_similar(
+        self, key: str, model: str, temperature: float, prompt: str
+    ) -> Optional[str]:
+        try:
+            embedding = await self.embed(prompt)
+            if embedding is None:
+                return None
+            self.pending_embeddings[key] = embedding
+            while len(self.pending_embeddings) > PENDING_EMBEDDINGS_LIMIT:
+                self.pending_embeddings.popitem(last=False)
+            max_distance = 1 - settings.LLM_SEMANTIC_CACHE_THRESHOLD
+            oldest = datetime.utcnow() - timedelta(seconds=settings.LLM_CACHE_TTL_SECONDS)
+            distance = LLMCacheEntry.embedding.cosine_distance(embedding)
+            query = (
+                select(LLMCacheEntry.response, distance.label("distance"))
+                .where(
+                    LLMCacheEntry.model == model,
+                    LLMCacheEntry.temperature == temperature,
+                    LLMCacheEntry.created_at >= oldest,
+                )
+                .order_by(distance)
+                .limit(1)
+            )
+            async with AsyncSessionLocal() as db:
+                row = (await db.execute(query)).first()
+            if row is not None and row.distance <= max_distance:
+                return row.response
+            return None
+        except Exception as e:
+            logger.warning(f"LLM semantic cache read failed: {e}")
+            return None
+
+    async def _set_similar(
+        self, key: str, model: str, temperature: float, prompt: str, response: str
+    ) -> None:
+        try:
+            embedding = self.pending_embeddings.pop(key, None) or await self.embed(prompt)
+            if embedding is None:
+                return
+            async with AsyncSessionLocal() as db:
+                db.add(LLMCacheEntry(
+                    model=model,
+                    temperature=temperature,
+                    prompt_hash=key,
+                    embedding=embedding,
+                    response=response,
+                ))
+                self.semantic_writes += 1
+                if self.semantic_writes % PURGE_EVERY_WRITES == 0:
+                    oldest = datetime.utcnow() - timedelta(seconds=settings.LLM_CACHE_TTL_SECONDS)
+                    await db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.created_at < oldest))
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"LLM semantic cache write failed: {e}")
+
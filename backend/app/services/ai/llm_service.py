@@ -2,87 +2,213 @@
 LLM Service for AI integration with OpenAI and Claude.
 """
 
-from typing import Optional, Dict, Any, List
-import openai
-import anthropic
+from typing import Optional, Dict, Any, List, AsyncIterator
+import asyncio
+import time
+from contextlib import aclosing
+import httpx
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import redis_client
+from app.services.ai.batching import (
+    AdaptiveLimiter, is_throttled, pack_teams, parse_packed_summaries, render_team_updates, retry_after,
+)
+from app.services.ai.cache import LLMResponseCache, prompt_key
+from app.services.ai.project_context import render_project_summary, render_task_lines
+from app.services.ai.providers import LLMProvider, build_providers
+from app.services.ai.single_flight import RedisSingleFlight, SingleFlight
+from app.services.ai.tokens import chunk_lines, count_tokens
 import logging
 
 logger = logging.getLogger(__name__)
 
+OPENAI_DEFAULT_MODEL = "gpt-4"
+CLAUDE_DEFAULT_MODEL = "claude-3-sonnet-20240229"
+
+HEALTH_PROMPT = """Analyze the following project data and provide a health assessment.
+
+{context}
+
+Please provide:
+1. Health score (0-100)
+2. Key risks and issues
+3. Recommendations for improvement
+4. Timeline impact assessment
+
+Format as a structured analysis."""
+
+HEALTH_MAP_PROMPT = """Summarize the delivery risks in these tasks from project {name} as at most 8 short bullet points. Keep the titles, due dates and priorities that matter most.
+
+{tasks}"""
+
+# Summarization rounds before the remaining notes are cut to fit the budget
+MAX_REDUCE_ROUNDS = 3
+
+PACKED_STANDUP_PROMPT = """Generate a concise standup summary for each team below from its members' updates.
+
+For every team, start with its header line exactly as given (e.g. "### TEAM 1") and then provide:
+1. Key accomplishments
+2. Current blockers
+3. Next steps
+4. Team morale assessment
+
+{sections}"""
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """Keep-alive connection pool shared by every provider client."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(settings.LLM_REQUEST_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT),
+    )
+
+
 class LLMService:
-    """Service for interacting with Large Language Models."""
+    """Service for interacting with Large Language Models.
+    
+    One instance is shared by the whole process (see `init_llm_service`), so
+    all requests reuse the same pooled connections and concurrency limits.
+    """
     
-    def __init__(self):
-        self.openai_client = None
-        self.anthropic_client = None
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self.http_client = http_client or build_http_client()
+        providers = build_providers(self.http_client)
+        self.openai = providers["openai"]
+        self.anthropic = providers["anthropic"]
         
-        if settings.OPENAI_API_KEY:
-            self.openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.cache = None
+        if settings.LLM_CACHE_ENABLED:
+            embed = self.embed if self.openai else None
+            self.cache = LLMResponseCache(redis_client, embed=embed)
         
-        if settings.ANTHROPIC_API_KEY:
-            self.anthropic_client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        # Identical concurrent analyses share one provider call, across workers if enabled
+        if settings.LLM_SINGLE_FLIGHT_DISTRIBUTED:
+            self.single_flight = RedisSingleFlight(
+                redis_client,
+                lock_seconds=settings.LLM_SINGLE_FLIGHT_LOCK_SECONDS,
+                result_seconds=settings.LLM_SINGLE_FLIGHT_RESULT_SECONDS,
+            )
+        else:
+            self.single_flight = SingleFlight()
     
-    async def generate_with_openai(
+    async def close(self):
+        await self.http_client.aclose()
+    
+    async def embed(self, text: str) -> Optional[List[float]]:
+        """Embed text with the configured OpenAI embedding model."""
+        if not self.openai:
+            return None
+        try:
+            return await self.openai.embed(text, settings.LLM_EMBEDDING_MODEL)
+        except Exception as e:
+            logger.error(f"OpenAI embedding error: {e}")
+            return None
+    
+    async def generate(
         self,
+        provider: Optional[LLMProvider],
         prompt: str,
-        model: str = "gpt-4",
+        model: str,
         temperature: float = 0.7,
         max_tokens: int = 1000,
+        use_cache: bool = True,
         **kwargs
     ) -> Optional[str]:
-        """Generate text using OpenAI models."""
-        if not self.openai_client:
-            logger.warning("OpenAI client not configured")
+        """Cached completion from `provider`; provider errors are logged and return None."""
+        if not provider:
+            logger.warning(f"LLM provider for {model} not configured")
             return None
         
+        if self.cache and use_cache:
+            cached = await self.cache.get(model, temperature, prompt)
+            if cached is not None:
+                return cached
+        
         try:
-            response = await self.openai_client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs
-            )
-            return response.choices[0].message.content
+            content = await provider.complete(prompt, model, temperature, max_tokens, **kwargs)
         except Exception as e:
-            logger.error(f"OpenAI API error: {e}")
+            logger.error(f"{provider.name} API error: {e}")
             return None
+        
+        if self.cache and use_cache and content:
+            await self.cache.set(model, temperature, prompt, content)
+        return content
+    
+    async def generate_with_openai(
+        self,
+        prompt: str,
+        model: str = OPENAI_DEFAULT_MODEL,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+        **kwargs
+    ) -> Optional[str]:
+        """Generate text using OpenAI models."""
+        return await self.generate(self.openai, prompt, model, temperature, max_tokens, use_cache, **kwargs)
     
     async def generate_with_claude(
         self,
         prompt: str,
-        model: str = "claude-3-sonnet-20240229",
+        model: str = CLAUDE_DEFAULT_MODEL,
         temperature: float = 0.7,
         max_tokens: int = 1000,
+        use_cache: bool = True,
         **kwargs
     ) -> Optional[str]:
         """Generate text using Claude models."""
-        if not self.anthropic_client:
-            logger.warning("Anthropic client not configured")
-            return None
+        return await self.generate(self.anthropic, prompt, model, temperature, max_tokens, use_cache, **kwargs)
+    
+    async def stream_text(
+        self,
+        provider: str,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """Stream a completion, serving cache hits whole and caching completed streams.
         
+        Closing the iterator early (e.g. on client disconnect) closes the
+        upstream HTTP response, which stops generation on the provider side.
+        """
+        if self.cache and use_cache:
+            cached = await self.cache.get(model, temperature, prompt)
+            if cached is not None:
+                yield cached
+                return
+        
+        backend = self.anthropic if provider == "anthropic" else self.openai
+        if not backend:
+            logger.warning(f"LLM provider for {model} not configured")
+            return
+        
+        started = time.monotonic()
+        parts = []
         try:
-            response = await self.anthropic_client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                messages=[{"role": "user", "content": prompt}],
-                **kwargs
-            )
-            return response.content[0].text
-        except Exception as e:
-            logger.error(f"Claude API error: {e}")
-            return None
+            async with aclosing(backend.stream(prompt, model, temperature=temperature)) as stream:
+                async for text in stream:
+                    if not parts:
+                        first_token = time.monotonic() - started
+                        metrics.incr("llm.stream.first_token_seconds", first_token)
+                        metrics.incr("llm.stream.first_token_count")
+                        if first_token > settings.LLM_FIRST_TOKEN_TARGET_SECONDS:
+                            metrics.incr("llm.stream.first_token_slow")
+                            logger.warning(f"{model} first token after {first_token:.2f}s")
+                    parts.append(text)
+                    yield text
+        except (GeneratorExit, asyncio.CancelledError):
+            metrics.incr("llm.stream.cancelled")
+            raise
+        
+        if self.cache and use_cache and parts:
+            await self.cache.set(model, temperature, prompt, "".join(parts))
     
-    async def generate_project_plan(
-        self,
-        project_description: str,
-        constraints: List[str] = None,
-        model: str = "gpt-4"
-    ) -> Dict[str, Any]:
-        """Generate a project plan using AI."""
-        prompt = f"""
+    def build_plan_prompt(self, project_description: str, constraints: List[str] = None) -> str:
+        return f"""
         Create a detailed project plan for the following project:
         
         Project Description: {project_description}
@@ -98,8 +224,92 @@ class LLMService:
         
         Format the response as a structured plan.
         """
+    
+    def build_health_prompt(self, project_data: Dict[str, Any], task_lines: List[str] = None) -> str:
+        """Compact health prompt; `task_lines` replaces the rendered task list when given."""
+        if task_lines is None:
+            task_lines = render_task_lines(project_data)
+        context = "\n".join(render_project_summary(project_data) + task_lines)
+        return HEALTH_PROMPT.format(context=context)
+    
+    async def prepare_health_prompt(
+        self,
+        project_data: Dict[str, Any],
+        model: str = CLAUDE_DEFAULT_MODEL,
+        use_cache: bool = True
+    ) -> str:
+        """Build the health prompt within `LLM_PROMPT_TOKEN_BUDGET` tokens.
+        
+        When the task list does not fit, it is summarized chunk by chunk (map)
+        and the analysis runs over those summaries (reduce), repeating while
+        the summaries themselves are still too long.
+        """
+        budget = settings.LLM_PROMPT_TOKEN_BUDGET
+        prompt = self.build_health_prompt(project_data)
+        if count_tokens(prompt) <= budget:
+            return prompt
+        
+        metrics.incr("llm.prompt.map_reduce")
+        name = project_data.get("name", "Unknown")
+        notes = render_task_lines(project_data)
+        overhead = count_tokens(self.build_health_prompt(project_data, []))
+        chunk_budget = max(budget - count_tokens(HEALTH_MAP_PROMPT.format(name=name, tasks="")), 1)
+        
+        for _ in range(MAX_REDUCE_ROUNDS):
+            if overhead + count_tokens("\n".join(notes)) <= budget or len(notes) <= 1:
+                break
+            chunks = chunk_lines(notes, chunk_budget)
+            summaries = await asyncio.gather(*(
+                self.generate_with_claude(
+                    HEALTH_MAP_PROMPT.format(name=name, tasks="\n".join(chunk)),
+                    model=model,
+                    temperature=0,
+                    max_tokens=settings.LLM_MAP_SUMMARY_MAX_TOKENS,
+                    use_cache=use_cache,
+                )
+                for chunk in chunks
+            ))
+            if not all(summaries):
+                break
+            notes = summaries
+        
+        # Whatever still does not fit is dropped from the end
+        kept, used = [], overhead
+        for note in notes:
+            used += count_tokens(note) + 1
+            if used > budget:
+                metrics.incr("llm.prompt.truncated")
+                break
+            kept.append(note)
+        return self.build_health_prompt(project_data, kept)
+    
+    def build_standup_prompt(self, updates: List[Dict[str, Any]]) -> str:
+        updates_text = render_team_updates(updates)
+        
+        return f"""
+        Generate a concise standup summary from the following team updates:
+        
+        {updates_text}
+        
+        Please provide:
+        1. Key accomplishments
+        2. Current blockers
+        3. Next steps
+        4. Team morale assessment
         
-        response = await self.generate_with_openai(prompt, model=model)
+        Format as a structured summary.
+        """
+    
+    async def generate_project_plan(
+        self,
+        project_description: str,
+        constraints: List[str] = None,
+        model: str = OPENAI_DEFAULT_MODEL,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Generate a project plan using AI."""
+        prompt = self.build_plan_prompt(project_description, constraints)
+        response = await self.generate_with_openai(prompt, model=model, use_cache=use_cache)
         
         if response:
             return {
@@ -117,64 +327,46 @@ class LLMService:
     async def analyze_project_health(
         self,
         project_data: Dict[str, Any],
-        model: str = "claude-3-sonnet-20240229"
+        model: str = CLAUDE_DEFAULT_MODEL,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
-        """Analyze project health and provide recommendations."""
-        prompt = f"""
-        Analyze the following project data and provide health assessment:
-        
-        Project Data: {project_data}
+        """Analyze project health and provide recommendations.
         
-        Please provide:
-        1. Health score (0-100)
-        2. Key risks and issues
-        3. Recommendations for improvement
-        4. Timeline impact assessment
-        
-        Format as a structured analysis.
+        Concurrent calls for the same project data share one in-flight analysis;
+        `use_cache=False` calls only share one with each other, so a bypass
+        never receives a result served from the cache.
         """
         
-        response = await self.generate_with_claude(prompt, model=model)
+        async def analyze() -> Dict[str, Any]:
+            prompt = await self.prepare_health_prompt(project_data, model=model, use_cache=use_cache)
+            response = await self.generate_with_claude(prompt, model=model, use_cache=use_cache)
+            
+            if response:
+                return {
+                    "analysis": response,
+                    "model": model,
+                    "status": "success"
+                }
+            else:
+                return {
+                    "analysis": "Unable to analyze project",
+                    "model": model,
+                    "status": "error"
+                }
         
-        if response:
-            return {
-                "analysis": response,
-                "model": model,
-                "status": "success"
-            }
-        else:
-            return {
-                "analysis": "Unable to analyze project",
-                "model": model,
-                "status": "error"
-            }
+        scope = "health:" if use_cache else "health:fresh:"
+        key = scope + prompt_key(model, 0.7, self.build_health_prompt(project_data))
+        return await self.single_flight.do(key, analyze)
     
     async def generate_standup_summary(
         self,
         updates: List[Dict[str, Any]],
-        model: str = "gpt-4"
+        model: str = OPENAI_DEFAULT_MODEL,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """Generate standup summary from team updates."""
-        updates_text = "\n".join([
-            f"- {update.get('name', 'Unknown')}: {update.get('update', 'No update')}"
-            for update in updates
-        ])
-        
-        prompt = f"""
-        Generate a concise standup summary from the following team updates:
-        
-        {updates_text}
-        
-        Please provide:
-        1. Key accomplishments
-        2. Current blockers
-        3. Next steps
-        4. Team morale assessment
-        
-        Format as a structured summary.
-        """
-        
-        response = await self.generate_with_openai(prompt, model=model)
+        prompt = self.build_standup_prompt(updates)
+        response = await self.generate_with_openai(prompt, model=model, use_cache=use_cache)
         
         if response:
             return {
@@ -188,3 +380,171 @@ class LLMService:
                 "model": model,
                 "status": "error"
             }
+    
+    def build_packed_standup_prompt(self, teams: List[Dict[str, Any]]) -> str:
+        sections = "\n\n".join(
+            f"### TEAM {index}\n{render_team_updates(team.get('updates', []))}"
+            for index, team in enumerate(teams, start=1)
+        )
+        return PACKED_STANDUP_PROMPT.format(sections=sections)
+    
+    async def _summarize_standup_group(
+        self,
+        teams: List[Dict[str, Any]],
+        limiter: AdaptiveLimiter,
+        model: str,
+        use_cache: bool
+    ) -> List[Dict[str, Any]]:
+        """Summarize one team, or several sharing a prompt, retrying throttled calls."""
+        if len(teams) == 1:
+            prompt = self.build_standup_prompt(teams[0].get("updates", []))
+        else:
+            prompt = self.build_packed_standup_prompt(teams)
+        
+        response = None
+        if self.cache and use_cache:
+            response = await self.cache.get(model, 0.7, prompt)
+        
+        attempts = 0
+        while response is None and self.openai and attempts < settings.LLM_BATCH_MAX_ATTEMPTS:
+            attempts += 1
+            await limiter.acquire()
+            try:
+                # Throttled calls are retried here, through the adaptive limiter
+                response = await self.openai.complete(
+                    prompt,
+                    model,
+                    max_tokens=settings.LLM_STANDUP_SUMMARY_TOKENS * len(teams),
+                    retry=False,
+                )
+            except Exception as e:
+                throttled = is_throttled(e)
+                await limiter.release(throttled=throttled, delay=retry_after(e))
+                if not throttled:
+                    logger.error(f"OpenAI API error: {e}")
+                    break
+                continue
+            await limiter.release()
+            if self.cache and use_cache and response:
+                await self.cache.set(model, 0.7, prompt, response)
+        
+        if len(teams) == 1:
+            return [self._standup_result(teams[0], response, model)]
+        
+        summaries = parse_packed_summaries(response or "")
+        results, missing = [], []
+        for index, team in enumerate(teams, start=1):
+            if str(index) in summaries:
+                results.append(self._standup_result(team, summaries[str(index)], model))
+            else:
+                missing.append(team)
+        if missing and response is not None:
+            # The packed answer skipped some teams; give each its own call
+            metrics.incr("llm.batch.unpacked", len(missing))
+            for team in missing:
+                results.extend(await self._summarize_standup_group([team], limiter, model, use_cache))
+        else:
+            results.extend(self._standup_result(team, None, model) for team in missing)
+        return results
+    
+    def _standup_result(self, team: Dict[str, Any], summary: Optional[str], model: str) -> Dict[str, Any]:
+        if summary:
+            return {"team_id": team.get("team_id"), "summary": summary, "model": model, "status": "success"}
+        return {
+            "team_id": team.get("team_id"),
+            "summary": "Unable to generate summary",
+            "model": model,
+            "status": "error"
+        }
+    
+    async def summarize_standups(
+        self,
+        teams: List[Dict[str, Any]],
+        model: str = OPENAI_DEFAULT_MODEL,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Summarize standups for many teams, yielding each team's result as it completes.
+        
+        Each team is `{"team_id": ..., "updates": [...]}`. Small teams are packed
+        into shared prompts up to `LLM_STANDUP_PACK_TOKENS`; calls run through an
+        adaptive limiter that backs off when the provider rate-limits.
+        """
+        limiter = AdaptiveLimiter(settings.LLM_BATCH_CONCURRENCY)
+        groups = pack_teams(teams, settings.LLM_STANDUP_PACK_TOKENS, settings.LLM_STANDUP_PACK_MAX_TEAMS)
+        results: asyncio.Queue = asyncio.Queue()
+        
+        async def run(group: List[Dict[str, Any]]):
+            try:
+                group_results = await self._summarize_standup_group(group, limiter, model, use_cache)
+            except Exception as e:
+                logger.error(f"Standup batch error: {e}")
+                group_results = [self._standup_result(team, None, model) for team in group]
+            for result in group_results:
+                results.put_nowait(result)
+        
+        tasks = [asyncio.create_task(run(group)) for group in groups]
+        try:
+            for _ in range(len(teams)):
+                yield await results.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def stream_project_plan(
+        self,
+        project_description: str,
+        constraints: List[str] = None,
+        model: str = OPENAI_DEFAULT_MODEL,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """Stream a project plan as it is generated."""
+        prompt = self.build_plan_prompt(project_description, constraints)
+        return self.stream_text("openai", prompt, model, use_cache=use_cache)
+    
+    async def stream_project_health(
+        self,
+        project_data: Dict[str, Any],
+        model: str = CLAUDE_DEFAULT_MODEL,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """Stream a project health analysis as it is generated."""
+        prompt = await self.prepare_health_prompt(project_data, model=model, use_cache=use_cache)
+        async with aclosing(self.stream_text("anthropic", prompt, model, use_cache=use_cache)) as stream:
+            async for text in stream:
+                yield text
+    
+    def stream_standup_summary(
+        self,
+        updates: List[Dict[str, Any]],
+        model: str = OPENAI_DEFAULT_MODEL,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """Stream a standup summary as it is generated."""
+        prompt = self.build_standup_prompt(updates)
+        return self.stream_text("openai", prompt, model, use_cache=use_cache)
+
+
+# Process-wide instance, created and closed by the application lifespan
+_llm_service: Optional[LLMService] = None
+
+
+def init_llm_service() -> LLMService:
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService()
+    return _llm_service
+
+
+async def close_llm_service():
+    global _llm_service
+    if _llm_service is not None:
+        await _llm_service.close()
+        _llm_service = None
+
+
+def get_llm_service() -> LLMService:
+    """FastAPI dependency returning the shared LLMService."""
+    if _llm_service is None:
+        raise RuntimeError("LLMService is not initialized; it is created in the app lifespan")
+    return _llm_service
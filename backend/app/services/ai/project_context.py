@@ -0,0 +1,159 @@
+"""
+Compact project context for AI health analysis.
+
+`load_project_context()` gathers what the analysis needs in three small
+queries: the project with its stats rollup, the most overdue open tasks and the
+longest-stalled in-flight tasks, with descriptions already cut short in SQL.
+`render_project_summary()` and `render_task_lines()` turn that into terse
+prompt text instead of a repr of the whole dict.
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.core.config import settings
+from app.models.project import Project
+from app.models.task import Task
+from app.schemas.project import ProjectWithStats
+from app.services.ai.tokens import truncate_text
+
+# ProjectWithStats fields that carry no signal for the analysis
+IGNORED_FIELDS = {"id", "owner_id", "team_id", "settings", "updated_at"}
+
+# Fields rendered explicitly; anything else a caller passes is appended as JSON
+RENDERED_FIELDS = {
+    "name", "status", "description", "created_at", "task_count",
+    "completion_percentage", "stats", "overdue_tasks", "stalled_tasks", "as_of",
+}
+
+
+def _task_columns(description_chars: int):
+    return (
+        Task.title,
+        # One extra character so render_task_lines can tell the text was cut
+        func.left(Task.description, description_chars + 1).label("description"),
+        Task.status,
+        Task.priority,
+        Task.due_date,
+        Task.updated_at,
+        Task.estimated_hours,
+        Task.actual_hours,
+    )
+
+
+def _task_dict(row) -> Dict[str, Any]:
+    task = dict(row._mapping)
+    for field in ("due_date", "updated_at"):
+        if task[field] is not None:
+            task[field] = task[field].isoformat()
+    return task
+
+
+async def load_project_context(db: AsyncSession, project_id: UUID) -> Optional[Dict[str, Any]]:
+    """Project fields and stats plus its top overdue and stalled tasks, JSON-ready."""
+    project = await db.get(Project, project_id, options=[joinedload(Project.stats)])
+    if project is None:
+        return None
+
+    now = datetime.utcnow()
+    limit = settings.LLM_HEALTH_TOP_TASKS
+    columns = _task_columns(settings.LLM_PROMPT_DESCRIPTION_CHARS)
+
+    # Served by idx_tasks_open_due_date
+    overdue = await db.execute(
+        select(*columns)
+        .where(Task.project_id == project_id, Task.status != 'done', Task.due_date < now)
+        .order_by(Task.due_date)
+        .limit(limit)
+    )
+    # Served by idx_tasks_project_status_updated
+    stalled_before = now - timedelta(days=settings.LLM_HEALTH_STALLED_DAYS)
+    stalled = await db.execute(
+        select(*columns)
+        .where(
+            Task.project_id == project_id,
+            Task.status.in_(('in_progress', 'review')),
+            Task.updated_at < stalled_before,
+        )
+        .order_by(Task.updated_at)
+        .limit(limit)
+    )
+
+    context = ProjectWithStats.model_validate(project).model_dump(mode="json")
+    context["overdue_tasks"] = [_task_dict(row) for row in overdue]
+    context["stalled_tasks"] = [_task_dict(row) for row in stalled]
+    context["as_of"] = now.isoformat()
+    return context
+
+
+def _date(value: Optional[str]) -> str:
+    return value[:10] if value else "none"
+
+
+def render_project_summary(data: Dict[str, Any]) -> List[str]:
+    """Header lines: project identity, task counts and any unrecognised extra fields."""
+    lines = [f"Project: {data.get('name', 'Unknown')} ({data.get('status', 'unknown')})"]
+    if data.get("created_at"):
+        lines[0] += f", started {_date(data['created_at'])}"
+    if data.get("description"):
+        lines.append("Description: " + truncate_text(data["description"], settings.LLM_PROMPT_DESCRIPTION_CHARS * 2))
+
+    stats = data.get("stats")
+    if stats:
+        statuses = ", ".join(f"{status} {count}" for status, count in stats["status_counts"].items())
+        priorities = ", ".join(f"{priority} {count}" for priority, count in stats["priority_counts"].items())
+        lines.append(f"Tasks: {stats['task_count']} ({statuses})")
+        lines.append(f"Priorities: {priorities}")
+        lines.append(
+            f"Hours: {stats['estimated_hours_total']} estimated, {stats['actual_hours_total']} actual; "
+            f"{stats['overdue_count']} open tasks overdue"
+        )
+    elif "task_count" in data:
+        lines.append(f"Tasks: {data['task_count']}, {data.get('completion_percentage', 0):.0f}% complete")
+
+    extra = {
+        key: value for key, value in data.items()
+        if key not in RENDERED_FIELDS and key not in IGNORED_FIELDS
+    }
+    if extra:
+        lines.append("Other: " + json.dumps(extra, separators=(",", ":"), default=str))
+    return lines
+
+
+def _task_line(task: Dict[str, Any], as_of: Optional[datetime]) -> str:
+    line = f"- [{task.get('priority')}, {task.get('status')}] {truncate_text(task.get('title') or '', 120)}"
+    due = task.get("due_date")
+    if due:
+        line += f"; due {_date(due)}"
+        if as_of is not None:
+            late = (as_of - datetime.fromisoformat(due)).days
+            if late > 0:
+                line += f" ({late}d late)"
+    if task.get("estimated_hours") is not None or task.get("actual_hours") is not None:
+        line += f"; {task.get('estimated_hours') or 0}h est/{task.get('actual_hours') or 0}h actual"
+    if task.get("updated_at") and task.get("status") != 'done':
+        line += f"; last update {_date(task['updated_at'])}"
+    if task.get("description"):
+        line += ": " + truncate_text(task["description"], settings.LLM_PROMPT_DESCRIPTION_CHARS)
+    return line
+
+
+def render_task_lines(data: Dict[str, Any]) -> List[str]:
+    """One line per overdue or stalled task, under a heading per group."""
+    as_of = datetime.fromisoformat(data["as_of"]) if data.get("as_of") else None
+    lines = []
+    for key, heading in (
+        ("overdue_tasks", "Most overdue open tasks:"),
+        ("stalled_tasks", f"Stalled tasks (no update in {settings.LLM_HEALTH_STALLED_DAYS}+ days):"),
+    ):
+        tasks = data.get(key) or []
+        if tasks:
+            lines.append(heading)
+            lines.extend(_task_line(task, as_of) for task in tasks)
+    return lines
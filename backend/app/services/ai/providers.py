@@ -0,0 +1,301 @@
+"""
+LLM provider backends behind `LLMService`.
+
+A provider turns a prompt into text: `complete()` returns the whole answer and
+raises provider errors, `stream()` yields text deltas, and `embed()` returns an
+embedding vector. Each provider caps its own in-flight calls. `build_providers()`
+returns the live OpenAI/Anthropic backends, or deterministic local stubs when
+`LLM_PROVIDER=stub`, which is what benchmarks and offline development use.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+from typing import AsyncIterator, Dict, List, Optional
+
+import anthropic
+import httpx
+import openai
+
+from app.core.config import settings
+
+EMBEDDING_DIMENSIONS = 1536
+
+# Distinct prompts tracked for per-prompt determinism before the stub starts over
+STUB_SEEN_PROMPTS_LIMIT = 100000
+
+PACKED_TEAM_LABEL = re.compile(r"^### TEAM (\d+)$", re.MULTILINE)
+
+STUB_WORDS = (
+    "the team shipped reviewed planned scope risk sprint deadline blocker estimate "
+    "migration release feature backlog velocity dependency milestone owner quality "
+    "tests rollout customer budget capacity schedule handoff design api review"
+).split()
+
+
+class LLMProvider:
+    """Base class: one text-generation backend with its own concurrency limit."""
+
+    name = "provider"
+
+    def __init__(self, max_concurrency: int):
+        # Caps in-flight calls so a burst queues here instead of exhausting the
+        # shared pool or tripping provider rate limits
+        self.limit = asyncio.Semaphore(max_concurrency)
+
+    async def complete(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        retry: bool = True,
+        **kwargs
+    ) -> Optional[str]:
+        """Full completion; `retry=False` skips client-side retries (the caller handles them)."""
+        raise NotImplementedError
+
+    def stream(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Text deltas; closing the iterator early stops generation upstream."""
+        raise NotImplementedError
+
+    async def embed(self, text: str, model: str) -> Optional[List[float]]:
+        return None
+
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient):
+        super().__init__(settings.OPENAI_MAX_CONCURRENCY)
+        self.client = openai.AsyncOpenAI(
+            api_key=api_key,
+            http_client=http_client,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+        self.client_without_retries = self.client.with_options(max_retries=0)
+
+    async def complete(self, prompt, model, temperature=0.7, max_tokens=1000, retry=True, **kwargs):
+        client = self.client if retry else self.client_without_retries
+        async with self.limit:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        return response.choices[0].message.content
+
+    async def stream(self, prompt, model, temperature=0.7, max_tokens=1000, **kwargs):
+        async with self.limit:
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **kwargs
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.response.aclose()
+
+    async def embed(self, text, model):
+        async with self.limit:
+            response = await self.client.embeddings.create(model=model, input=text)
+        return response.data[0].embedding
+
+
+class AnthropicProvider(LLMProvider):
+    name = "anthropic"
+
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient):
+        super().__init__(settings.ANTHROPIC_MAX_CONCURRENCY)
+        self.client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            http_client=http_client,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+        self.client_without_retries = self.client.with_options(max_retries=0)
+
+    async def complete(self, prompt, model, temperature=0.7, max_tokens=1000, retry=True, **kwargs):
+        client = self.client if retry else self.client_without_retries
+        async with self.limit:
+            response = await client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[{"role": "user", "content": prompt}],
+                **kwargs
+            )
+        return response.content[0].text
+
+    async def stream(self, prompt, model, temperature=0.7, max_tokens=1000, **kwargs):
+        async with self.limit:
+            stream = await self.client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True,
+                **kwargs
+            )
+            try:
+                async for event in stream:
+                    if event.type == "content_block_delta" and event.delta.type == "text_delta":
+                        yield event.delta.text
+            finally:
+                await stream.response.aclose()
+
+
+class StubProviderError(Exception):
+    """Injected failure; `status_code` 429 marks it as throttling."""
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = httpx.Response(status_code, headers=headers)
+
+
+class StubProvider(LLMProvider):
+    """Deterministic local provider with configurable latency, token rate and failures.
+
+    Every call draws from its own RNG seeded by (seed, prompt, how many times
+    that prompt has been seen), so results do not depend on how concurrent
+    calls interleave. Latency to the first token follows `latency`
+    ("fixed", "uniform", "exponential" or "lognormal" around `latency_mean`),
+    then tokens arrive at `tokens_per_second`.
+    """
+
+    def __init__(
+        self,
+        name: str = "stub",
+        seed: int = 0,
+        latency: str = "lognormal",
+        latency_mean: float = 0.5,
+        latency_sigma: float = 0.5,
+        tokens_per_second: float = 50.0,
+        output_tokens: int = 200,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        max_concurrency: int = 16,
+    ):
+        super().__init__(max_concurrency)
+        self.name = name
+        self.seed = seed
+        self.latency = latency
+        self.latency_mean = latency_mean
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.seen: Dict[str, int] = {}
+        self.calls = 0
+
+    def _rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        if len(self.seen) > STUB_SEEN_PROMPTS_LIMIT:
+            self.seen.clear()
+        occurrence = self.seen.get(digest, 0)
+        self.seen[digest] = occurrence + 1
+        return random.Random(f"{self.seed}:{digest}:{occurrence}")
+
+    def _first_token_delay(self, rng: random.Random) -> float:
+        mean = self.latency_mean
+        if self.latency == "fixed":
+            return mean
+        if self.latency == "uniform":
+            return rng.uniform(0, 2 * mean)
+        if self.latency == "exponential":
+            return rng.expovariate(1 / mean) if mean > 0 else 0.0
+        # lognormal with the requested mean
+        mu = math.log(mean) - self.latency_sigma ** 2 / 2 if mean > 0 else 0.0
+        return rng.lognormvariate(mu, self.latency_sigma) if mean > 0 else 0.0
+
+    def _maybe_fail(self, rng: random.Random) -> None:
+        roll = rng.random()
+        if roll < self.throttle_rate:
+            raise StubProviderError("stub rate limit", 429, retry_after=0.5)
+        if roll < self.throttle_rate + self.error_rate:
+            raise StubProviderError("stub server error", 500)
+
+    def _answer(self, prompt: str, rng: random.Random, max_tokens: int) -> List[str]:
+        """Answer as a list of token strings; packed standup prompts get one section per team."""
+        teams = PACKED_TEAM_LABEL.findall(prompt)
+        per_section = min(self.output_tokens, max_tokens // max(len(teams), 1))
+        sections = teams or [None]
+        tokens: List[str] = []
+        for team in sections:
+            if team is not None:
+                tokens.append(("\n" if tokens else "") + f"### TEAM {team}\n")
+            tokens.extend(rng.choice(STUB_WORDS) + " " for _ in range(per_section))
+        return tokens
+
+    async def complete(self, prompt, model, temperature=0.7, max_tokens=1000, retry=True, **kwargs):
+        async with self.limit:
+            self.calls += 1
+            rng = self._rng(prompt)
+            await asyncio.sleep(self._first_token_delay(rng))
+            self._maybe_fail(rng)
+            tokens = self._answer(prompt, rng, max_tokens)
+            await asyncio.sleep(len(tokens) / self.tokens_per_second)
+        return "".join(tokens).strip()
+
+    async def stream(self, prompt, model, temperature=0.7, max_tokens=1000, **kwargs):
+        async with self.limit:
+            self.calls += 1
+            rng = self._rng(prompt)
+            await asyncio.sleep(self._first_token_delay(rng))
+            self._maybe_fail(rng)
+            for token in self._answer(prompt, rng, max_tokens):
+                yield token
+                await asyncio.sleep(1 / self.tokens_per_second)
+
+    async def embed(self, text, model):
+        rng = random.Random(f"{self.seed}:embed:{hashlib.sha256(text.encode()).hexdigest()}")
+        vector = [rng.gauss(0, 1) for _ in range(EMBEDDING_DIMENSIONS)]
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector]
+
+
+def build_stub_provider(name: str, max_concurrency: int) -> StubProvider:
+    return StubProvider(
+        name=name,
+        seed=settings.LLM_STUB_SEED,
+        latency=settings.LLM_STUB_LATENCY,
+        latency_mean=settings.LLM_STUB_LATENCY_MEAN_SECONDS,
+        latency_sigma=settings.LLM_STUB_LATENCY_SIGMA,
+        tokens_per_second=settings.LLM_STUB_TOKENS_PER_SECOND,
+        output_tokens=settings.LLM_STUB_OUTPUT_TOKENS,
+        error_rate=settings.LLM_STUB_ERROR_RATE,
+        throttle_rate=settings.LLM_STUB_THROTTLE_RATE,
+        max_concurrency=max_concurrency,
+    )
+
+
+def build_providers(http_client: httpx.AsyncClient) -> Dict[str, Optional[LLMProvider]]:
+    """Providers by name ("openai", "anthropic"); None where no API key is configured."""
+    if settings.LLM_PROVIDER == "stub":
+        return {
+            "openai": build_stub_provider("openai", settings.OPENAI_MAX_CONCURRENCY),
+            "anthropic": build_stub_provider("anthropic", settings.ANTHROPIC_MAX_CONCURRENCY),
+        }
+    return {
+        "openai": OpenAIProvider(settings.OPENAI_API_KEY, http_client) if settings.OPENAI_API_KEY else None,
+        "anthropic": AnthropicProvider(settings.ANTHROPIC_API_KEY, http_client) if settings.ANTHROPIC_API_KEY else None,
+    }
@@ -0,0 +1,129 @@
+"""
+Request coalescing for identical concurrent LLM calls.
+
+`SingleFlight` shares one in-flight call per key within a worker.
+`RedisSingleFlight` extends that across workers and nodes: the first caller
+takes a Redis lock and publishes its result under the lock's token, and
+everyone else waits for that result instead of calling the provider.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "singleflight:lock:"
+RESULT_PREFIX = "singleflight:result:"
+
+# Compare-and-delete, so a leader never releases a lock that expired and was retaken
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls with the same key inside one event loop.
+
+    The call runs as its own task, so a cancelled caller (e.g. a client that
+    disconnected) does not cancel the result the other callers are waiting on.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self.calls[key] = task
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+            metrics.incr("single_flight.leader")
+        else:
+            metrics.incr("single_flight.shared")
+        return await asyncio.shield(task)
+
+
+class RedisSingleFlight:
+    """Deduplicate identical calls across workers with a Redis lock.
+
+    Results must be JSON-serializable. If Redis is unavailable, or the leader
+    dies without publishing, callers fall back to running the call themselves.
+    """
+
+    def __init__(
+        self,
+        redis,
+        lock_seconds: int = 120,
+        result_seconds: int = 30,
+        local: SingleFlight = None,
+    ):
+        self.redis = redis
+        self.lock_ms = lock_seconds * 1000
+        self.result_ms = result_seconds * 1000
+        self.local = local or SingleFlight()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # Coalesce inside the worker first so only one caller per worker touches Redis
+        return await self.local.do(key, lambda: self._do_distributed(key, fn))
+
+    async def _do_distributed(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = LOCK_PREFIX + key
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(lock_key, token, nx=True, px=self.lock_ms)
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable, running locally: {e}")
+            return await fn()
+
+        if acquired:
+            return await self._lead(lock_key, token, fn)
+        return await self._follow(lock_key, fn)
+
+    async def _lead(self, lock_key: str, token: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await fn()
+            try:
+                await self.redis.set(RESULT_PREFIX + token, json.dumps(result), px=self.result_ms)
+            except Exception as e:
+                logger.warning(f"Single-flight result publish failed: {e}")
+            return result
+        finally:
+            try:
+                await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                logger.warning(f"Single-flight lock release failed: {e}")
+
+    async def _follow(self, lock_key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        deadline = time.monotonic() + self.lock_ms / 1000
+        delay = 0.05
+        try:
+            token = await self.redis.get(lock_key)
+            while token is not None and time.monotonic() < deadline:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.5)
+
+                published = await self.redis.get(RESULT_PREFIX + token)
+                if published is not None:
+                    metrics.incr("single_flight.remote_shared")
+                    return json.loads(published)
+                if await self.redis.get(lock_key) != token:
+                    # The leader finished or died; one last look for its result
+                    published = await self.redis.get(RESULT_PREFIX + token)
+                    if published is not None:
+                        metrics.incr("single_flight.remote_shared")
+                        return json.loads(published)
+                    break
+        except Exception as e:
+            logger.warning(f"Single-flight wait failed, running locally: {e}")
+
+        metrics.incr("single_flight.remote_fallback")
+        return await fn()
@@ -0,0 +1,61 @@
+"""
+Token counting for prompt budgets.
+
+Counts use tiktoken's cl100k_base encoding when it can be loaded. Claude's
+tokenizer is not public, so for Claude prompts this is an approximation, which
+is what a budget check needs. If tiktoken or its encoding file is unavailable
+(e.g. no network to fetch it), a conservative characters-per-token estimate is
+used instead.
+"""
+
+import logging
+import math
+from functools import lru_cache
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Deliberately low so the estimate errs towards over-counting
+ESTIMATED_CHARS_PER_TOKEN = 3.0
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return math.ceil(len(text) / ESTIMATED_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Collapse whitespace and cut to `max_chars`, marking the cut with an ellipsis."""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars - 1].rstrip() + "…"
+
+
+def chunk_lines(lines: List[str], max_tokens: int) -> List[List[str]]:
+    """Group lines in order into chunks of at most `max_tokens` (a longer single line is its own chunk)."""
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for line in lines:
+        tokens = count_tokens(line) + 1
+        if current and used + tokens > max_tokens:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(line)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
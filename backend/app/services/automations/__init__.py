@@ -0,0 +1 @@
+# Automations Services Package
@@ -0,0 +1,137 @@
+"""
+Execution of automation actions for events delivered by the dispatcher.
+
+Actions run in the dispatcher's transaction. Task changes go through the same
+steps as the task endpoints (rollup deltas, a `task_updated` outbox event one
+level deeper than the event that caused it, cache invalidation after commit),
+so rules can react to each other up to `AUTOMATION_MAX_CHAIN_DEPTH`. A
+misconfigured action is logged and skipped rather than failing the event.
+"""
+
+import logging
+import string
+from typing import Any, Dict, List
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import read_cache
+from app.core.metrics import metrics
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES, Task
+from app.services.automations.engine import CompiledRule
+from app.services.events.notifications import (
+    TEAM_NOTIFICATIONS_CHANNEL, USER_NOTIFICATIONS_CHANNEL, publish,
+)
+from app.services.events.outbox import record_event, task_payload
+from app.services.stats.rollup import apply_task_change, snapshot_task
+
+logger = logging.getLogger(__name__)
+
+# Task fields an update_task action may set
+ACTION_TASK_FIELDS = ("status", "priority", "assignee_id", "sprint_id")
+
+
+class ActionError(ValueError):
+    """An action whose configuration cannot be applied to the event."""
+
+
+class _BlankMissing(dict):
+    def __missing__(self, key):
+        return ""
+
+
+def render_message(template: str, event: Dict[str, Any]) -> str:
+    """Fill `{field}` and `{<aggregate>_<field>}` (e.g. `{sprint_name}`) from the event's data."""
+    prefix = event["aggregate_type"]
+    fields = _BlankMissing(event["data"])
+    fields.update({f"{prefix}_{name}": value for name, value in event["data"].items()})
+    try:
+        return string.Formatter().vformat(template, (), fields)
+    except (ValueError, IndexError):
+        return template
+
+
+def task_fields(config: Dict[str, Any]) -> Dict[str, Any]:
+    fields = {name: config[name] for name in ACTION_TASK_FIELDS if name in config}
+    if not fields:
+        raise ActionError(f"No task fields to set in {config!r}")
+    if "status" in fields and fields["status"] not in TASK_STATUSES:
+        raise ActionError(f"Invalid status {fields['status']!r}")
+    if "priority" in fields and fields["priority"] not in TASK_PRIORITIES:
+        raise ActionError(f"Invalid priority {fields['priority']!r}")
+    for name in ("assignee_id", "sprint_id"):
+        if fields.get(name) is not None:
+            try:
+                fields[name] = UUID(str(fields[name]))
+            except ValueError:
+                raise ActionError(f"Invalid {name} {fields[name]!r}")
+    return fields
+
+
+async def update_task(db: AsyncSession, event: Dict[str, Any], fields: Dict[str, Any], effects: List) -> None:
+    if event["aggregate_type"] != "task" or event["type"] == "task_deleted":
+        raise ActionError(f"{event['type']} events have no task to update")
+    task = await db.get(Task, UUID(event["aggregate_id"]), with_for_update=True)
+    if task is None:
+        return
+    changed = {name: value for name, value in fields.items() if getattr(task, name) != value}
+    if not changed:
+        return
+
+    before, previous = snapshot_task(task), task_payload(task)
+    for name, value in changed.items():
+        setattr(task, name, value)
+    await db.flush()
+    after = snapshot_task(task)
+    await apply_task_change(db, before, after)
+    record_event(db, "task_updated", "task", task_payload(task), previous, depth=event["depth"] + 1)
+    scopes = [f"task:{task.id}", *{f"project:{before['project_id']}", f"project:{after['project_id']}"}]
+    effects.append(lambda: read_cache.invalidate(*scopes))
+
+
+async def assign_task(db, rule, config, event, effects) -> None:
+    await update_task(db, event, task_fields({"assignee_id": config.get("assignee_id")}), effects)
+
+
+async def update_task_action(db, rule, config, event, effects) -> None:
+    await update_task(db, event, task_fields(config), effects)
+
+
+async def send_notification(db, rule, config, event, effects) -> None:
+    message = {
+        "type": "automation",
+        "automation_id": rule.id,
+        "event": event["type"],
+        "id": event["aggregate_id"],
+        "message": render_message(config.get("message") or rule.name, event),
+    }
+    recipients = config.get("recipients", "team")
+    if recipients == "team":
+        channels = [TEAM_NOTIFICATIONS_CHANNEL.format(event["team_id"])]
+    elif recipients == "assignee":
+        assignee_id = event["data"].get("assignee_id")
+        channels = [USER_NOTIFICATIONS_CHANNEL.format(assignee_id)] if assignee_id else []
+    elif isinstance(recipients, list):
+        channels = [USER_NOTIFICATIONS_CHANNEL.format(user_id) for user_id in recipients]
+    else:
+        raise ActionError(f"Invalid recipients {recipients!r}")
+    if channels:
+        effects.append(lambda: publish([(channel, message) for channel in channels]))
+
+
+ACTION_HANDLERS = {
+    "assign_task": assign_task,
+    "update_task": update_task_action,
+    "send_notification": send_notification,
+}
+
+
+async def run_action(
+    db: AsyncSession, rule: CompiledRule, action: Dict[str, Any], event: Dict[str, Any], effects: List
+) -> None:
+    try:
+        await ACTION_HANDLERS[action["type"]](db, rule, action.get("config") or {}, event, effects)
+        metrics.incr(f"automations.actions.{action['type']}")
+    except ActionError as e:
+        logger.warning(f"Automation {rule.id} action {action['type']} skipped for event {event['id']}: {e}")
+        metrics.incr("automations.actions.skipped")
@@ -0,0 +1,118 @@
+"""
+Five-field cron expressions for scheduled automations, evaluated in UTC.
+
+    minute hour day-of-month month day-of-week
+
+Each field takes `*`, numbers, ranges (`1-5`), steps (`*/15`, `0-30/10`) and
+comma-separated lists of those; day-of-week runs 0-6 from Sunday (7 is also
+Sunday). As in classic cron, when both day fields are restricted a day matches
+if either does.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import FrozenSet, Optional
+
+# (low, high) per field
+FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# A schedule that matches nothing within this many years (e.g. "0 0 31 2 *") is rejected
+SEARCH_YEARS = 5
+
+
+class CronError(ValueError):
+    """A cron expression that cannot be parsed."""
+
+
+def parse_field(text: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise CronError(f"Invalid step in {text!r}")
+            step = int(step_text)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            if not (start_text.isdigit() and end_text.isdigit()):
+                raise CronError(f"Invalid range in {text!r}")
+            start, end = int(start_text), int(end_text)
+        elif part.isdigit():
+            start = int(part)
+            # "5/15" means from 5 to the end, every 15
+            end = high if step > 1 else start
+        else:
+            raise CronError(f"Invalid field {text!r}")
+        if not low <= start <= end <= high:
+            raise CronError(f"{text!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    expression: str
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]
+    # Whether each day field was restricted, for the either-day rule
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        if not isinstance(expression, str):
+            raise CronError(f"Cron expression must be a string, got {expression!r}")
+        fields = expression.split()
+        if len(fields) != 5:
+            raise CronError(f"Cron expression needs 5 fields, got {expression!r}")
+        minutes, hours, days, months, weekdays = (
+            parse_field(text, low, high) for text, (low, high) in zip(fields, FIELD_RANGES)
+        )
+        schedule = cls(
+            expression=expression,
+            minutes=minutes,
+            hours=hours,
+            days=days,
+            months=months,
+            # Sunday is both 0 and 7
+            weekdays=frozenset(day % 7 for day in weekdays),
+            any_day=fields[2] == "*",
+            any_weekday=fields[4] == "*",
+        )
+        if schedule.next_after(datetime(2000, 1, 1)) is None:
+            raise CronError(f"{expression!r} never matches")
+        return schedule
+
+    def day_matches(self, moment: datetime) -> bool:
+        in_days = moment.day in self.days
+        # datetime counts Monday as 0, cron counts Sunday as 0
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, moment: datetime) -> Optional[datetime]:
+        """First matching minute strictly after `moment` (naive UTC), or None."""
+        current = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current + timedelta(days=366 * SEARCH_YEARS)
+        # Jump a month, day or hour at a time until every field matches
+        while current < limit:
+            if current.month not in self.months:
+                year, month = (current.year + 1, 1) if current.month == 12 else (current.year, current.month + 1)
+                current = current.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self.day_matches(current):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+            elif current.hour not in self.hours:
+                current = current.replace(minute=0) + timedelta(hours=1)
+            elif current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+            else:
+                return current
+        return None
+
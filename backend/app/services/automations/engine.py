@@ -0,0 +1,521 @@
+"""
+Compiled, indexed evaluation of automation rules against domain events.
+
+A rule is compiled once, when it is saved or loaded: each condition becomes a
+closure with its field lookup and operand bound, and the conditions run in
+order of cost. The compiled rules of a team are then indexed by trigger type
+and, for rules with an equality condition (`equals`, or `in` with a list),
+by that field's value, so an event only evaluates the rules that could match:
+
+    task_updated, priority == "high"  ->  rules indexed on priority "high"
+                                           + rules without an equality condition
+
+Events are plain dicts in JSON form (ids as strings):
+
+    {"type": "task_updated", "team_id": "...", "data": {...}, "previous": {...}}
+
+Condition fields name keys of `data`; `previous.<field>` reads the value
+before an update. Actions are validated here but executed by the caller.
+
+Time-based triggers are fired by the scheduler (`app.services.automations.scheduler`)
+as ordinary events: `task_due` carries the task plus the rule's `hours_before`,
+`schedule` carries the rule's own id, and compiling such a rule adds the
+matching equality condition so only the rules the event was fired for match.
+
+Every worker keeps its own index. Writes through the API update it directly
+and bump a Redis version; event consumers call `refresh()`, which reloads the
+rules once that version moves, checking at most every `AUTOMATION_RELOAD_SECONDS`.
+A worker adopts the version its own bump returns only when no other worker's
+bump came in between; otherwise its next refresh reloads.
+"""
+
+import logging
+import operator as operator_module
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.models.automation import Automation
+from app.services.automations.cron import CronError, CronSchedule
+
+logger = logging.getLogger(__name__)
+
+TRIGGER_TYPES = (
+    "task_created", "task_updated", "task_deleted", "sprint_updated", "sprint_started", "sprint_completed",
+    "task_due", "schedule",
+)
+# Triggers fired by the scheduler rather than by a write
+TIME_TRIGGER_TYPES = ("task_due", "schedule")
+DEFAULT_HOURS_BEFORE = 24
+ACTION_TYPES = ("assign_task", "update_task", "send_notification")
+
+PREVIOUS_PREFIX = "previous."
+
+# Equality conditions on these fields split the rules most finely, so a rule
+# is indexed on the first of them it tests; other fields come after, in rule order
+INDEX_FIELD_PREFERENCE = ("id", "project_id", "sprint_id", "assignee_id")
+
+VERSION_KEY = "automations:version"
+
+Event = Dict[str, Any]
+Predicate = Callable[[Event], bool]
+
+COMPARISONS = {
+    "greater_than": operator_module.gt,
+    "less_than": operator_module.lt,
+    "at_least": operator_module.ge,
+    "at_most": operator_module.le,
+}
+
+OPERATORS = (
+    "equals", "not_equals", "in", "not_in", "contains", "not_contains",
+    "greater_than", "less_than", "at_least", "at_most", "is_empty", "is_not_empty", "changed",
+)
+
+
+class RuleError(ValueError):
+    """A rule definition that cannot be compiled."""
+
+
+def field_getter(name: str) -> Callable[[Event], Any]:
+    if name.startswith(PREVIOUS_PREFIX):
+        name = name[len(PREVIOUS_PREFIX):]
+
+        def get_previous(event: Event) -> Any:
+            previous = event.get("previous")
+            return None if previous is None else previous.get(name)
+
+        return get_previous
+
+    def get(event: Event) -> Any:
+        return event["data"].get(name)
+
+    return get
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _number(value: Any, operator: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise RuleError(f"'{operator}' needs a number, got {value!r}")
+    return value
+
+
+def _members(value: Any, operator: str):
+    if not isinstance(value, list):
+        raise RuleError(f"'{operator}' needs a list, got {value!r}")
+    return frozenset(value) if all(_hashable(item) for item in value) else tuple(value)
+
+
+def compile_condition(condition: Dict[str, Any]) -> Predicate:
+    name = condition.get("field")
+    operator = condition.get("operator")
+    value = condition.get("value")
+    if not isinstance(name, str) or not name:
+        raise RuleError(f"Condition needs a field: {condition!r}")
+    get = field_getter(name)
+
+    if operator == "equals":
+        return lambda event: get(event) == value
+    if operator == "not_equals":
+        return lambda event: get(event) != value
+    if operator in ("in", "not_in"):
+        members = _members(value, operator)
+        if operator == "in":
+            return lambda event: _contains(members, get(event))
+        return lambda event: not _contains(members, get(event))
+    if operator in ("contains", "not_contains"):
+        if not isinstance(value, str):
+            raise RuleError(f"'{operator}' needs a string, got {value!r}")
+        needle = value.lower()
+        if operator == "contains":
+            return lambda event: _includes(get(event), needle)
+        return lambda event: not _includes(get(event), needle)
+    if operator in COMPARISONS:
+        bound = _number(value, operator)
+        compare = COMPARISONS[operator]
+
+        def check_number(event: Event) -> bool:
+            current = get(event)
+            # Missing and non-numeric values never satisfy a comparison
+            return isinstance(current, (int, float)) and not isinstance(current, bool) and compare(current, bound)
+
+        return check_number
+    if operator == "is_empty":
+        return lambda event: get(event) in (None, "", [])
+    if operator == "is_not_empty":
+        return lambda event: get(event) not in (None, "", [])
+    if operator == "changed":
+        if name.startswith(PREVIOUS_PREFIX):
+            raise RuleError("'changed' applies to the current value, not previous.*")
+        get_previous = field_getter(PREVIOUS_PREFIX + name)
+        return lambda event: event.get("previous") is not None and get(event) != get_previous(event)
+    raise RuleError(f"Unknown operator {operator!r}")
+
+
+def _contains(members, value: Any) -> bool:
+    try:
+        return value in members
+    except TypeError:
+        return False
+
+
+def _includes(value: Any, needle: str) -> bool:
+    if isinstance(value, str):
+        return needle in value.lower()
+    if isinstance(value, list):
+        return any(isinstance(item, str) and item.lower() == needle for item in value)
+    return False
+
+
+def all_of(checks: Sequence[Predicate]) -> Predicate:
+    if not checks:
+        return lambda event: True
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(event: Event) -> bool:
+        for check in checks:
+            if not check(event):
+                return False
+        return True
+
+    return check_all
+
+
+@dataclass(eq=False)
+class CompiledRule:
+    id: str
+    team_id: str
+    trigger_type: str
+    name: str
+    actions: List[Dict[str, Any]]
+    # Conditions left to evaluate once the index has matched
+    predicate: Predicate
+    # Equality condition the rule is indexed on: field and accepted values
+    index_field: Optional[str] = None
+    index_values: Tuple[Any, ...] = ()
+    # Save order, so matches come back in a stable order
+    order: int = 0
+    trigger_config: Dict[str, Any] = field(default_factory=dict)
+    # The conditions behind `predicate`, one check each, cheapest first
+    checks: Tuple[Predicate, ...] = ()
+
+
+def index_condition(conditions: Sequence[Dict[str, Any]]) -> Optional[int]:
+    """Position of the equality condition to index the rule on, if any."""
+    candidates = []
+    for position, condition in enumerate(conditions):
+        name, operator, value = condition.get("field"), condition.get("operator"), condition.get("value")
+        if name.startswith(PREVIOUS_PREFIX):
+            continue
+        if operator == "equals" and _hashable(value):
+            candidates.append(position)
+        elif operator == "in" and isinstance(value, list) and value and all(_hashable(v) for v in value):
+            candidates.append(position)
+    if not candidates:
+        return None
+
+    def rank(position: int):
+        name = conditions[position]["field"]
+        preferred = (
+            INDEX_FIELD_PREFERENCE.index(name) if name in INDEX_FIELD_PREFERENCE else len(INDEX_FIELD_PREFERENCE)
+        )
+        # A single value narrows more than a list of them
+        return preferred, conditions[position]["operator"] != "equals", position
+
+    return min(candidates, key=rank)
+
+
+def trigger_conditions(rule_id: Any, trigger_type: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Conditions implied by a time-based trigger's config; validates it."""
+    if trigger_type == "task_due":
+        hours = config.get("hours_before", DEFAULT_HOURS_BEFORE)
+        if isinstance(hours, bool) or not isinstance(hours, (int, float)) or hours < 0:
+            raise RuleError(f"hours_before must be a number of hours >= 0, got {hours!r}")
+        return [{"field": "hours_before", "operator": "equals", "value": hours}]
+    if trigger_type == "schedule":
+        try:
+            CronSchedule.parse(config.get("cron"))
+        except CronError as e:
+            raise RuleError(str(e))
+        return [{"field": "id", "operator": "equals", "value": str(rule_id)}]
+    return []
+
+
+# Cheap checks first, so most non-matching rules are rejected by one dict lookup
+OPERATOR_COST = {"equals": 0, "not_equals": 0, "in": 1, "not_in": 1, "is_empty": 1, "is_not_empty": 1, "changed": 2}
+
+
+def compile_rule(
+    rule_id: Any,
+    team_id: Any,
+    trigger_type: str,
+    conditions: Sequence[Dict[str, Any]],
+    actions: Sequence[Dict[str, Any]],
+    name: str = "",
+    order: int = 0,
+    trigger_config: Optional[Dict[str, Any]] = None,
+) -> CompiledRule:
+    """Validate a rule and compile its conditions; raises RuleError."""
+    if trigger_type not in TRIGGER_TYPES:
+        raise RuleError(f"Unknown trigger type {trigger_type!r}")
+    trigger_config = trigger_config or {}
+    for action in actions:
+        if not isinstance(action, dict) or action.get("type") not in ACTION_TYPES:
+            raise RuleError(f"Unknown action {action!r}")
+    for condition in conditions:
+        if not isinstance(condition, dict):
+            raise RuleError(f"Condition must be an object: {condition!r}")
+    conditions = [*trigger_conditions(rule_id, trigger_type, trigger_config), *conditions]
+
+    checks = [(OPERATOR_COST.get(c.get("operator"), 3), compile_condition(c)) for c in conditions]
+    indexed = index_condition(conditions)
+    index_field, index_values = None, ()
+    if indexed is not None:
+        condition = conditions[indexed]
+        index_field = condition["field"]
+        if condition["operator"] == "equals":
+            index_values = (condition["value"],)
+        else:
+            index_values = tuple(dict.fromkeys(condition["value"]))
+        del checks[indexed]
+    checks.sort(key=lambda check: check[0])
+    ordered = tuple(check for _, check in checks)
+
+    return CompiledRule(
+        id=str(rule_id),
+        team_id=str(team_id),
+        trigger_type=trigger_type,
+        name=name,
+        actions=list(actions),
+        predicate=all_of(ordered),
+        index_field=index_field,
+        index_values=index_values,
+        order=order,
+        trigger_config=dict(trigger_config),
+        checks=ordered,
+    )
+
+
+def compile_automation(automation: Automation, order: int = 0) -> CompiledRule:
+    return compile_rule(
+        automation.id,
+        automation.team_id,
+        automation.trigger_type,
+        automation.conditions or [],
+        automation.actions or [],
+        name=automation.name,
+        order=order,
+        trigger_config=automation.trigger_config or {},
+    )
+
+
+@dataclass
+class TriggerBucket:
+    """Rules of one team and trigger type."""
+    scan: List[CompiledRule] = field(default_factory=list)
+    # field -> value -> rules with an equality condition on it
+    by_field: Dict[str, Dict[Any, List[CompiledRule]]] = field(default_factory=dict)
+
+    def add(self, rule: CompiledRule) -> None:
+        if rule.index_field is None:
+            self.scan.append(rule)
+            return
+        by_value = self.by_field.setdefault(rule.index_field, {})
+        for value in rule.index_values:
+            by_value.setdefault(value, []).append(rule)
+
+    def remove(self, rule: CompiledRule) -> None:
+        if rule.index_field is None:
+            self.scan.remove(rule)
+            return
+        by_value = self.by_field[rule.index_field]
+        for value in rule.index_values:
+            by_value[value].remove(rule)
+            if not by_value[value]:
+                del by_value[value]
+        if not by_value:
+            del self.by_field[rule.index_field]
+
+    def __bool__(self) -> bool:
+        return bool(self.scan or self.by_field)
+
+    def candidates(self, data: Dict[str, Any]) -> List[CompiledRule]:
+        groups = [self.scan] if self.scan else []
+        for name, by_value in self.by_field.items():
+            try:
+                rules = by_value.get(data.get(name))
+            except TypeError:
+                continue
+            if rules:
+                groups.append(rules)
+        if len(groups) == 1:
+            return groups[0]
+        return [rule for group in groups for rule in group]
+
+
+class RuleIndex:
+    """Compiled rules by (team, trigger type) and indexed equality condition."""
+
+    def __init__(self, rules: Iterable[CompiledRule] = ()):
+        self.rules: Dict[str, CompiledRule] = {}
+        self.buckets: Dict[Tuple[str, str], TriggerBucket] = {}
+        self.next_order = 0
+        for rule in rules:
+            self.add(rule)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def add(self, rule: CompiledRule) -> None:
+        """Add a rule, replacing any earlier version of it."""
+        self.remove(rule.id)
+        if not rule.order:
+            self.next_order += 1
+            rule.order = self.next_order
+        else:
+            self.next_order = max(self.next_order, rule.order)
+        self.rules[rule.id] = rule
+        self.buckets.setdefault((rule.team_id, rule.trigger_type), TriggerBucket()).add(rule)
+
+    def remove(self, rule_id: Any) -> None:
+        rule = self.rules.pop(str(rule_id), None)
+        if rule is None:
+            return
+        key = (rule.team_id, rule.trigger_type)
+        bucket = self.buckets[key]
+        bucket.remove(rule)
+        if not bucket:
+            del self.buckets[key]
+
+    def match(self, event: Event) -> List[CompiledRule]:
+        """Rules whose trigger and conditions all match `event`, in save order."""
+        bucket = self.buckets.get((event.get("team_id"), event.get("type")))
+        if bucket is None:
+            return []
+        matched = [rule for rule in bucket.candidates(event["data"]) if rule.predicate(event)]
+        if len(matched) > 1:
+            matched.sort(key=lambda rule: rule.order)
+        return matched
+
+
+class AutomationEngine:
+    """This worker's rule index, kept in step with the automations table."""
+
+    def __init__(self):
+        self.index = RuleIndex()
+        self.version: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        # False until a load succeeds, e.g. when the database was down at startup
+        self.loaded = False
+
+    def match(self, event: Event) -> List[CompiledRule]:
+        return self.index.match(event)
+
+    def has_rules(self, team_id: Optional[str], trigger_type: str) -> bool:
+        return (team_id, trigger_type) in self.index.buckets
+
+    async def load(self, db: AsyncSession) -> int:
+        """Rebuild the index from every enabled automation; returns the rule count."""
+        index = RuleIndex()
+        result = await db.stream_scalars(
+            select(Automation).where(Automation.enabled.is_(True)).order_by(Automation.created_at, Automation.id)
+        )
+        async for automation in result:
+            try:
+                index.add(compile_automation(automation, order=len(index) + 1))
+            except RuleError as e:
+                # Saved before a rule format change; skip it rather than fail every event
+                logger.error(f"Automation {automation.id} does not compile: {e}")
+        self.index = index
+        return len(index)
+
+    def apply(self, automation: Automation) -> None:
+        """Reflect a saved automation; raises RuleError if it does not compile."""
+        rule = compile_automation(automation)
+        if automation.enabled:
+            self.index.add(rule)
+        else:
+            self.index.remove(automation.id)
+
+    def remove(self, automation_id: Any) -> None:
+        self.index.remove(automation_id)
+
+    async def publish(self) -> None:
+        """Tell other workers the rules changed; call after committing a write."""
+        try:
+            version = await redis_client.incr(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Automation version bump failed: {e}")
+            return
+        if version == int(self.version or 0) + 1:
+            self.version = str(version)
+        else:
+            # Another worker changed the rules since our last load; have the next refresh pick that up
+            self.checked_at = None
+
+    async def refresh(self, db_factory, force: bool = False) -> bool:
+        """
+        Reload the rules if another worker changed them; returns whether it did.
+
+        Checks the Redis version at most every `AUTOMATION_RELOAD_SECONDS`;
+        until a load has succeeded, every call tries one.
+        """
+        force = force or not self.loaded
+        now = time.monotonic()
+        if not force and self.checked_at is not None and now - self.checked_at < settings.AUTOMATION_RELOAD_SECONDS:
+            return False
+        self.checked_at = now
+        try:
+            version = await redis_client.get(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Automation version check failed: {e}")
+            version = self.version
+        if not force and version == self.version:
+            return False
+        async with db_factory() as db:
+            count = await self.load(db)
+        self.version = version
+        self.loaded = True
+        logger.info(f"Loaded {count} automation rules (version {version})")
+        return True
+
+
+# Process-wide engine, loaded by the application lifespan
+_automation_engine: Optional[AutomationEngine] = None
+
+
+async def init_automation_engine(db_factory) -> AutomationEngine:
+    global _automation_engine
+    if _automation_engine is None:
+        _automation_engine = AutomationEngine()
+        try:
+            await _automation_engine.refresh(db_factory, force=True)
+        except Exception as e:
+            # Event consumers and the scheduler refresh before matching, which retries it
+            logger.warning(f"Automation rules not loaded, retrying on the next refresh: {e}")
+    return _automation_engine
+
+
+def close_automation_engine() -> None:
+    global _automation_engine
+    _automation_engine = None
+
+
+def get_automation_engine() -> AutomationEngine:
+    """FastAPI dependency returning the shared AutomationEngine."""
+    if _automation_engine is None:
+        raise RuntimeError("AutomationEngine is not initialized; it is created in the app lifespan")
+    return _automation_engine
@@ -0,0 +1,523 @@
+"""
+Scheduler for time-based automation triggers: `task_due` and `schedule` (cron).
+
+Upcoming fire times are kept in a min-heap in the memory of one node, the
+leader, elected with a Redis lock that it renews every third of
+`AUTOMATION_SCHEDULER_LOCK_SECONDS`; other nodes stay idle until the lock is
+free. Firing a trigger records a `task_due` or `schedule` event in the outbox,
+so the rule's actions run in the event dispatcher like those of any other
+rule. A Redis mark per trigger and fire time keeps a trigger from firing twice
+when leadership changes hands.
+
+Due-date timers are loaded a window at a time, never the whole tasks table:
+the leader range-scans `idx_tasks_due_date` for open tasks whose fire time
+(`due_date - hours_before`) falls within the next
+`AUTOMATION_SCHEDULER_HORIZON_SECONDS`, in keyset chunks, and slides the window
+forward as time passes. Task changes that move a due date, close a task or
+delete it reach the leader over Redis pub/sub (`SchedulerConsumer` publishes
+them once the dispatcher commits). Tasks are re-read when their timers fire,
+so a missed message never fires a stale trigger.
+
+Pub/sub delivers at most once, so the leader can miss changes: those sent
+while it resubscribes or changes hands, bulk imports that record no events,
+and changes `SchedulerConsumer` drops before its rule index catches up with a
+new rule. Every `AUTOMATION_SCHEDULER_RESCAN_SECONDS` the leader therefore
+re-reads the whole loaded window, which schedules the tasks it missed; the
+fired marks keep timers that already fired from firing again.
+
+A task whose fire time has already passed when it is scheduled (created due in
+two hours under a 24-hour rule) fires at once, as long as it is not yet due.
+Cron schedules run in UTC; runs due while no node was leader are skipped.
+
+The leader also queues the `stats.refresh_overdue` job every
+`STATS_OVERDUE_REFRESH_SECONDS`, keyed by interval so a new leader does not
+queue it twice.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.core.redis import redis_client
+from app.models.project import Project
+from app.models.task import Task
+from app.services.automations.cron import CronSchedule
+from app.services.automations.engine import DEFAULT_HOURS_BEFORE, AutomationEngine, init_automation_engine
+from app.services.events.notifications import publish
+from app.services.events.outbox import outbox_row, record_events, task_payload
+from app.services.jobs.queue import get_job_queue
+
+logger = logging.getLogger(__name__)
+
+LEADER_KEY = "automations:scheduler:leader"
+FIRED_PREFIX = "automations:scheduler:fired:"
+TASK_CHANGES_CHANNEL = "automations:scheduler:tasks"
+
+# Extend the lock only if this node still holds it
+RENEW_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# How long a cron run's fired mark outlives the run
+CRON_MARK_SECONDS = 86400
+
+
+class LeaderLock:
+    """A Redis lock naming the one node that fires scheduled triggers."""
+
+    def __init__(self, key: str, ttl_seconds: float):
+        self.key = key
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.token = uuid.uuid4().hex
+        self.held = False
+
+    async def hold(self) -> bool:
+        """Take or renew the lock; returns whether this node is leader. Redis errors mean it is not."""
+        try:
+            if self.held:
+                self.held = bool(await redis_client.eval(RENEW_LOCK_SCRIPT, 1, self.key, self.token, self.ttl_ms))
+            if not self.held:
+                self.held = bool(await redis_client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        except Exception as e:
+            logger.warning(f"Scheduler leader lock unavailable: {e}")
+            self.held = False
+        return self.held
+
+    async def release(self) -> None:
+        if not self.held:
+            return
+        self.held = False
+        try:
+            await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, self.key, self.token)
+        except Exception as e:
+            logger.warning(f"Scheduler leader lock release failed: {e}")
+
+
+class TimerHeap:
+    """
+    Fire times by key in a min-heap.
+
+    Rescheduling or cancelling a key leaves its old heap entry behind, to be
+    skipped when it reaches the top; the heap is rebuilt once such entries
+    outnumber the live ones.
+    """
+
+    def __init__(self):
+        self.heap: List[Tuple[datetime, int, Hashable]] = []
+        # key -> (sequence number of its live heap entry, fire time, value)
+        self.timers: Dict[Hashable, Tuple[int, datetime, Any]] = {}
+        self.sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def schedule(self, key: Hashable, fire_at: datetime, value: Any = None) -> None:
+        number = next(self.sequence)
+        self.timers[key] = (number, fire_at, value)
+        heapq.heappush(self.heap, (fire_at, number, key))
+        if len(self.heap) > 2 * len(self.timers) + 1024:
+            self.heap = [(at, n, k) for k, (n, at, _) in self.timers.items()]
+            heapq.heapify(self.heap)
+
+    def cancel(self, key: Hashable) -> None:
+        self.timers.pop(key, None)
+
+    def clear(self) -> None:
+        self.heap.clear()
+        self.timers.clear()
+
+    def next_fire_at(self) -> Optional[datetime]:
+        while self.heap:
+            fire_at, number, key = self.heap[0]
+            live = self.timers.get(key)
+            if live is not None and live[0] == number:
+                return fire_at
+            heapq.heappop(self.heap)
+        return None
+
+    def pop_due(self, now: datetime, limit: int) -> List[Tuple[Hashable, datetime, Any]]:
+        """Up to `limit` timers due at `now`, earliest first, removed from the heap."""
+        due = []
+        while len(due) < limit:
+            fire_at = self.next_fire_at()
+            if fire_at is None or fire_at > now:
+                break
+            _, _, key = heapq.heappop(self.heap)
+            _, _, value = self.timers.pop(key)
+            due.append((key, fire_at, value))
+        return due
+
+
+def time_rules(engine: AutomationEngine) -> Tuple[Dict[str, Tuple[float, ...]], Dict[str, Tuple[str, str]]]:
+    """The `hours_before` offsets of each team's task_due rules, and every schedule rule's (team, cron)."""
+    offsets: Dict[str, Set[float]] = {}
+    crons: Dict[str, Tuple[str, str]] = {}
+    for rule in engine.index.rules.values():
+        if rule.trigger_type == "task_due":
+            offsets.setdefault(rule.team_id, set()).add(rule.trigger_config.get("hours_before", DEFAULT_HOURS_BEFORE))
+        elif rule.trigger_type == "schedule":
+            crons[rule.id] = (rule.team_id, rule.trigger_config["cron"])
+    return {team_id: tuple(sorted(hours)) for team_id, hours in offsets.items()}, crons
+
+
+async def publish_task_changes(changes: List[Dict[str, Any]]) -> None:
+    """Send task changes that move due-date timers to the scheduler leader."""
+    await publish([(TASK_CHANGES_CHANNEL, {"changes": changes})])
+
+
+class AutomationScheduler:
+    """Leader-elected timers for `task_due` and `schedule` automations."""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.lock = LeaderLock(LEADER_KEY, settings.AUTOMATION_SCHEDULER_LOCK_SECONDS)
+        self.timers = TimerHeap()
+        self.offsets: Dict[str, Tuple[float, ...]] = {}
+        self.crons: Dict[str, Tuple[str, str]] = {}
+        # Due-date timers firing before this are loaded
+        self.loaded_until: Optional[datetime] = None
+        # When the leader next re-reads the loaded window
+        self.next_rescan: Optional[datetime] = None
+        # When the leader next queues the overdue-count refresh
+        self.next_refresh: Optional[datetime] = None
+        self.leading = False
+        self.wakeup = asyncio.Event()
+        self.stopping = asyncio.Event()
+        self.tasks: List[asyncio.Task] = []
+        metrics.gauge("automations.scheduler.timers", lambda: len(self.timers))
+
+    # Timers
+
+    def schedule_task(self, task_id: str, team_id: str, due_date: datetime, hours: float) -> None:
+        fire_at = due_date - timedelta(hours=hours)
+        self.timers.schedule(("task", task_id, hours), fire_at, (team_id, due_date))
+
+    def schedule_cron(self, rule_id: str, team_id: str, expression: str, after: datetime) -> None:
+        schedule = CronSchedule.parse(expression)
+        fire_at = schedule.next_after(after)
+        if fire_at is not None:
+            self.timers.schedule(("cron", rule_id), fire_at, (team_id, schedule))
+
+    def task_changed(self, change: Dict[str, Any]) -> None:
+        """Move a task's due-date timers after it changed; ignored unless leading."""
+        if not self.leading:
+            return
+        now = datetime.utcnow()
+        due_date = datetime.fromisoformat(change["due_date"]) if change.get("due_date") else None
+        for hours in self.offsets.get(change["team_id"], ()):
+            self.timers.cancel(("task", change["id"], hours))
+            if change.get("deleted") or change.get("status") == "done" or due_date is None or due_date <= now:
+                continue
+            # Timers beyond the window are loaded when it gets there
+            if self.loaded_until is not None and due_date - timedelta(hours=hours) < self.loaded_until:
+                self.schedule_task(change["id"], change["team_id"], due_date, hours)
+        self.wakeup.set()
+
+    # Rules and the due-date window
+
+    async def sync_rules(self, now: datetime) -> None:
+        """Follow rule changes: a new set of due-date offsets reloads the window, cron timers are redone."""
+        engine = await init_automation_engine(self.session_factory)
+        await engine.refresh(self.session_factory)
+        offsets, crons = time_rules(engine)
+        if offsets != self.offsets:
+            self.offsets = offsets
+            for key in [key for key in self.timers.timers if key[0] == "task"]:
+                self.timers.cancel(key)
+            self.loaded_until = None
+        if crons != self.crons:
+            for rule_id in self.crons.keys() - crons.keys():
+                self.timers.cancel(("cron", rule_id))
+            for rule_id, (team_id, expression) in crons.items():
+                if self.crons.get(rule_id) != (team_id, expression):
+                    self.schedule_cron(rule_id, team_id, expression, now)
+            self.crons = crons
+
+    async def extend_window(self, now: datetime) -> int:
+        """Load due-date timers up to the horizon once half the loaded window has passed."""
+        horizon = timedelta(seconds=settings.AUTOMATION_SCHEDULER_HORIZON_SECONDS)
+        if self.loaded_until is not None and self.loaded_until - now > horizon / 2:
+            return 0
+        if self.loaded_until is None:
+            # A fresh window is as good as a rescan
+            self.next_rescan = now + timedelta(seconds=settings.AUTOMATION_SCHEDULER_RESCAN_SECONDS)
+        end = now + horizon
+        loaded = await self.load_window(now, self.loaded_until, end)
+        self.loaded_until = end
+        if loaded:
+            logger.info(f"Scheduler loaded {loaded} due-date timers up to {end.isoformat()}")
+        return loaded
+
+    async def rescan_window(self, now: datetime) -> int:
+        """Re-read the loaded window every `AUTOMATION_SCHEDULER_RESCAN_SECONDS`; returns the timers loaded."""
+        interval = settings.AUTOMATION_SCHEDULER_RESCAN_SECONDS
+        if interval <= 0 or self.loaded_until is None or self.next_rescan is None or now < self.next_rescan:
+            return 0
+        self.next_rescan = now + timedelta(seconds=interval)
+        # Rescheduling a known timer replaces it, so only missed changes make a difference
+        loaded = await self.load_window(now, None, self.loaded_until)
+        metrics.incr("automations.scheduler.rescanned", loaded)
+        return loaded
+
+    async def load_window(self, now: datetime, start: Optional[datetime], end: datetime) -> int:
+        """Schedule the due-date timers firing in [start, end), or up to `end` without a start."""
+        teams_by_hours: Dict[float, List[UUID]] = {}
+        for team_id, offsets in self.offsets.items():
+            for hours in offsets:
+                teams_by_hours.setdefault(hours, []).append(UUID(team_id))
+
+        loaded = 0
+        if teams_by_hours:
+            async with self.session_factory() as db:
+                for hours, team_ids in teams_by_hours.items():
+                    offset = timedelta(hours=hours)
+                    # Tasks not yet due whose fire time is in the window
+                    low = now if start is None else max(now, start + offset)
+                    loaded += await self.load_range(db, team_ids, hours, low, end + offset)
+        return loaded
+
+    async def load_range(
+        self, db: AsyncSession, team_ids: List[UUID], hours: float, low: datetime, high: datetime
+    ) -> int:
+        """Schedule open tasks of `team_ids` due in [low, high), walking idx_tasks_due_date in chunks."""
+        chunk = settings.AUTOMATION_SCHEDULER_LOAD_CHUNK
+        query = (
+            select(Task.id, Task.due_date, Project.team_id)
+            .join(Project, Project.id == Task.project_id)
+            .where(
+                Task.due_date >= low, Task.due_date < high, Task.status != "done",
+                Project.team_id.in_(team_ids),
+            )
+            .order_by(Task.due_date, Task.id)
+            .limit(chunk)
+        )
+        loaded, after = 0, None
+        while True:
+            page = query if after is None else query.where(tuple_(Task.due_date, Task.id) > tuple_(*after))
+            rows = (await db.execute(page)).all()
+            for task_id, due_date, team_id in rows:
+                self.schedule_task(str(task_id), str(team_id), due_date, hours)
+            loaded += len(rows)
+            if len(rows) < chunk:
+                return loaded
+            after = (rows[-1].due_date, rows[-1].id)
+
+    # Firing
+
+    async def claim(self, marks: List[Tuple[str, int]]) -> List[bool]:
+        """Set each (key, ttl) fired mark unless it exists; True where this call set it."""
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, ttl in marks:
+                pipe.set(key, "1", nx=True, ex=max(ttl, 1))
+            return [bool(claimed) for claimed in await pipe.execute()]
+
+    async def task_due_rows(
+        self, db: AsyncSession, due: List[Tuple[Hashable, datetime, Any]], now: datetime
+    ) -> List[Tuple[Dict[str, Any], Tuple[str, int]]]:
+        """Re-read the tasks of due timers; returns (outbox row, fired mark) for those still due."""
+        task_ids = {UUID(key[1]) for key, _, _ in due}
+        tasks = {
+            str(task.id): task
+            for task in (await db.execute(select(Task).where(Task.id.in_(task_ids)))).scalars()
+        }
+        rows = []
+        for (_, task_id, hours), _, (team_id, due_date) in due:
+            task = tasks.get(task_id)
+            if task is None or task.status == "done" or task.due_date is None or task.due_date <= now:
+                metrics.incr("automations.scheduler.stale")
+                continue
+            if task.due_date != due_date:
+                # Moved without the scheduler hearing of it: fire at the new time instead
+                metrics.incr("automations.scheduler.stale")
+                self.task_changed({"id": task_id, "team_id": team_id, "due_date": task.due_date.isoformat()})
+                continue
+            data = {**task_payload(task), "hours_before": hours}
+            mark = f"{FIRED_PREFIX}task:{task_id}:{hours}:{due_date.isoformat()}"
+            # Kept until an hour after the task is due, when it can no longer fire
+            ttl = int((due_date - now).total_seconds()) + 3600
+            rows.append((outbox_row("task_due", "task", data), (mark, ttl)))
+        return rows
+
+    def cron_rows(
+        self, due: List[Tuple[Hashable, datetime, Any]], now: datetime
+    ) -> List[Tuple[Dict[str, Any], Tuple[str, int]]]:
+        rows = []
+        for (_, rule_id), fire_at, (team_id, schedule) in due:
+            data = {"id": rule_id, "cron": schedule.expression, "fired_at": fire_at.isoformat()}
+            mark = f"{FIRED_PREFIX}schedule:{rule_id}:{fire_at.isoformat()}"
+            rows.append((outbox_row("schedule", "automation", data, team_id=team_id), (mark, CRON_MARK_SECONDS)))
+            next_at = schedule.next_after(max(fire_at, now))
+            if next_at is not None:
+                self.timers.schedule(("cron", rule_id), next_at, (team_id, schedule))
+        return rows
+
+    async def fire_due(self, now: datetime) -> int:
+        """Record an event for every timer due at `now`; returns the number fired."""
+        fired = 0
+        while True:
+            due = self.timers.pop_due(now, settings.AUTOMATION_SCHEDULER_BATCH_SIZE)
+            if not due:
+                return fired
+            claimed_marks: List[str] = []
+            try:
+                async with self.session_factory() as db:
+                    candidates = self.cron_rows([timer for timer in due if timer[0][0] == "cron"], now)
+                    task_timers = [timer for timer in due if timer[0][0] == "task"]
+                    if task_timers:
+                        candidates += await self.task_due_rows(db, task_timers, now)
+                    if not candidates:
+                        continue
+                    claimed = await self.claim([mark for _, mark in candidates])
+                    claimed_marks = [mark[0] for (_, mark), won in zip(candidates, claimed) if won]
+                    rows = [row for (row, _), won in zip(candidates, claimed) if won]
+                    metrics.incr("automations.scheduler.duplicate", len(candidates) - len(rows))
+                    if rows:
+                        await record_events(db, rows)
+                        await db.commit()
+            except Exception:
+                # Put the batch back for the next tick, and let it fire then
+                for key, fire_at, value in due:
+                    self.timers.schedule(key, fire_at, value)
+                if claimed_marks:
+                    try:
+                        await redis_client.delete(*claimed_marks)
+                    except Exception as e:
+                        logger.warning(f"Scheduler could not release fired marks: {e}")
+                raise
+            fired += len(rows)
+            metrics.incr("automations.scheduler.fired", len(rows))
+
+    # Main loop
+
+    async def queue_maintenance(self, now: datetime) -> None:
+        """Queue the periodic stats refresh, once per interval across leader changes."""
+        interval = settings.STATS_OVERDUE_REFRESH_SECONDS
+        if interval <= 0 or (self.next_refresh is not None and now < self.next_refresh):
+            return
+        slot = int(now.timestamp()) // interval
+        await get_job_queue().submit(
+            "stats.refresh_overdue", {}, lane="batch", idempotency_key=f"{slot}",
+        )
+        self.next_refresh = datetime.utcfromtimestamp((slot + 1) * interval)
+
+    async def tick(self) -> float:
+        """One leader pass; returns how long to sleep before the next."""
+        now = datetime.utcnow()
+        await self.sync_rules(now)
+        await self.extend_window(now)
+        await self.rescan_window(now)
+        await self.fire_due(now)
+        await self.queue_maintenance(now)
+
+        delay = settings.AUTOMATION_SCHEDULER_LOCK_SECONDS / 3
+        next_at = self.timers.next_fire_at()
+        if next_at is not None:
+            delay = min(delay, max((next_at - datetime.utcnow()).total_seconds(), 0.0))
+        return delay
+
+    def resign(self) -> None:
+        if self.leading:
+            logger.info("Scheduler is no longer leader")
+        self.leading = False
+        self.timers.clear()
+        self.offsets, self.crons, self.loaded_until = {}, {}, None
+        self.next_rescan = self.next_refresh = None
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            delay = settings.AUTOMATION_SCHEDULER_LOCK_SECONDS / 3
+            try:
+                if await self.lock.hold():
+                    if not self.leading:
+                        logger.info("Scheduler is leader")
+                        self.leading = True
+                    delay = await self.tick()
+                elif self.leading:
+                    self.resign()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Automation scheduler error: {e}")
+                delay = 1.0
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+    async def listen(self) -> None:
+        """Apply task changes published by `SchedulerConsumer` on any node."""
+        while not self.stopping.is_set():
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(TASK_CHANGES_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        for change in json.loads(message["data"])["changes"]:
+                            self.task_changed(change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Scheduler subscription failed, resubscribing: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.close()
+
+    def start(self) -> None:
+        self.tasks = [asyncio.create_task(self.run()), asyncio.create_task(self.listen())]
+
+    async def stop(self) -> None:
+        self.stopping.set()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self.resign()
+        await self.lock.release()
+
+
+# Process-wide scheduler, started and stopped by the application lifespan
+_automation_scheduler: Optional[AutomationScheduler] = None
+
+
+async def init_automation_scheduler(run: bool = True) -> AutomationScheduler:
+    global _automation_scheduler
+    if _automation_scheduler is None:
+        _automation_scheduler = AutomationScheduler()
+        if run:
+            _automation_scheduler.start()
+    return _automation_scheduler
+
+
+async def close_automation_scheduler() -> None:
+    global _automation_scheduler
+    if _automation_scheduler is not None:
+        await _automation_scheduler.stop()
+        _automation_scheduler = None
+
+
+def get_automation_scheduler() -> AutomationScheduler:
+    if _automation_scheduler is None:
+        raise RuntimeError("AutomationScheduler is not initialized; it is created in the app lifespan")
+    return _automation_scheduler
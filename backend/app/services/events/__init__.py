@@ -0,0 +1 @@
+# Events Services Package
@@ -0,0 +1,147 @@
+"""
+Consumers of domain events, in the order the dispatcher runs them.
+
+Project and sprint rollups are not among them: they are written in the same
+statement batch as the task change itself (`app.services.stats.rollup`), which
+keeps them exact without waiting for the dispatcher.
+"""
+
+from datetime import datetime
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.models.event_history import EventHistory
+from app.services.automations.actions import run_action
+from app.services.automations.engine import init_automation_engine
+from app.services.automations.scheduler import publish_task_changes
+from app.services.events.dispatcher import Consumer, Effect, Event
+from app.services.events.notifications import (
+    TEAM_EVENTS_CHANNEL, USER_NOTIFICATIONS_CHANNEL, publish,
+)
+
+
+class AutomationConsumer(Consumer):
+    """Runs the actions of every enabled rule an event matches."""
+    name = "automations"
+
+    async def handle(self, db: AsyncSession, events: List[Event], effects: List[Effect]) -> None:
+        engine = await init_automation_engine(AsyncSessionLocal)
+        await engine.refresh(AsyncSessionLocal)
+        for event in events:
+            if event["team_id"] is None:
+                continue
+            if event["depth"] >= settings.AUTOMATION_MAX_CHAIN_DEPTH:
+                metrics.incr("automations.chain_limited")
+                continue
+            for rule in engine.match(event):
+                metrics.incr("automations.matched")
+                for action in rule.actions:
+                    await run_action(db, rule, action, event, effects)
+
+
+class NotificationConsumer(Consumer):
+    """Publishes events on their team's channel and tells people about new assignments."""
+    name = "notifications"
+
+    async def handle(self, db: AsyncSession, events: List[Event], effects: List[Effect]) -> None:
+        messages = []
+        for event in events:
+            if event["team_id"] is None or event["project_id"] is None:
+                continue
+            data, previous = event["data"], event["previous"]
+            messages.append((TEAM_EVENTS_CHANNEL.format(event["team_id"]), {
+                "type": event["type"],
+                "aggregate_type": event["aggregate_type"],
+                "id": event["aggregate_id"],
+                "project_id": event["project_id"],
+                "data": data,
+            }))
+            assignee_id = data.get("assignee_id") if event["type"] in ("task_created", "task_updated") else None
+            if assignee_id and (previous is None or previous.get("assignee_id") != assignee_id):
+                messages.append((USER_NOTIFICATIONS_CHANNEL.format(assignee_id), {
+                    "type": "task_assigned",
+                    "task_id": event["aggregate_id"],
+                    "title": data.get("title"),
+                    "project_id": event["project_id"],
+                }))
+        if messages:
+            effects.append(lambda: publish(messages))
+
+
+class SchedulerConsumer(Consumer):
+    """Tells the scheduler leader about task changes that move due-date triggers."""
+    name = "scheduler"
+
+    async def handle(self, db: AsyncSession, events: List[Event], effects: List[Effect]) -> None:
+        engine = await init_automation_engine(AsyncSessionLocal)
+        # A rule added on another worker must not have its task changes dropped
+        await engine.refresh(AsyncSessionLocal)
+        changes = []
+        for event in events:
+            if event["aggregate_type"] != "task" or event["type"] == "task_due":
+                continue
+            if not engine.has_rules(event["team_id"], "task_due"):
+                continue
+            data, previous = event["data"], event["previous"]
+            deleted = event["type"] == "task_deleted"
+            if not deleted and previous is not None and all(
+                data.get(name) == previous.get(name) for name in ("due_date", "status")
+            ):
+                continue
+            changes.append({
+                "id": event["aggregate_id"],
+                "team_id": event["team_id"],
+                "due_date": data.get("due_date"),
+                "status": data.get("status"),
+                "deleted": deleted,
+            })
+        if changes:
+            effects.append(lambda: publish_task_changes(changes))
+
+
+class HistoryConsumer(Consumer):
+    """Keeps delivered events for replaying automation rules against them."""
+    name = "history"
+
+    async def handle(self, db: AsyncSession, events: List[Event], effects: List[Effect]) -> None:
+        rows = [
+            {
+                "event_type": event["type"],
+                "aggregate_type": event["aggregate_type"],
+                "aggregate_id": UUID(event["aggregate_id"]),
+                "project_id": UUID(event["project_id"]) if event["project_id"] else None,
+                "team_id": UUID(event["team_id"]),
+                "payload": {"data": event["data"], "previous": event["previous"]},
+                "depth": event["depth"],
+                "occurred_at": event["created_at"],
+            }
+            for event in events
+            # Scheduled runs have nothing to replay against
+            if event["team_id"] is not None and event["aggregate_type"] != "automation"
+        ]
+        if rows:
+            await db.execute(insert(EventHistory.__table__), rows)
+
+
+class StatsConsumer(Consumer):
+    """Event counts per type and the delay between a commit and its delivery."""
+    name = "stats"
+
+    def __init__(self):
+        self.lag_seconds = 0.0
+        metrics.gauge("events.delivery_lag_seconds", lambda: self.lag_seconds)
+
+    async def handle(self, db: AsyncSession, events: List[Event], effects: List[Effect]) -> None:
+        for event in events:
+            metrics.incr(f"events.{event['type']}")
+        oldest = min(event["created_at"] for event in events)
+        self.lag_seconds = round((datetime.utcnow() - oldest).total_seconds(), 3)
+
+
+EVENT_CONSUMERS = (AutomationConsumer, NotificationConsumer, SchedulerConsumer, HistoryConsumer, StatsConsumer)
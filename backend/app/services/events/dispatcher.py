@@ -0,0 +1,347 @@
+"""
+Event dispatcher: drains the outbox in batches and hands events to consumers.
+
+Each dispatcher claims up to `OUTBOX_BATCH_SIZE` pending rows with
+`FOR UPDATE SKIP LOCKED`, so any number of workers can drain the table at once
+without waiting on each other. The batch goes through every consumer in one
+savepoint, in the dispatcher's transaction, and the delivered rows are deleted
+in that same transaction: database work done by consumers commits exactly
+once with the events that caused it, and a crash before the commit leaves the
+rows to be claimed again. Side effects outside the database (notifications,
+cache invalidation) are queued as `effects` and run only after the commit.
+
+When a batch fails, its events are retried one at a time to isolate the
+culprit; an event that keeps failing is retried with exponential backoff and
+left in the table with `failed_at` set after `OUTBOX_MAX_ATTEMPTS`.
+
+Dispatchers sleep on `LISTEN outbox_events` between batches and poll every
+`OUTBOX_POLL_SECONDS` in case a notification was missed. Events are delivered
+in outbox order within a batch; concurrent dispatchers may interleave batches.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.metrics import metrics
+from app.models.outbox import OutboxEvent
+from app.models.project import Project
+from app.services.events.outbox import memory_outbox, pending_events
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "outbox_events"
+
+Event = Dict[str, Any]
+Effect = Callable[[], Awaitable[None]]
+
+
+class Consumer:
+    """
+    Handles batches of committed domain events.
+
+    `handle` runs inside the dispatcher's transaction: database writes made
+    with `db` commit together with the removal of the events from the outbox.
+    Anything that must not happen unless that commit succeeds is appended to
+    `effects` as a coroutine function instead.
+    """
+    name = "consumer"
+
+    async def handle(self, db: AsyncSession, events: List[Event], effects: List[Effect]) -> None:
+        raise NotImplementedError
+
+
+def row_event(row: Dict[str, Any]) -> Event:
+    """Outbox row (ORM object or memory-backend dict) as the event dict consumers receive."""
+    get = row.get if isinstance(row, dict) else lambda name: getattr(row, name)
+    return {
+        "id": get("id"),
+        "type": get("event_type"),
+        "aggregate_type": get("aggregate_type"),
+        "aggregate_id": str(get("aggregate_id")),
+        "project_id": str(get("project_id")) if get("project_id") else None,
+        "team_id": str(get("team_id")) if get("team_id") else None,
+        "data": get("payload")["data"],
+        "previous": get("payload")["previous"],
+        "depth": get("depth"),
+        "created_at": get("created_at"),
+        "attempts": get("attempts"),
+    }
+
+
+async def attach_team_ids(db: AsyncSession, events: List[Event]) -> None:
+    """Resolve every event's team from its project, one query per batch."""
+    project_ids = {event["project_id"] for event in events if event["team_id"] is None and event["project_id"]}
+    if not project_ids:
+        return
+    rows = await db.execute(select(Project.id, Project.team_id).where(Project.id.in_(project_ids)))
+    teams = {str(project_id): str(team_id) for project_id, team_id in rows}
+    for event in events:
+        if event["team_id"] is None:
+            event["team_id"] = teams.get(event["project_id"])
+
+
+@asynccontextmanager
+async def savepoint(db: AsyncSession):
+    """A savepoint that also discards events recorded inside it (memory backend)."""
+    pending = len(pending_events(db))
+    try:
+        async with db.begin_nested():
+            yield
+    except BaseException:
+        del pending_events(db)[pending:]
+        raise
+
+
+async def run_effects(effects: List[Effect]) -> None:
+    for effect in effects:
+        try:
+            await effect()
+        except Exception as e:
+            logger.warning(f"Event side effect failed: {e}")
+            metrics.incr("events.effect_error")
+
+
+def retry_delay(attempts: int) -> float:
+    return settings.OUTBOX_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+
+
+class EventDispatcher:
+    """Shared batching, delivery and wait loop; subclasses say where events come from."""
+
+    def __init__(self, consumers: Sequence[Consumer], session_factory=AsyncSessionLocal):
+        self.consumers = list(consumers)
+        self.session_factory = session_factory
+        self.stopping = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    async def deliver(
+        self, db: AsyncSession, events: List[Event]
+    ) -> Tuple[List[Event], List[Tuple[Event, Exception]], List[Effect]]:
+        """Run the batch through every consumer; returns (delivered, failed, effects)."""
+        try:
+            effects: List[Effect] = []
+            async with savepoint(db):
+                for consumer in self.consumers:
+                    await consumer.handle(db, events, effects)
+            return events, [], effects
+        except Exception as e:
+            if len(events) == 1:
+                return [], [(events[0], e)], []
+            logger.warning(f"Event batch of {len(events)} failed ({e}); retrying one at a time")
+
+        delivered, failed, all_effects = [], [], []
+        for event in events:
+            done, errors, effects = await self.deliver(db, [event])
+            delivered.extend(done)
+            failed.extend(errors)
+            all_effects.extend(effects)
+        return delivered, failed, all_effects
+
+    async def drain_once(self) -> int:
+        """Deliver one batch; returns the number of events claimed."""
+        raise NotImplementedError
+
+    async def drain(self) -> int:
+        """Deliver batches until none is left (tests, scripts); returns the events handled."""
+        total = 0
+        while True:
+            claimed = await self.drain_once()
+            if not claimed:
+                return total
+            total += claimed
+
+    async def wait(self, timeout: float) -> None:
+        raise NotImplementedError
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                claimed = await self.drain_once()
+                if claimed < settings.OUTBOX_BATCH_SIZE:
+                    await self.wait(settings.OUTBOX_POLL_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event dispatcher error: {e}")
+                await asyncio.sleep(1.0)
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        self.stopping.set()
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    def report(self, delivered: List[Event], failed: List[Tuple[Event, Exception]]) -> None:
+        metrics.incr("events.delivered", len(delivered))
+        if failed:
+            metrics.incr("events.failed", len(failed))
+            for event, error in failed:
+                logger.error(f"Event {event['id']} ({event['type']}) failed: {error}")
+
+
+class OutboxDispatcher(EventDispatcher):
+    """Drains the outbox_events table."""
+
+    def __init__(self, consumers: Sequence[Consumer], session_factory=AsyncSessionLocal):
+        super().__init__(consumers, session_factory)
+        self.wakeup = asyncio.Event()
+        self.listener = None
+
+    async def drain_once(self) -> int:
+        async with self.session_factory() as db:
+            now = datetime.utcnow()
+            rows = (await db.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.failed_at.is_(None), OutboxEvent.available_at <= now)
+                .order_by(OutboxEvent.id)
+                .limit(settings.OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+            if not rows:
+                await db.rollback()
+                return 0
+
+            events = [row_event(row) for row in rows]
+            await attach_team_ids(db, events)
+            delivered, failed, effects = await self.deliver(db, events)
+
+            by_id = {row.id: row for row in rows}
+            for event, error in failed:
+                row = by_id[event["id"]]
+                row.attempts += 1
+                row.last_error = str(error)[:1000]
+                if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    row.failed_at = now
+                    metrics.incr("events.dead")
+                else:
+                    row.available_at = now + timedelta(seconds=retry_delay(row.attempts))
+            if delivered:
+                await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_([e["id"] for e in delivered])))
+            await db.commit()
+
+        self.report(delivered, failed)
+        await run_effects(effects)
+        return len(rows)
+
+    def notified(self, *args) -> None:
+        self.wakeup.set()
+
+    async def listen(self) -> None:
+        """Hold one pooled connection LISTENing for commits that wrote events."""
+        if self.listener is not None and not self.listener.invalidated:
+            raw = await self.listener.get_raw_connection()
+            if not raw.driver_connection.is_closed():
+                return
+            await self.close_listener()
+        try:
+            self.listener = await engine.connect()
+            raw = await self.listener.get_raw_connection()
+            await raw.driver_connection.add_listener(NOTIFY_CHANNEL, self.notified)
+        except Exception as e:
+            # Polling still delivers everything, just later
+            logger.warning(f"Outbox LISTEN failed, polling every {settings.OUTBOX_POLL_SECONDS}s: {e}")
+            await self.close_listener()
+
+    async def close_listener(self) -> None:
+        if self.listener is not None:
+            try:
+                await self.listener.close()
+            except Exception:
+                pass
+            self.listener = None
+
+    async def wait(self, timeout: float) -> None:
+        await self.listen()
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.wakeup.clear()
+
+    async def stop(self) -> None:
+        await super().stop()
+        await self.close_listener()
+
+
+class InMemoryDispatcher(EventDispatcher):
+    """Drains the in-process queue filled by OUTBOX_BACKEND=memory."""
+
+    async def drain_once(self) -> int:
+        events = [row_event(row) for row in memory_outbox.take(settings.OUTBOX_BATCH_SIZE)]
+        if not events:
+            return 0
+        async with self.session_factory() as db:
+            await attach_team_ids(db, events)
+            delivered, failed, effects = await self.deliver(db, events)
+            await db.commit()
+
+        self.report(delivered, failed)
+        retry = []
+        for event, error in failed:
+            attempts = event["attempts"] + 1
+            if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                metrics.incr("events.dead")
+                continue
+            retry.append({
+                "event_type": event["type"], "aggregate_type": event["aggregate_type"],
+                "aggregate_id": event["aggregate_id"], "project_id": event["project_id"],
+                "team_id": event["team_id"],
+                "payload": {"data": event["data"], "previous": event["previous"]},
+                "depth": event["depth"], "attempts": attempts, "created_at": event["created_at"],
+            })
+        if retry:
+            memory_outbox.publish(retry)
+        await run_effects(effects)
+        return len(events)
+
+    async def wait(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(memory_outbox.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+# Process-wide dispatcher, created and stopped by the application lifespan
+_event_dispatcher: Optional[EventDispatcher] = None
+
+
+def build_dispatcher(consumers: Sequence[Consumer]) -> EventDispatcher:
+    if settings.OUTBOX_BACKEND == "memory":
+        return InMemoryDispatcher(consumers)
+    return OutboxDispatcher(consumers)
+
+
+async def init_event_dispatcher(run: bool = True) -> EventDispatcher:
+    global _event_dispatcher
+    if _event_dispatcher is None:
+        from app.services.events.consumers import EVENT_CONSUMERS
+
+        _event_dispatcher = build_dispatcher([consumer() for consumer in EVENT_CONSUMERS])
+        if run:
+            _event_dispatcher.start()
+    return _event_dispatcher
+
+
+async def close_event_dispatcher() -> None:
+    global _event_dispatcher
+    if _event_dispatcher is not None:
+        await _event_dispatcher.stop()
+        _event_dispatcher = None
+
+
+def get_event_dispatcher() -> EventDispatcher:
+    if _event_dispatcher is None:
+        raise RuntimeError("EventDispatcher is not initialized; it is created in the app lifespan")
+    return _event_dispatcher
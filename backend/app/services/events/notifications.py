@@ -0,0 +1,38 @@
+"""
+Real-time notifications over Redis pub/sub.
+
+Every committed domain event is published on its team's channel, for live
+boards; messages meant for people (assignments, automation notifications) go
+on a team or user channel. Delivery is fire-and-forget: a client that is not
+subscribed when a message is published does not get it.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+
+from app.core.metrics import metrics
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+TEAM_EVENTS_CHANNEL = "events:team:{}"
+TEAM_NOTIFICATIONS_CHANNEL = "notifications:team:{}"
+USER_NOTIFICATIONS_CHANNEL = "notifications:user:{}"
+
+Message = Tuple[str, Dict[str, Any]]
+
+
+async def publish(messages: List[Message]) -> None:
+    """Publish (channel, message) pairs in one round-trip; failures are logged, not raised."""
+    if not messages:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for channel, message in messages:
+                pipe.publish(channel, json.dumps(message, default=str))
+            await pipe.execute()
+        metrics.incr("notifications.published", len(messages))
+    except Exception as e:
+        logger.warning(f"Notification publish failed for {len(messages)} messages: {e}")
+        metrics.incr("notifications.error")
@@ -0,0 +1,182 @@
+"""
+Transactional outbox: domain events recorded in the writer's own transaction.
+
+`record_event()` and `record_events()` add events to the session, so they
+reach the outbox_events table together with the change they describe: an
+event is delivered if and only if its transaction commits, and is never lost
+once it has. Nothing else runs on the write path. A statement trigger NOTIFYs
+the dispatchers (`app.services.events.dispatcher`) when the transaction commits.
+
+With `OUTBOX_BACKEND=memory` the events are kept on the session instead and
+handed to the in-process queue when it commits (dropped when it rolls back),
+for tests and single-process development.
+"""
+
+import asyncio
+import itertools
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.outbox import OutboxEvent
+
+TASK_PAYLOAD_FIELDS = (
+    'id', 'title', 'description', 'status', 'priority', 'estimated_hours', 'actual_hours',
+    'due_date', 'project_id', 'assignee_id', 'sprint_id', 'external_id',
+)
+SPRINT_PAYLOAD_FIELDS = ('id', 'name', 'goal', 'status', 'start_date', 'end_date', 'project_id')
+
+# Session.info key holding the events of the current transaction (memory backend)
+PENDING_KEY = "outbox_pending"
+
+# Rows per INSERT when recording events for a bulk write
+INSERT_CHUNK_SIZE = 1000
+
+
+def json_value(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def payload(source: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """JSON-ready copy of a model instance's or a row mapping's fields."""
+    if isinstance(source, Mapping):
+        return {name: json_value(source[name]) for name in fields}
+    return {name: json_value(getattr(source, name)) for name in fields}
+
+
+def task_payload(task: Any) -> Dict[str, Any]:
+    return payload(task, TASK_PAYLOAD_FIELDS)
+
+
+def sprint_payload(sprint: Any) -> Dict[str, Any]:
+    return payload(sprint, SPRINT_PAYLOAD_FIELDS)
+
+
+def outbox_row(
+    event_type: str,
+    aggregate_type: str,
+    data: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None,
+    depth: int = 0,
+    now: Optional[datetime] = None,
+    team_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    One outbox row; `data` needs an `id`, and a `project_id` unless the
+    event belongs to a team as a whole, in which case pass `team_id`.
+    """
+    now = now or datetime.utcnow()
+    return {
+        "event_type": event_type,
+        "aggregate_type": aggregate_type,
+        "aggregate_id": UUID(data["id"]),
+        "project_id": UUID(data["project_id"]) if data.get("project_id") else None,
+        "team_id": UUID(team_id) if team_id else None,
+        "payload": {"data": data, "previous": previous},
+        "depth": depth,
+        "attempts": 0,
+        "available_at": now,
+        "created_at": now,
+    }
+
+
+def record_event(
+    db: AsyncSession,
+    event_type: str,
+    aggregate_type: str,
+    data: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None,
+    depth: int = 0,
+) -> None:
+    """
+    Add one event to the current transaction.
+
+    `data` and `previous` are JSON-ready payloads (`task_payload()`,
+    `sprint_payload()`) of the aggregate after and before the change.
+    """
+    row = outbox_row(event_type, aggregate_type, data, previous, depth)
+    if settings.OUTBOX_BACKEND == "memory":
+        transaction_events(db).append(row)
+    else:
+        db.add(OutboxEvent(**row))
+
+
+async def record_events(db: AsyncSession, rows: Iterable[Dict[str, Any]]) -> None:
+    """Add many `outbox_row()`s to the current transaction, a chunk per INSERT."""
+    rows = list(rows)
+    if not rows:
+        return
+    if settings.OUTBOX_BACKEND == "memory":
+        transaction_events(db).extend(rows)
+        return
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        await db.execute(insert(OutboxEvent.__table__), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def pending_events(db: AsyncSession) -> List[Dict[str, Any]]:
+    """Events of the current transaction not yet handed over (memory backend)."""
+    return db.sync_session.info.setdefault(PENDING_KEY, [])
+
+
+def transaction_events(db: AsyncSession) -> List[Dict[str, Any]]:
+    """`pending_events()`, beginning the transaction they belong to if no statement has yet."""
+    if not db.sync_session.in_transaction():
+        # No I/O: the connection is still acquired by the first statement
+        db.sync_session.begin()
+    return pending_events(db)
+
+
+class InMemoryOutbox:
+    """Committed events waiting for the in-process dispatcher."""
+
+    def __init__(self):
+        self.events: deque = deque()
+        self.ids = itertools.count(1)
+        self.ready = asyncio.Event()
+
+    def publish(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.events.append({**row, "id": next(self.ids)})
+        self.ready.set()
+
+    def take(self, limit: int) -> List[Dict[str, Any]]:
+        taken = []
+        while self.events and len(taken) < limit:
+            taken.append(self.events.popleft())
+        if not self.events:
+            self.ready.clear()
+        return taken
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+memory_outbox = InMemoryOutbox()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    # Also fires when a savepoint is released, before anything is committed
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        memory_outbox.publish(pending)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending(session: Session, transaction) -> None:
+    # Once the outermost transaction ends, whatever was not published at its
+    # commit was rolled back; `savepoint()` drops what a savepoint rolled back
+    if transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
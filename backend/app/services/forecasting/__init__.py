@@ -0,0 +1 @@
+# Forecasting Services Package
@@ -0,0 +1,206 @@
+"""
+Delivery-date forecasts for a project's (or one sprint's) open tasks.
+
+The simulation (`monte_carlo`) needs three inputs, read here:
+
+- the open tasks' estimates, and hours already logged on them;
+- how far estimates were off: actual/estimated hours of the project's done
+  tasks, or of the whole team's when the project has fewer than
+  `FORECAST_MIN_SAMPLES`, or a log-normal spread when the team has too few too;
+- weekly capacity: hours of work the project finished in each of its last
+  `FORECAST_HISTORY_WEEKS` full weeks (a done task counts in the week it was
+  last updated), or, without `FORECAST_MIN_WEEKS` of history,
+  `FORECAST_DEFAULT_WEEKLY_HOURS` per person assigned to open work.
+
+Results are cached under the project's task-set version, the time its stats
+rollup last changed, which every task write to the project moves (and the
+sprint's, for a sprint forecast), so a forecast is recomputed only after the
+tasks change, or the next day.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import read_cache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.stats import ProjectStats, SprintStats
+from app.models.task import Task
+from app.services.forecasting.monte_carlo import SimulationInputs, percentiles, simulate
+
+PERCENTILES = (50, 85, 95)
+
+
+async def task_set_version(db: AsyncSession, project_id: UUID, sprint_id: Optional[UUID]) -> str:
+    """When the project's (and sprint's) rollup last changed: moves with every task write."""
+    version = await db.scalar(select(ProjectStats.updated_at).where(ProjectStats.project_id == project_id))
+    parts = [version.isoformat() if version else "empty"]
+    if sprint_id is not None:
+        sprint_version = await db.scalar(select(SprintStats.updated_at).where(SprintStats.sprint_id == sprint_id))
+        parts.append(sprint_version.isoformat() if sprint_version else "empty")
+    return "/".join(parts)
+
+
+async def estimate_ratios(db: AsyncSession, project: Project) -> tuple:
+    """Actual/estimated hours of recently finished tasks: (ratios, source)."""
+    query = (
+        select(Task.actual_hours, Task.estimated_hours)
+        .where(Task.status == "done", Task.estimated_hours > 0, Task.actual_hours > 0)
+        .order_by(Task.updated_at.desc(), Task.id)
+        .limit(settings.FORECAST_HISTORY_TASKS)
+    )
+    for source, scoped in (
+        ("project", query.where(Task.project_id == project.id)),
+        ("team", query.join(Project, Project.id == Task.project_id).where(Project.team_id == project.team_id)),
+    ):
+        rows = (await db.execute(scoped)).all()
+        if len(rows) >= settings.FORECAST_MIN_SAMPLES:
+            return np.array([actual / estimated for actual, estimated in rows], dtype=np.float64), source
+    return np.empty(0), "default"
+
+
+async def weekly_throughput(db: AsyncSession, project: Project, now: datetime, contributors: int) -> tuple:
+    """Hours finished in each of the last full weeks, zeros included: (hours, source)."""
+    this_week = datetime(now.year, now.month, now.day) - timedelta(days=now.weekday())
+    first_week = this_week - timedelta(weeks=settings.FORECAST_HISTORY_WEEKS)
+    if project.created_at is not None and project.created_at > first_week:
+        created = project.created_at
+        first_week = datetime(created.year, created.month, created.day) - timedelta(days=created.weekday())
+    weeks = max((this_week - first_week).days // 7, 0)
+
+    hours = np.zeros(weeks)
+    if weeks:
+        week = func.date_trunc("week", Task.updated_at)
+        rows = await db.execute(
+            select(week, func.sum(func.coalesce(Task.actual_hours, Task.estimated_hours, 0)))
+            .where(
+                Task.project_id == project.id, Task.status == "done",
+                Task.updated_at >= first_week, Task.updated_at < this_week,
+            )
+            .group_by(week)
+        )
+        for started, total in rows:
+            hours[(started - first_week).days // 7] = total or 0
+    if weeks >= settings.FORECAST_MIN_WEEKS and hours.sum() > 0:
+        return hours, "project"
+    return np.array([settings.FORECAST_DEFAULT_WEEKLY_HOURS * max(contributors, 1)]), "default"
+
+
+async def load_inputs(
+    db: AsyncSession, project: Project, sprint: Optional[Sprint], now: datetime
+) -> Dict[str, Any]:
+    query = select(Task.estimated_hours, Task.actual_hours, Task.assignee_id).where(
+        Task.project_id == project.id, Task.status != "done"
+    )
+    if sprint is not None:
+        query = query.where(Task.sprint_id == sprint.id)
+    # A stable order, so a seeded run draws the same samples for the same tasks
+    rows = (await db.execute(query.order_by(Task.id))).all()
+
+    estimates = np.array([row.estimated_hours or 0 for row in rows], dtype=np.float64)
+    missing = estimates <= 0
+    if missing.any():
+        known = estimates[~missing]
+        estimates[missing] = np.median(known) if known.size else settings.FORECAST_DEFAULT_TASK_HOURS
+    logged = np.array([row.actual_hours or 0 for row in rows], dtype=np.float64)
+    contributors = len({row.assignee_id for row in rows if row.assignee_id is not None})
+
+    ratios, ratio_source = await estimate_ratios(db, project)
+    weekly_hours, throughput_source = await weekly_throughput(db, project, now, contributors)
+    return {
+        "simulation": SimulationInputs(
+            estimates=estimates,
+            logged=logged,
+            ratios=ratios,
+            weekly_hours=weekly_hours,
+            default_sigma=settings.FORECAST_DEFAULT_ERROR_SIGMA,
+        ),
+        "summary": {
+            "tasks_remaining": len(rows),
+            "tasks_without_estimate": int(missing.sum()),
+            "remaining_estimated_hours": round(float(estimates.sum()), 1),
+            "inputs": {
+                "error_source": ratio_source,
+                "error_samples": int(ratios.size),
+                "median_error_ratio": round(float(np.median(ratios)), 3) if ratios.size else 1.0,
+                "throughput_source": throughput_source,
+                "throughput_weeks": int(weekly_hours.size) if throughput_source == "project" else 0,
+                "mean_weekly_hours": round(float(weekly_hours.mean()), 1),
+            },
+        },
+    }
+
+
+def probability_by(days: np.ndarray, start: datetime, deadline: Optional[datetime]) -> Optional[float]:
+    if deadline is None:
+        return None
+    return round(float(np.mean(days <= (deadline - start).total_seconds() / 86400)), 4)
+
+
+async def forecast(
+    db: AsyncSession,
+    project: Project,
+    sprint: Optional[Sprint] = None,
+    trials: int = 10000,
+    seed: Optional[int] = None,
+    target_date: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Forecast when the open tasks will be done: P50/P85/P95 dates and chances
+    of meeting the target date and the sprint's end; JSON-ready.
+
+    Unseeded runs pick a seed, which is returned, so any result can be
+    reproduced by passing it back.
+    """
+    now = datetime.utcnow()
+    start = now
+    if sprint is not None and sprint.start_date > start:
+        start = sprint.start_date
+    version = await task_set_version(db, project.id, sprint.id if sprint else None)
+    seed_key = "random" if seed is None else seed
+    name = (
+        f"forecast:{project.id}:{sprint.id if sprint else '-'}:{version}:{start.date().isoformat()}"
+        f":{trials}:{seed_key}:{target_date.isoformat() if target_date else '-'}"
+    )
+
+    async def load():
+        inputs = await load_inputs(db, project, sprint, now)
+        run_seed = seed if seed is not None else random.randrange(2 ** 32)
+        # CPU-bound array work: off the event loop (NumPy releases the GIL)
+        days = await asyncio.to_thread(simulate, inputs["simulation"], trials, run_seed, settings.FORECAST_MAX_WEEKS)
+        metrics.incr("forecast.trials", trials)
+
+        dates = {}
+        for level, value in zip(PERCENTILES, percentiles(days, PERCENTILES)):
+            dates[f"p{level}"] = None if np.isinf(value) else {
+                "days": round(float(value), 1),
+                "date": (start + timedelta(days=float(value))).isoformat(),
+            }
+        return {
+            "project_id": str(project.id),
+            "sprint_id": str(sprint.id) if sprint else None,
+            "task_set_version": version,
+            "trials": trials,
+            "seed": run_seed,
+            "start_date": start.isoformat(),
+            **inputs["summary"],
+            "percentiles": dates,
+            "beyond_horizon": round(float(np.mean(np.isinf(days))), 4),
+            "target_date": target_date.isoformat() if target_date else None,
+            "probability_by_target": probability_by(days, start, target_date),
+            "sprint_end_date": sprint.end_date.isoformat() if sprint else None,
+            "probability_by_sprint_end": probability_by(days, start, sprint.end_date if sprint else None),
+        }
+
+    return await read_cache.get_or_load(
+        name, [f"project:{project.id}"], load, ttl=settings.FORECAST_CACHE_TTL_SECONDS
+    )
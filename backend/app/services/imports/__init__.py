@@ -0,0 +1 @@
+# Imports Services Package
@@ -0,0 +1,82 @@
+"""
+Streaming of generated tenants (`app.core.mock_data`) into the database.
+
+Rows are COPYed straight into the real tables, `IMPORT_BATCH_ROWS` at a time
+and in one transaction, then the rollups of the new projects are rebuilt. Only
+one batch of tasks is held in memory, whatever the size of the tenant. The
+same seed always produces the same ids, so load each seed into a database once.
+"""
+
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.mock_data import MockDataGenerator, TenantSpec
+from app.services.imports.loader import copy_records
+from app.services.stats.rollup import rebuild_stats
+from app.services.tasks.bulk import chunks
+
+
+async def copy_rows(db: AsyncSession, table: str, rows: List[Dict[str, Any]]) -> None:
+    if rows:
+        columns = list(rows[0])
+        await copy_records(db, table, [tuple(row[name] for name in columns) for row in rows], columns)
+
+
+async def load_tenant(spec: TenantSpec, batch_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Generate the tenant described by `spec` and write it, yielding progress events.
+
+    Yields {"stage": "loading", "table": ..., "rows": ...} as tables fill up
+    and a final {"stage": "done", ...} with the row counts and the team ids.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_ROWS
+    started = time.perf_counter()
+    tenant = MockDataGenerator(spec)
+    counts = {}
+
+    async with AsyncSessionLocal() as db:
+        for table, rows in (
+            ("teams", tenant.teams), ("users", tenant.users),
+            ("projects", tenant.projects), ("sprints", tenant.sprints),
+        ):
+            for chunk in chunks(rows, batch_size):
+                await copy_rows(db, table, chunk)
+            counts[table] = len(rows)
+            yield {"stage": "loading", "table": table, "rows": len(rows)}
+
+        counts["tasks"] = counts["dependencies"] = 0
+        tasks: List[Dict[str, Any]] = []
+        dependencies: List[Dict[str, Any]] = []
+        for task, task_dependencies in tenant.tasks():
+            tasks.append(task)
+            dependencies.extend(task_dependencies)
+            if len(tasks) < batch_size:
+                continue
+            # Dependencies only point at tasks already generated, so copy tasks first
+            await copy_rows(db, "tasks", tasks)
+            await copy_rows(db, "task_dependencies", dependencies)
+            counts["tasks"] += len(tasks)
+            counts["dependencies"] += len(dependencies)
+            tasks, dependencies = [], []
+            yield {"stage": "loading", "table": "tasks", "rows": counts["tasks"]}
+        await copy_rows(db, "tasks", tasks)
+        await copy_rows(db, "task_dependencies", dependencies)
+        counts["tasks"] += len(tasks)
+        counts["dependencies"] += len(dependencies)
+        yield {"stage": "loading", "table": "tasks", "rows": counts["tasks"]}
+
+        yield {"stage": "stats"}
+        for project in tenant.projects:
+            await rebuild_stats(db, project_id=project["id"])
+        await db.commit()
+
+    yield {
+        "stage": "done",
+        **counts,
+        "team_ids": [str(team["id"]) for team in tenant.teams],
+        "seconds": round(time.perf_counter() - started, 2),
+    }
@@ -0,0 +1,288 @@
+"""
+Bulk import of parsed task rows into one team, in a single transaction.
+
+Rows are COPYed in `IMPORT_BATCH_ROWS` batches into a temporary staging table
+on the import's own connection, then merged with a handful of set-based
+statements:
+
+- assignees are matched by email (or, without one, by name within the team)
+  and missing ones are created without a usable password;
+- projects are matched by name within the team, sprints by name within their
+  project, and missing ones are created (sprints span `IMPORT_SPRINT_DAYS`
+  from their earliest task);
+- tasks are upserted on (project, external id), so importing the same export
+  again updates the tasks it created. Rows without an external id are keyed
+  on (project, title, due date) instead, against tasks that have no external
+  id either, so they are not duplicated by a re-import; two such tasks with
+  the same title and due date are one task to the importer. The last row wins
+  when a key repeats.
+
+Progress is reported as events between batches and steps; only one batch of
+rows is ever held in memory. Past due dates are kept as they are: exports
+are history, not new work.
+"""
+
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, IO, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import read_cache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.imports.readers import (
+    PLACEHOLDER_EMAIL_DOMAIN, STAGING_COLUMNS, iter_rows, read_batches,
+)
+from app.services.stats.rollup import rebuild_stats
+from app.services.tasks.bulk import chunks
+
+CREATE_STAGING = text("""
+    CREATE TEMP TABLE import_rows (
+        line integer, external_id text, title text, description text, status text, priority text,
+        assignee_email text, assignee_name text, sprint text, project text,
+        created_at timestamp, updated_at timestamp, due_date timestamp,
+        estimated_hours integer, actual_hours integer
+    ) ON COMMIT DROP
+""")
+
+MERGE_USERS = [
+    text("""
+        CREATE TEMP TABLE import_users ON COMMIT DROP AS
+        SELECT DISTINCT ON (assignee_email)
+            assignee_email AS email, assignee_name AS name, NULL::uuid AS user_id, false AS created
+        FROM import_rows WHERE assignee_email IS NOT NULL
+        ORDER BY assignee_email, line DESC
+    """),
+    text("UPDATE import_users i SET user_id = u.id FROM users u WHERE lower(u.email) = i.email"),
+    text("""
+        UPDATE import_users i SET user_id = u.id FROM users u
+        WHERE i.user_id IS NULL AND i.email LIKE :placeholder
+            AND u.team_id = :team_id AND lower(u.name) = lower(i.name)
+    """),
+    text("UPDATE import_users SET user_id = gen_random_uuid(), created = true WHERE user_id IS NULL"),
+    # '!' never matches a password hash: imported people sign in after a reset
+    text("""
+        INSERT INTO users (id, email, name, hashed_password, is_active, is_verified, role, team_id, created_at, updated_at)
+        SELECT user_id, email, left(name, 255), '!', true, false, 'contributor', :team_id, :now, :now
+        FROM import_users WHERE created
+    """),
+]
+
+MERGE_PROJECTS = [
+    text("""
+        CREATE TEMP TABLE import_projects ON COMMIT DROP AS
+        SELECT DISTINCT project AS name, NULL::uuid AS project_id, false AS created FROM import_rows
+    """),
+    text("""
+        UPDATE import_projects i SET project_id = p.id FROM projects p
+        WHERE p.team_id = :team_id AND p.name = i.name
+    """),
+    text("UPDATE import_projects SET project_id = gen_random_uuid(), created = true WHERE project_id IS NULL"),
+    text("""
+        INSERT INTO projects (id, name, status, owner_id, team_id, created_at, updated_at)
+        SELECT project_id, left(name, 255), 'active', :owner_id, :team_id, :now, :now
+        FROM import_projects WHERE created
+    """),
+]
+
+MERGE_SPRINTS = [
+    text("""
+        CREATE TEMP TABLE import_sprints ON COMMIT DROP AS
+        SELECT p.project_id, r.sprint AS name, min(COALESCE(r.created_at, :now)) AS start_date,
+            NULL::uuid AS sprint_id, false AS created
+        FROM import_rows r JOIN import_projects p ON p.name = r.project
+        WHERE r.sprint IS NOT NULL
+        GROUP BY p.project_id, r.sprint
+    """),
+    text("""
+        UPDATE import_sprints i SET sprint_id = s.id FROM sprints s
+        WHERE s.project_id = i.project_id AND s.name = i.name
+    """),
+    text("UPDATE import_sprints SET sprint_id = gen_random_uuid(), created = true WHERE sprint_id IS NULL"),
+    text("""
+        INSERT INTO sprints (id, name, status, start_date, end_date, project_id, created_at, updated_at)
+        SELECT sprint_id, left(name, 255),
+            CASE WHEN start_date + make_interval(days => :sprint_days) < :now THEN 'completed' ELSE 'active' END,
+            start_date, start_date + make_interval(days => :sprint_days), project_id, :now, :now
+        FROM import_sprints WHERE created
+    """),
+]
+
+# Rows without an external id that match an existing task on (project, title, due date)
+MATCH_KEYLESS_TASKS = text("""
+    CREATE TEMP TABLE import_matched ON COMMIT DROP AS
+    SELECT DISTINCT ON (t.id) t.id AS task_id, r.line
+    FROM import_rows r
+    JOIN import_projects p ON p.name = r.project
+    JOIN tasks t ON t.project_id = p.project_id AND t.external_id IS NULL
+        AND t.title = r.title AND t.due_date IS NOT DISTINCT FROM r.due_date
+    WHERE r.external_id IS NULL
+    ORDER BY t.id, r.line DESC
+""")
+
+UPDATE_KEYLESS_TASKS = text("""
+    WITH updated AS (
+        UPDATE tasks t SET
+            description = r.description,
+            status = r.status,
+            priority = r.priority,
+            estimated_hours = r.estimated_hours,
+            actual_hours = r.actual_hours,
+            assignee_id = u.user_id,
+            sprint_id = s.sprint_id,
+            updated_at = COALESCE(r.updated_at, r.created_at, :now)
+        FROM import_matched m
+        JOIN import_rows r ON r.line = m.line
+        JOIN import_projects p ON p.name = r.project
+        LEFT JOIN import_users u ON u.email = r.assignee_email
+        LEFT JOIN import_sprints s ON s.project_id = p.project_id AND s.name = r.sprint
+        WHERE t.id = m.task_id
+        RETURNING t.id
+    )
+    INSERT INTO import_updated SELECT id FROM updated
+""")
+
+# Matched rows are merged, earlier repeats of their key included; the rest go to MERGE_TASKS
+DROP_MATCHED_ROWS = text("""
+    DELETE FROM import_rows r USING import_matched m, import_rows k
+    WHERE k.line = m.line AND r.external_id IS NULL AND r.project = k.project
+        AND r.title = k.title AND r.due_date IS NOT DISTINCT FROM k.due_date
+""")
+
+MERGE_TASKS = text("""
+    WITH upserted AS (
+        INSERT INTO tasks (
+            id, external_id, title, description, status, priority, estimated_hours, actual_hours,
+            due_date, project_id, assignee_id, sprint_id, created_at, updated_at
+        )
+        -- Without an external id, a row is keyed on its title and due date
+        SELECT DISTINCT ON (
+            p.project_id, r.external_id,
+            CASE WHEN r.external_id IS NULL THEN r.title END,
+            CASE WHEN r.external_id IS NULL THEN r.due_date END
+        )
+            gen_random_uuid(), r.external_id, r.title, r.description, r.status, r.priority,
+            r.estimated_hours, r.actual_hours, r.due_date, p.project_id, u.user_id, s.sprint_id,
+            COALESCE(r.created_at, :now), COALESCE(r.updated_at, r.created_at, :now)
+        FROM import_rows r
+        JOIN import_projects p ON p.name = r.project
+        LEFT JOIN import_users u ON u.email = r.assignee_email
+        LEFT JOIN import_sprints s ON s.project_id = p.project_id AND s.name = r.sprint
+        ORDER BY
+            p.project_id, r.external_id,
+            CASE WHEN r.external_id IS NULL THEN r.title END,
+            CASE WHEN r.external_id IS NULL THEN r.due_date END,
+            r.line DESC
+        ON CONFLICT (project_id, external_id) DO UPDATE SET
+            title = EXCLUDED.title,
+            description = EXCLUDED.description,
+            status = EXCLUDED.status,
+            priority = EXCLUDED.priority,
+            estimated_hours = EXCLUDED.estimated_hours,
+            actual_hours = EXCLUDED.actual_hours,
+            due_date = EXCLUDED.due_date,
+            assignee_id = EXCLUDED.assignee_id,
+            sprint_id = EXCLUDED.sprint_id,
+            updated_at = EXCLUDED.updated_at
+        -- xmax is 0 only on freshly inserted row versions
+        RETURNING id, xmax = 0 AS inserted
+    ), updated AS (
+        INSERT INTO import_updated SELECT id FROM upserted WHERE NOT inserted
+    )
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted
+""")
+
+
+async def copy_records(db: AsyncSession, table: str, records: List[tuple], columns: Sequence[str]) -> None:
+    """COPY rows into `table` on the session's connection, inside its transaction."""
+    connection = await (await db.connection()).get_raw_connection()
+    await connection.driver_connection.copy_records_to_table(table, records=records, columns=list(columns))
+
+
+async def created_count(db: AsyncSession, table: str) -> int:
+    return await db.scalar(text(f"SELECT count(*) FROM {table} WHERE created"))
+
+
+async def run_import(
+    stream: IO[bytes],
+    fmt: str,
+    team_id: UUID,
+    owner_id: UUID,
+    default_project: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Import a CSV or JSONL export read from `stream`, yielding progress events.
+
+    Yields {"stage": "staging", ...} after every batch, {"stage": "merging",
+    "step": ...} before each merge step and a final {"stage": "done", ...}
+    summary. Nothing is written unless the whole import succeeds.
+    """
+    started = time.perf_counter()
+    staged = rejected = 0
+    errors: List[Dict[str, Any]] = []
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(CREATE_STAGING)
+        await db.execute(text("CREATE TEMP TABLE import_updated (id uuid) ON COMMIT DROP"))
+
+        rows = iter_rows(stream, fmt, default_project)
+        async for batch in read_batches(rows, settings.IMPORT_BATCH_ROWS):
+            valid = []
+            for line, row in batch:
+                if isinstance(row, str):
+                    rejected += 1
+                    if len(errors) < settings.IMPORT_MAX_ERRORS:
+                        errors.append({"line": line, "detail": row})
+                else:
+                    valid.append(row)
+            if valid:
+                await copy_records(db, "import_rows", valid, STAGING_COLUMNS)
+                staged += len(valid)
+            yield {"stage": "staging", "rows": staged, "rejected": rejected}
+
+        # Temporary tables are never auto-analyzed; the merge joins need row estimates
+        await db.execute(text("ANALYZE import_rows"))
+        params = {
+            "team_id": team_id,
+            "owner_id": owner_id,
+            "now": datetime.utcnow(),
+            "placeholder": f"%@{PLACEHOLDER_EMAIL_DOMAIN}",
+            "sprint_days": settings.IMPORT_SPRINT_DAYS,
+        }
+        for step, statements in (("users", MERGE_USERS), ("projects", MERGE_PROJECTS), ("sprints", MERGE_SPRINTS)):
+            yield {"stage": "merging", "step": step}
+            for statement in statements:
+                await db.execute(statement, params)
+
+        yield {"stage": "merging", "step": "tasks"}
+        await db.execute(MATCH_KEYLESS_TASKS)
+        keyless_updated = (await db.execute(UPDATE_KEYLESS_TASKS, {"now": params["now"]})).rowcount
+        await db.execute(DROP_MATCHED_ROWS)
+        tasks_created, tasks_updated = (await db.execute(MERGE_TASKS, {"now": params["now"]})).one()
+        tasks_updated += keyless_updated
+
+        summary = {
+            "stage": "done",
+            "rows": staged,
+            "rejected": rejected,
+            "users_created": await created_count(db, "import_users"),
+            "projects_created": await created_count(db, "import_projects"),
+            "sprints_created": await created_count(db, "import_sprints"),
+            "tasks_created": tasks_created,
+            "tasks_updated": tasks_updated,
+        }
+
+        yield {"stage": "merging", "step": "stats"}
+        project_ids = list((await db.execute(text("SELECT project_id FROM import_projects"))).scalars())
+        for project_id in project_ids:
+            await rebuild_stats(db, project_id=project_id)
+        updated_ids = list((await db.execute(text("SELECT id FROM import_updated"))).scalars())
+        await db.commit()
+
+    await read_cache.invalidate(f"team:{team_id}", *(f"project:{project_id}" for project_id in project_ids))
+    for chunk in chunks(updated_ids, settings.IMPORT_BATCH_ROWS):
+        await read_cache.invalidate(*(f"task:{task_id}" for task_id in chunk))
+    yield {**summary, "errors": errors, "seconds": round(time.perf_counter() - started, 2)}
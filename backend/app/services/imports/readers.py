@@ -0,0 +1,221 @@
+"""
+Incremental parsing of task exports (Jira CSV, or JSON Lines).
+
+Rows are read one at a time and turned into `STAGING_COLUMNS` tuples ready for
+COPY; nothing is kept between rows, so a file of any size is parsed in constant
+memory. Columns are matched on their lowercased header: Jira's export names
+("Issue key", "Summary", "Original Estimate", ...) and the canonical field
+names below are both accepted, and unknown columns are ignored.
+"""
+
+import asyncio
+import codecs
+import csv
+import hashlib
+import io
+import json
+from datetime import datetime, timezone
+from itertools import islice
+from typing import IO, Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Column order of the staging table rows are copied into
+STAGING_COLUMNS = (
+    "line", "external_id", "title", "description", "status", "priority",
+    "assignee_email", "assignee_name", "sprint", "project",
+    "created_at", "updated_at", "due_date", "estimated_hours", "actual_hours",
+)
+
+# Lowercased source header -> canonical field
+FIELD_ALIASES = {
+    "issue key": "external_id",
+    "key": "external_id",
+    "summary": "title",
+    "assignee": "assignee_name",
+    "assignee email": "assignee_email",
+    "project name": "project",
+    "created": "created_at",
+    "updated": "updated_at",
+    "due date": "due_date",
+    "due": "due_date",
+    "status category": "status_category",
+    # Jira exports time tracking in seconds
+    "original estimate": "estimated_seconds",
+    "time spent": "actual_seconds",
+}
+FIELDS = set(STAGING_COLUMNS[1:]) | set(FIELD_ALIASES.values())
+
+STATUS_ALIASES = {
+    "todo": "todo", "to_do": "todo", "open": "todo", "new": "todo", "backlog": "todo",
+    "selected_for_development": "todo", "reopened": "todo",
+    "in_progress": "in_progress", "in_development": "in_progress", "doing": "in_progress",
+    "review": "review", "in_review": "review", "code_review": "review", "qa": "review", "testing": "review",
+    "done": "done", "closed": "done", "resolved": "done", "complete": "done", "completed": "done",
+}
+
+PRIORITY_ALIASES = {
+    "highest": "urgent", "blocker": "urgent", "critical": "urgent", "urgent": "urgent",
+    "high": "high", "major": "high",
+    "medium": "medium", "normal": "medium",
+    "low": "low", "lowest": "low", "minor": "low", "trivial": "low",
+}
+
+# Jira's default CSV date format first
+DATE_FORMATS = ("%d/%b/%y %I:%M %p", "%d/%b/%Y %I:%M %p", "%Y-%m-%d %H:%M", "%d/%m/%Y", "%m/%d/%Y")
+
+# Users without an email get a stable placeholder, so re-imports find them again
+PLACEHOLDER_EMAIL_DOMAIN = "import.invalid"
+
+MAX_TITLE_LENGTH = 255
+MAX_EXTERNAL_ID_LENGTH = 100
+
+# (line number, staging row) or (line number, error message)
+ParsedRow = Tuple[int, Union[tuple, str]]
+
+
+def parse_datetime(value: str) -> datetime:
+    """Naive UTC, like every timestamp column."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        for date_format in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, date_format)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"Unrecognized date '{value}'")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_hours(value: Any, seconds: bool = False) -> int:
+    hours = float(value) / 3600 if seconds else float(value)
+    if hours < 0:
+        raise ValueError(f"Negative time '{value}'")
+    return round(hours)
+
+
+def normalize(value: Any) -> str:
+    return str(value).strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def placeholder_email(name: str) -> str:
+    digest = hashlib.sha1(name.strip().lower().encode()).hexdigest()[:16]
+    return f"{digest}@{PLACEHOLDER_EMAIL_DOMAIN}"
+
+
+def to_staging_row(line: int, fields: Dict[str, Any], default_project: Optional[str]) -> tuple:
+    """Map one source row onto the staging columns; raises ValueError when it cannot be imported."""
+    title = str(fields.get("title") or "").strip()
+    if not title:
+        raise ValueError("Missing title")
+    project = str(fields.get("project") or default_project or "").strip()
+    if not project:
+        raise ValueError("Missing project")
+    external_id = str(fields["external_id"]).strip() if fields.get("external_id") else None
+    if external_id and len(external_id) > MAX_EXTERNAL_ID_LENGTH:
+        raise ValueError(f"Key longer than {MAX_EXTERNAL_ID_LENGTH} characters")
+
+    status = STATUS_ALIASES.get(normalize(fields.get("status", "")))
+    if status is None:
+        status = STATUS_ALIASES.get(normalize(fields.get("status_category", "")), "todo")
+    priority = PRIORITY_ALIASES.get(normalize(fields.get("priority", "")), "medium")
+
+    assignee_name = str(fields.get("assignee_name") or "").strip() or None
+    assignee_email = str(fields.get("assignee_email") or "").strip().lower() or None
+    if assignee_email is None and assignee_name:
+        assignee_email = placeholder_email(assignee_name)
+    if assignee_email and not assignee_name:
+        assignee_name = assignee_email.split("@")[0]
+
+    estimated_hours = actual_hours = None
+    if fields.get("estimated_hours") not in (None, ""):
+        estimated_hours = parse_hours(fields["estimated_hours"])
+    elif fields.get("estimated_seconds") not in (None, ""):
+        estimated_hours = parse_hours(fields["estimated_seconds"], seconds=True)
+    if fields.get("actual_hours") not in (None, ""):
+        actual_hours = parse_hours(fields["actual_hours"])
+    elif fields.get("actual_seconds") not in (None, ""):
+        actual_hours = parse_hours(fields["actual_seconds"], seconds=True)
+
+    created_at, updated_at, due_date = (
+        parse_datetime(str(fields[name]).strip()) if fields.get(name) else None
+        for name in ("created_at", "updated_at", "due_date")
+    )
+
+    return (
+        line, external_id, title[:MAX_TITLE_LENGTH], fields.get("description") or None, status, priority,
+        assignee_email, assignee_name, str(fields.get("sprint") or "").strip() or None, project,
+        created_at, updated_at, due_date, estimated_hours, actual_hours,
+    )
+
+
+def field_name(header: str) -> Optional[str]:
+    header = header.strip().lower()
+    name = FIELD_ALIASES.get(header, header)
+    return name if name in FIELDS else None
+
+
+def iter_csv(stream: IO[bytes]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    reader = csv.reader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [(index, field_name(name)) for index, name in enumerate(header)]
+    columns = [(index, name) for index, name in columns if name]
+    for record in reader:
+        if not any(record):
+            continue
+        # Jira repeats some headers (e.g. one "Sprint" column per sprint); the last value wins
+        fields = {}
+        for index, name in columns:
+            if index < len(record) and record[index].strip():
+                fields[name] = record[index]
+        yield reader.line_num, fields
+
+
+def iter_jsonl(stream: IO[bytes]) -> Iterator[Tuple[int, Union[Dict[str, Any], str]]]:
+    decoder = codecs.getreader("utf-8-sig")(stream)
+    for line, text in enumerate(decoder, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as e:
+            yield line, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line, "Expected a JSON object"
+            continue
+        fields = {}
+        for key, value in record.items():
+            name = field_name(key)
+            if name and value is not None:
+                fields[name] = value
+        yield line, fields
+
+
+def iter_rows(stream: IO[bytes], fmt: str, default_project: Optional[str] = None) -> Iterator[ParsedRow]:
+    """Parse `stream` one row at a time; bad rows come back as error messages."""
+    records = iter_csv(stream) if fmt == "csv" else iter_jsonl(stream)
+    for line, fields in records:
+        if isinstance(fields, str):
+            yield line, fields
+            continue
+        try:
+            yield line, to_staging_row(line, fields, default_project)
+        except (TypeError, ValueError) as e:
+            yield line, str(e)
+
+
+async def read_batches(rows: Iterator[ParsedRow], size: int) -> AsyncIterator[List[ParsedRow]]:
+    """Pull `size` parsed rows at a time off a blocking iterator without blocking the event loop."""
+    while True:
+        batch = await asyncio.to_thread(lambda: list(islice(rows, size)))
+        if not batch:
+            return
+        yield batch
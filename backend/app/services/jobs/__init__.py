@@ -0,0 +1 @@
+# Jobs Services Package
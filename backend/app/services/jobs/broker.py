@@ -0,0 +1,256 @@
+"""
+Job brokers: where job state lives and how job ids reach the workers.
+
+Both brokers expose the same coroutine methods, used by `JobQueue`:
+`setup`, `save`, `load`, `delete`, `claim_key`, `push`, `schedule`, `pop`,
+`extend`, `ack`, `publish` and `wait`. `pop(lanes, timeout)` returns
+`(job_id, receipt)` from the first non-empty lane in the order given, or None
+on timeout; the receipt is passed to `extend` while the job runs and back to
+`ack` once it has been handled.
+"""
+
+import asyncio
+import json
+import logging
+import socket
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.jobs.job import JOB_LANES, Job
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY_PREFIX = "jobs:job:"
+IDEMPOTENCY_KEY_PREFIX = "jobs:key:"
+LANE_STREAM_PREFIX = "jobs:lane:"
+DELAYED_KEY = "jobs:delayed"
+DONE_CHANNEL_PREFIX = "jobs:done:"
+CONSUMER_GROUP = "job-workers"
+
+# Seconds between scans for jobs left unacknowledged by a dead worker
+RECLAIM_INTERVAL_SECONDS = 30
+
+
+class InMemoryBroker:
+    """Single-process broker for tests and deployments without Redis."""
+
+    def __init__(self):
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.keys: Dict[str, str] = {}
+        self.lanes = {lane: deque() for lane in JOB_LANES}
+        self.ready = asyncio.Condition()
+        self.done: Dict[str, asyncio.Event] = {}
+
+    async def setup(self) -> None:
+        pass
+
+    async def save(self, job: Job) -> None:
+        # Stored serialized, like the Redis broker, so callers never share a live object
+        self.jobs[job.id] = job.to_dict()
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        data = self.jobs.get(job_id)
+        return Job.from_dict(data) if data is not None else None
+
+    async def delete(self, job_id: str) -> None:
+        self.jobs.pop(job_id, None)
+
+    async def claim_key(self, key: str, job_id: str) -> Optional[str]:
+        existing = self.keys.get(key)
+        if existing is None:
+            self.keys[key] = job_id
+        return existing
+
+    async def push(self, job: Job) -> None:
+        async with self.ready:
+            self.lanes[job.lane].append(job.id)
+            # Wake every worker: some only take interactive jobs
+            self.ready.notify_all()
+
+    async def schedule(self, job: Job, delay: float) -> None:
+        asyncio.get_running_loop().call_later(delay, lambda: asyncio.ensure_future(self.push(job)))
+
+    async def pop(self, lanes: Sequence[str], timeout: float) -> Optional[Tuple[str, Any]]:
+        async with self.ready:
+            try:
+                await asyncio.wait_for(
+                    self.ready.wait_for(lambda: any(self.lanes[lane] for lane in lanes)),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                return None
+            for lane in lanes:
+                if self.lanes[lane]:
+                    return self.lanes[lane].popleft(), None
+        return None
+
+    async def extend(self, receipt: Any) -> None:
+        pass
+
+    async def ack(self, receipt: Any) -> None:
+        pass
+
+    async def publish(self, job: Job) -> None:
+        event = self.done.pop(job.id, None)
+        if event is not None:
+            event.set()
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        job = await self.load(job_id)
+        if job is None or job.finished or timeout <= 0:
+            return job
+        event = self.done.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return await self.load(job_id)
+
+
+class RedisStreamBroker:
+    """Redis broker: one stream per lane read through a consumer group.
+
+    Job state is a JSON string per job with a TTL. A job id stays pending in
+    its stream until acknowledged, so jobs claimed by a worker that died are
+    reclaimed after `JOB_VISIBILITY_TIMEOUT_SECONDS`; `extend` resets that idle
+    time for jobs still running, so long jobs are not reclaimed. Retries wait in a sorted
+    set scored by due time and are moved back onto their lane when due.
+
+    Consumer groups are created by `setup()`, and again by the first `pop()`
+    after it failed or Redis lost them, so workers start before Redis does.
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.consumer = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.last_reclaim = 0.0
+        self.groups_created = False
+
+    async def setup(self) -> None:
+        for lane in JOB_LANES:
+            try:
+                await self.redis.xgroup_create(LANE_STREAM_PREFIX + lane, CONSUMER_GROUP, id="0", mkstream=True)
+            except Exception as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self.groups_created = True
+
+    async def save(self, job: Job) -> None:
+        await self.redis.set(JOB_KEY_PREFIX + job.id, json.dumps(job.to_dict()), ex=settings.JOB_RESULT_TTL_SECONDS)
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        data = await self.redis.get(JOB_KEY_PREFIX + job_id)
+        return Job.from_dict(json.loads(data)) if data is not None else None
+
+    async def delete(self, job_id: str) -> None:
+        await self.redis.delete(JOB_KEY_PREFIX + job_id)
+
+    async def claim_key(self, key: str, job_id: str) -> Optional[str]:
+        redis_key = IDEMPOTENCY_KEY_PREFIX + key
+        if await self.redis.set(redis_key, job_id, nx=True, ex=settings.JOB_RESULT_TTL_SECONDS):
+            return None
+        return await self.redis.get(redis_key)
+
+    async def push(self, job: Job) -> None:
+        await self.redis.xadd(LANE_STREAM_PREFIX + job.lane, {"job_id": job.id})
+
+    async def schedule(self, job: Job, delay: float) -> None:
+        await self.redis.zadd(DELAYED_KEY, {job.id: time.time() + delay})
+
+    async def promote_due(self) -> None:
+        """Move retries whose backoff has elapsed back onto their lanes."""
+        due = await self.redis.zrangebyscore(DELAYED_KEY, 0, time.time(), start=0, num=100)
+        for job_id in due:
+            # Only the worker whose ZREM succeeds re-queues the job
+            if await self.redis.zrem(DELAYED_KEY, job_id):
+                job = await self.load(job_id)
+                if job is not None:
+                    await self.push(job)
+
+    async def reclaim_stale(self, lanes: Sequence[str]) -> Optional[Tuple[str, Any]]:
+        """Claim one job left unacknowledged by another worker for too long."""
+        self.last_reclaim = time.monotonic()
+        idle_ms = settings.JOB_VISIBILITY_TIMEOUT_SECONDS * 1000
+        for lane in lanes:
+            stream = LANE_STREAM_PREFIX + lane
+            _, claimed, *_ = await self.redis.xautoclaim(
+                stream, CONSUMER_GROUP, self.consumer, min_idle_time=idle_ms, count=1
+            )
+            if claimed:
+                entry_id, fields = claimed[0]
+                metrics.incr("jobs.reclaimed")
+                return fields["job_id"], (stream, entry_id)
+        return None
+
+    async def pop(self, lanes: Sequence[str], timeout: float) -> Optional[Tuple[str, Any]]:
+        if not self.groups_created:
+            await self.setup()
+        await self.promote_due()
+        if time.monotonic() - self.last_reclaim > RECLAIM_INTERVAL_SECONDS:
+            claimed = await self.reclaim_stale(lanes)
+            if claimed is not None:
+                return claimed
+
+        # Lanes are tried in priority order before blocking on all of them
+        for lane in lanes:
+            claimed = await self._read({LANE_STREAM_PREFIX + lane: ">"}, block=None)
+            if claimed is not None:
+                return claimed
+        return await self._read(
+            {LANE_STREAM_PREFIX + lane: ">" for lane in lanes},
+            block=int(timeout * 1000),
+        )
+
+    async def _read(self, streams: Dict[str, str], block: Optional[int]) -> Optional[Tuple[str, Any]]:
+        try:
+            response = await self.redis.xreadgroup(
+                CONSUMER_GROUP, self.consumer, streams, count=1, block=block
+            )
+        except Exception as e:
+            if "NOGROUP" in str(e):
+                # Redis restarted without its data; recreate the groups on the next pop
+                self.groups_created = False
+            raise
+        for stream, entries in response or []:
+            for entry_id, fields in entries:
+                return fields["job_id"], (stream, entry_id)
+        return None
+
+    async def extend(self, receipt: Any) -> None:
+        # Claiming our own entry again resets its idle time without redelivering it
+        stream, entry_id = receipt
+        await self.redis.xclaim(
+            stream, CONSUMER_GROUP, self.consumer, min_idle_time=0, message_ids=[entry_id], justid=True
+        )
+
+    async def ack(self, receipt: Any) -> None:
+        stream, entry_id = receipt
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xack(stream, CONSUMER_GROUP, entry_id)
+            pipe.xdel(stream, entry_id)
+            await pipe.execute()
+
+    async def publish(self, job: Job) -> None:
+        await self.redis.publish(DONE_CHANNEL_PREFIX + job.id, job.status)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        pubsub = self.redis.pubsub()
+        try:
+            # Subscribe before reading state so a completion in between is not missed
+            await pubsub.subscribe(DONE_CHANNEL_PREFIX + job_id)
+            job = await self.load(job_id)
+            deadline = time.monotonic() + timeout
+            while job is not None and not job.finished and time.monotonic() < deadline:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=deadline - time.monotonic(),
+                )
+                if message is not None:
+                    job = await self.load(job_id)
+            return job
+        finally:
+            await pubsub.aclose()
@@ -0,0 +1,76 @@
+"""
+Job handlers: one coroutine per job kind, taking the job payload.
+
+`LLMService` reports provider failures as `status: error` rather than raising,
+so handlers turn those into `JobError` to have the queue retry them.
+"""
+
+from typing import Any, Dict
+
+from app.services.ai.llm_service import get_llm_service
+from app.services.automations import replay
+from app.services.jobs.job import JobError
+from app.services.stats import rollup
+
+
+def _checked(result: Dict[str, Any]) -> Dict[str, Any]:
+    if result.get("status") != "success":
+        raise JobError(f"{result.get('model')} returned no result")
+    return result
+
+
+async def generate_project_plan(payload: Dict[str, Any]) -> Dict[str, Any]:
+    llm = get_llm_service()
+    return _checked(await llm.generate_project_plan(
+        payload.get("description", ""),
+        constraints=payload.get("constraints"),
+        use_cache=payload.get("use_cache", True),
+    ))
+
+
+async def analyze_project_health(payload: Dict[str, Any]) -> Dict[str, Any]:
+    llm = get_llm_service()
+    return _checked(await llm.analyze_project_health(
+        payload["project_data"],
+        use_cache=payload.get("use_cache", True),
+    ))
+
+
+async def generate_standup_summary(payload: Dict[str, Any]) -> Dict[str, Any]:
+    llm = get_llm_service()
+    return _checked(await llm.generate_standup_summary(
+        payload.get("updates", []),
+        use_cache=payload.get("use_cache", True),
+    ))
+
+
+async def summarize_standups(payload: Dict[str, Any]) -> Dict[str, Any]:
+    llm = get_llm_service()
+    results = [
+        result async for result in llm.summarize_standups(
+            payload.get("teams", []),
+            use_cache=payload.get("use_cache", True),
+        )
+    ]
+    failed = sum(1 for result in results if result["status"] != "success")
+    if results and failed == len(results):
+        raise JobError("no team summaries were generated")
+    return {"results": results, "failed": failed, "status": "success"}
+
+
+async def replay_automation(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return await replay.replay_automation(payload["automation_id"], payload["days"], payload.get("samples", 10))
+
+
+async def refresh_overdue_counts(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return await rollup.refresh_overdue()
+
+
+JOB_HANDLERS = {
+    "ai.plan": generate_project_plan,
+    "ai.analyze": analyze_project_health,
+    "ai.summarize": generate_standup_summary,
+    "ai.summarize_batch": summarize_standups,
+    "automations.replay": replay_automation,
+    "stats.refresh_overdue": refresh_overdue_counts,
+}
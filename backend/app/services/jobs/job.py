@@ -0,0 +1,67 @@
+"""
+Job records shared by the queue, its brokers and the job handlers.
+"""
+
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+JOB_LANES = ("interactive", "batch")
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+class JobError(Exception):
+    """Raised by a handler for a failure that should be retried."""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    lane: str = "interactive"
+    status: str = "queued"
+    attempts: int = 0
+    max_attempts: int = 3
+    idempotency_key: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # Set by handlers of long jobs through `report_progress()`
+    progress: Optional[Dict[str, Any]] = None
+    # Epoch seconds until which the worker running the job holds it, renewed while it runs
+    lease_until: Optional[float] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat()
+        data["updated_at"] = self.updated_at.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        data = dict(data)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+        return cls(**data)
+
+
+# The broker and job a handler is running for, set by JobQueue.execute()
+running_job: ContextVar[Optional[Tuple[Any, Job]]] = ContextVar("running_job", default=None)
+
+
+async def report_progress(progress: Dict[str, Any]) -> None:
+    """Record how far the running job has got, shown by GET /jobs/{id}; a no-op outside a job."""
+    running = running_job.get()
+    if running is None:
+        return
+    broker, job = running
+    job.progress = progress
+    job.updated_at = datetime.utcnow()
+    await broker.save(job)
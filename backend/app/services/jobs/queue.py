@@ -0,0 +1,250 @@
+"""
+Background job queue for long-running AI generation.
+
+`JobQueue.submit()` records a job and returns straight away; a pool of asyncio
+workers (`JobWorkerPool`) executes it against the registered handler. Jobs run
+in priority lanes: `interactive` is always drained before `batch`, and some
+workers are reserved for `interactive` so a large batch cannot starve it.
+Failures are retried with jittered exponential backoff, and an idempotency key
+maps repeated submissions onto the job that is already queued or finished.
+
+A running job holds a lease of `JOB_VISIBILITY_TIMEOUT_SECONDS`, renewed by a
+heartbeat together with its broker entry. A copy delivered again while the
+lease is valid (a reclaim racing a slow handler) is skipped, not run twice.
+
+The broker is either Redis streams (shared by every API process and worker) or
+an in-process broker for tests and single-process deployments.
+"""
+
+import asyncio
+import logging
+import random
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import redis_client
+from app.services.jobs.broker import InMemoryBroker, RedisStreamBroker
+from app.services.jobs.handlers import JOB_HANDLERS
+from app.services.jobs.job import JOB_LANES, Job, running_job
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the retry after the given attempt."""
+    delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+    return min(delay, settings.JOB_RETRY_BACKOFF_MAX_SECONDS) * random.uniform(0.5, 1.0)
+
+
+class JobQueue:
+    """Submits jobs to a broker and executes them with registered handlers."""
+
+    def __init__(self, broker, handlers: Dict[str, Handler]):
+        self.broker = broker
+        self.handlers = handlers
+
+    async def submit(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        lane: str = "interactive",
+        idempotency_key: Optional[str] = None,
+    ) -> Job:
+        """Queue a job; with an idempotency key, return the earlier job for that key instead."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if lane not in JOB_LANES:
+            raise ValueError(f"Unknown job lane: {lane}")
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            payload=payload,
+            lane=lane,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            idempotency_key=idempotency_key,
+        )
+        await self.broker.save(job)
+
+        if idempotency_key:
+            existing_id = await self.broker.claim_key(f"{kind}:{idempotency_key}", job.id)
+            if existing_id is not None:
+                existing = await self.broker.load(existing_id)
+                if existing is not None:
+                    await self.broker.delete(job.id)
+                    metrics.incr("jobs.deduplicated")
+                    return existing
+
+        await self.broker.push(job)
+        metrics.incr("jobs.submitted")
+        metrics.incr(f"jobs.submitted.{lane}")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await self.broker.load(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """Return the job once it finishes, or as it stands after `timeout` seconds."""
+        return await self.broker.wait(job_id, timeout)
+
+    async def heartbeat(self, job: Job, receipt: Any) -> None:
+        """Renew the job's lease and its broker entry until cancelled."""
+        lease = settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+        while True:
+            await asyncio.sleep(lease / 3)
+            try:
+                job.lease_until = time.time() + lease
+                await self.broker.save(job)
+                await self.broker.extend(receipt)
+            except Exception as e:
+                logger.warning(f"Job {job.id} heartbeat failed: {e}")
+
+    async def execute(self, job_id: str, receipt: Any = None) -> bool:
+        """Run the job; False when another worker holds it, so this delivery must not be acknowledged."""
+        job = await self.broker.load(job_id)
+        if job is None or job.finished:
+            return True
+        if job.status == "running" and job.lease_until is not None and job.lease_until > time.time():
+            metrics.incr("jobs.lease_held")
+            return False
+
+        job.status = "running"
+        job.attempts += 1
+        job.lease_until = time.time() + settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+        job.updated_at = datetime.utcnow()
+        await self.broker.save(job)
+
+        token = running_job.set((self.broker, job))
+        heartbeat = asyncio.create_task(self.heartbeat(job, receipt))
+        try:
+            job.result = await self.handlers[job.kind](job.payload)
+        except Exception as e:
+            job.error = str(e) or e.__class__.__name__
+            job.updated_at = datetime.utcnow()
+            if job.attempts < job.max_attempts:
+                job.status = "retrying"
+                await self.broker.save(job)
+                await self.broker.schedule(job, retry_delay(job.attempts))
+                metrics.incr("jobs.retried")
+                logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed: {e}")
+                return True
+            job.status = "failed"
+            metrics.incr("jobs.failed")
+            logger.error(f"Job {job.id} ({job.kind}) failed after {job.attempts} attempts: {e}")
+        else:
+            job.status = "succeeded"
+            job.error = None
+            job.updated_at = datetime.utcnow()
+            metrics.incr("jobs.succeeded")
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            running_job.reset(token)
+
+        await self.broker.save(job)
+        await self.broker.publish(job)
+        return True
+
+
+class JobWorkerPool:
+    """Asyncio workers pulling from the broker; the first `reserved` only take interactive jobs."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        concurrency: int,
+        reserved: int = 0,
+        lanes: Sequence[str] = JOB_LANES,
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.reserved = min(reserved, concurrency - 1) if "interactive" in lanes else 0
+        self.lanes = tuple(lane for lane in JOB_LANES if lane in lanes)
+        self.stopping = asyncio.Event()
+        self.tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        for index in range(self.concurrency):
+            lanes = ("interactive",) if index < self.reserved else self.lanes
+            self.tasks.append(asyncio.create_task(self.run(lanes)))
+
+    async def stop(self, grace: float = 10.0) -> None:
+        """Let running jobs finish for up to `grace` seconds, then cancel them.
+
+        A cancelled job is never acknowledged, so the Redis broker hands it to
+        another worker once its visibility timeout passes.
+        """
+        self.stopping.set()
+        if self.tasks:
+            _, running = await asyncio.wait(self.tasks, timeout=grace)
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
+
+    async def run(self, lanes: Sequence[str]) -> None:
+        broker = self.queue.broker
+        while not self.stopping.is_set():
+            try:
+                claimed = await broker.pop(lanes, timeout=1.0)
+                if claimed is None:
+                    continue
+                job_id, receipt = claimed
+                # Unacknowledged on error or cancellation, so the job is redelivered
+                if await self.queue.execute(job_id, receipt):
+                    await broker.ack(receipt)
+            except Exception as e:
+                logger.error(f"Job worker error: {e}")
+                await asyncio.sleep(1.0)
+
+
+# Process-wide queue and workers, created and closed by the application lifespan
+_job_queue: Optional[JobQueue] = None
+_job_workers: Optional[JobWorkerPool] = None
+
+
+def build_broker():
+    if settings.JOB_BROKER == "memory":
+        return InMemoryBroker()
+    return RedisStreamBroker(redis_client)
+
+
+async def init_job_queue(run_workers: bool = True, lanes: Sequence[str] = JOB_LANES) -> JobQueue:
+    global _job_queue, _job_workers
+    if _job_queue is None:
+        _job_queue = JobQueue(build_broker(), JOB_HANDLERS)
+        try:
+            await _job_queue.broker.setup()
+        except Exception as e:
+            # Workers retry it before their first pop
+            logger.warning(f"Job broker setup failed, retrying from the workers: {e}")
+    if run_workers and _job_workers is None:
+        _job_workers = JobWorkerPool(
+            _job_queue,
+            concurrency=settings.JOB_WORKER_CONCURRENCY,
+            reserved=settings.JOB_INTERACTIVE_RESERVED_WORKERS,
+            lanes=lanes,
+        )
+        _job_workers.start()
+    return _job_queue
+
+
+async def close_job_queue():
+    global _job_queue, _job_workers
+    if _job_workers is not None:
+        await _job_workers.stop()
+        _job_workers = None
+    _job_queue = None
+
+
+def get_job_queue() -> JobQueue:
+    """FastAPI dependency returning the shared JobQueue."""
+    if _job_queue is None:
+        raise RuntimeError("JobQueue is not initialized; it is created in the app lifespan")
+    return _job_queue
@@ -0,0 +1 @@
+# Stats Services Package
@@ -0,0 +1,277 @@
+"""
+Incremental maintenance of the project_stats/sprint_stats rollups.
+
+Task writes call `apply_task_change()` (or `apply_task_changes()` for a batch)
+inside their own transaction with snapshots of each task before and after the
+change. The difference is applied as a single `INSERT ... ON CONFLICT DO UPDATE`
+per affected project/sprint, so the counters never need a full recount on the
+read path. `rebuild_stats()` repairs any drift from the tasks table, and
+`refresh_overdue_counts()` advances the point in time that overdue counts are
+measured against; the scheduler leader queues it every
+`STATS_OVERDUE_REFRESH_SECONDS` as the `stats.refresh_overdue` job.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import DateTime, and_, case, delete, func, literal, literal_column, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import read_cache
+from app.core.database import AsyncSessionLocal
+
+from app.models.stats import (
+    PRIORITY_COUNT_COLUMNS, STATUS_COUNT_COLUMNS, ProjectStats, SprintStats,
+)
+from app.models.sprint import Sprint
+from app.models.task import Task
+
+# Task fields that feed the rollups
+SNAPSHOT_FIELDS = (
+    'project_id', 'sprint_id', 'status', 'priority',
+    'estimated_hours', 'actual_hours', 'due_date',
+)
+
+# (rollup model, its key column, the Task column it groups by)
+ROLLUPS = (
+    (ProjectStats, 'project_id', Task.project_id),
+    (SprintStats, 'sprint_id', Task.sprint_id),
+)
+
+# Project scopes invalidated per cache round-trip
+INVALIDATE_CHUNK = 1000
+
+TaskChange = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def snapshot_task(task: Task) -> Dict[str, Any]:
+    """Capture the rollup-relevant fields of a task before or after a write."""
+    return {field: getattr(task, field) for field in SNAPSHOT_FIELDS}
+
+
+def _contribution(snapshot: Dict[str, Any]) -> Counter:
+    counts = Counter({
+        'task_count': 1,
+        STATUS_COUNT_COLUMNS[snapshot['status']]: 1,
+        PRIORITY_COUNT_COLUMNS[snapshot['priority']]: 1,
+    })
+    counts['estimated_hours_total'] += snapshot['estimated_hours'] or 0
+    counts['actual_hours_total'] += snapshot['actual_hours'] or 0
+    return counts
+
+
+def _open_due_dates(snapshots: List[Dict[str, Any]]) -> List[datetime]:
+    """Due dates of the snapshots that count towards overdue_count once their date passes."""
+    return sorted(
+        snapshot['due_date'] for snapshot in snapshots
+        if snapshot['due_date'] is not None and snapshot['status'] != 'done'
+    )
+
+
+def _overdue_count_sql(snapshots: List[Dict[str, Any]], as_of_column):
+    """How many of the snapshots are overdue as of the row's stored overdue_as_of."""
+    due_dates = _open_due_dates(snapshots)
+    if not due_dates:
+        return literal(0)
+    if len(due_dates) == 1:
+        return case((literal(due_dates[0]) < as_of_column, 1), else_=0)
+    dates = func.unnest(literal(due_dates, ARRAY(DateTime))).table_valued('due_date').render_derived()
+    # Refer to the conflicting row by name: ON CONFLICT DO UPDATE does not correlate
+    # subqueries, so the Column itself would drag a second copy of the table into FROM
+    as_of = literal_column(f'{as_of_column.table.name}.{as_of_column.name}', DateTime)
+    return (
+        select(func.count())
+        .select_from(dates)
+        .where(dates.c.due_date < as_of)
+        .scalar_subquery()
+    )
+
+
+async def _apply_delta(
+    db: AsyncSession,
+    model,
+    key_column: str,
+    key,
+    delta: Counter,
+    befores: List[Dict[str, Any]],
+    afters: List[Dict[str, Any]],
+) -> None:
+    table = model.__table__
+    now = datetime.utcnow()
+    columns = [column for column, value in delta.items() if value]
+
+    overdue_count = (
+        sum(due_date < now for due_date in _open_due_dates(afters))
+        - sum(due_date < now for due_date in _open_due_dates(befores))
+    )
+    stmt = pg_insert(table).values(
+        **{key_column: key},
+        **{column: delta[column] for column in columns},
+        overdue_count=overdue_count,
+        overdue_as_of=now,
+        updated_at=now,
+    )
+    overdue_delta = (
+        _overdue_count_sql(afters, table.c.overdue_as_of)
+        - _overdue_count_sql(befores, table.c.overdue_as_of)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[key_column],
+        set_={
+            **{column: table.c[column] + delta[column] for column in columns},
+            'overdue_count': table.c.overdue_count + overdue_delta,
+            'updated_at': now,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def apply_task_changes(db: AsyncSession, changes: Sequence[TaskChange]) -> None:
+    """Apply the combined rollup delta of many task writes.
+
+    Each change is a (before, after) snapshot pair, `None` marking the create or
+    delete side. One statement is issued per affected project or sprint. Must
+    run in the same transaction as the task writes themselves.
+    """
+    for model, key_column, _ in ROLLUPS:
+        sides = {}
+        for before, after in changes:
+            for snapshot, sign in ((before, -1), (after, 1)):
+                if snapshot is None or snapshot[key_column] is None:
+                    continue
+                delta, befores, afters = sides.setdefault(snapshot[key_column], (Counter(), [], []))
+                for column, value in _contribution(snapshot).items():
+                    delta[column] += sign * value
+                (befores if sign < 0 else afters).append(snapshot)
+
+        for key, (delta, befores, afters) in sides.items():
+            if not any(delta.values()) and _open_due_dates(befores) == _open_due_dates(afters):
+                continue
+            await _apply_delta(db, model, key_column, key, delta, befores, afters)
+
+
+async def apply_task_change(
+    db: AsyncSession,
+    before: Optional[Dict[str, Any]],
+    after: Optional[Dict[str, Any]],
+) -> None:
+    """Apply the rollup delta of one task write; `None` marks a create or delete side.
+
+    Must run in the same transaction as the task write itself.
+    """
+    await apply_task_changes(db, [(before, after)])
+
+
+def _aggregates(now: datetime) -> Dict[str, Any]:
+    """COUNT ... FILTER expressions rebuilding every rollup column from tasks."""
+    columns = {
+        'task_count': func.count(Task.id),
+        'estimated_hours_total': func.coalesce(func.sum(Task.estimated_hours), 0),
+        'actual_hours_total': func.coalesce(func.sum(Task.actual_hours), 0),
+        'overdue_count': func.count(Task.id).filter(
+            and_(Task.status != 'done', Task.due_date < now)
+        ),
+    }
+    for status, column in STATUS_COUNT_COLUMNS.items():
+        columns[column] = func.count(Task.id).filter(Task.status == status)
+    for priority, column in PRIORITY_COUNT_COLUMNS.items():
+        columns[column] = func.count(Task.id).filter(Task.priority == priority)
+    return columns
+
+
+async def rebuild_stats(db: AsyncSession, project_id=None) -> List[UUID]:
+    """Recompute the rollups from the tasks table, for one project or for everything.
+
+    Returns the ids of the projects whose rollup was rewritten or removed, for
+    `invalidate_project_reads()` once the caller has committed; run it in its
+    own transaction.
+    """
+    now = datetime.utcnow()
+    project_ids = set()
+    for model, key_column, group_column in ROLLUPS:
+        table = model.__table__
+        aggregates = _aggregates(now)
+        source = (
+            select(
+                group_column,
+                *aggregates.values(),
+                literal(now).label('overdue_as_of'),
+                literal(now).label('updated_at'),
+            )
+            .where(group_column.is_not(None))
+            .group_by(group_column)
+        )
+
+        clear = delete(table)
+        if project_id is not None:
+            if model is ProjectStats:
+                keys = [project_id]
+            else:
+                keys = select(Sprint.id).where(Sprint.project_id == project_id)
+            source = source.where(group_column.in_(keys))
+            clear = clear.where(table.c[key_column].in_(keys))
+
+        insert = table.insert().from_select(
+            [key_column, *aggregates.keys(), 'overdue_as_of', 'updated_at'], source
+        )
+        if model is ProjectStats:
+            project_ids.update((await db.execute(clear.returning(table.c.project_id))).scalars())
+            project_ids.update((await db.execute(insert.returning(table.c.project_id))).scalars())
+        else:
+            await db.execute(clear)
+            await db.execute(insert)
+    return sorted(project_ids)
+
+
+async def refresh_overdue_counts(db: AsyncSession) -> List[UUID]:
+    """Recount overdue open tasks for every rollup row as of now.
+
+    Returns the ids of the projects whose overdue count changed; only those
+    rows get a new `updated_at`. The caller commits.
+    """
+    now = datetime.utcnow()
+    changed = []
+    for model, key_column, group_column in ROLLUPS:
+        table = model.__table__
+        overdue = (
+            select(func.count(Task.id))
+            .where(
+                group_column == table.c[key_column],
+                Task.status != 'done',
+                Task.due_date < now,
+            )
+            .scalar_subquery()
+        )
+        # Old counts, locked, to tell which rows the recount changed
+        old = select(table.c[key_column], table.c.overdue_count).with_for_update().cte('old')
+        result = await db.execute(
+            update(table)
+            .where(table.c[key_column] == old.c[key_column])
+            # Leave updated_at alone here: it marks task writes unless the count moved
+            .values(overdue_count=overdue, overdue_as_of=now, updated_at=table.c.updated_at)
+            .returning(table.c[key_column], table.c.overdue_count != old.c.overdue_count)
+        )
+        keys = [key for key, moved in result if moved]
+        if keys:
+            await db.execute(update(table).where(table.c[key_column].in_(keys)).values(updated_at=now))
+        if model is ProjectStats:
+            changed = keys
+    return changed
+
+
+async def invalidate_project_reads(project_ids: Sequence[UUID]) -> None:
+    """Drop cached reads of projects whose rollup changed outside a task write; after commit."""
+    for start in range(0, len(project_ids), INVALIDATE_CHUNK):
+        await read_cache.invalidate(*(f"project:{project_id}" for project_id in project_ids[start:start + INVALIDATE_CHUNK]))
+
+
+async def refresh_overdue(session_factory=AsyncSessionLocal) -> Dict[str, int]:
+    """Refresh overdue counts in a transaction of its own, then invalidate; the periodic job."""
+    async with session_factory() as db:
+        project_ids = await refresh_overdue_counts(db)
+        await db.commit()
+    await invalidate_project_reads(project_ids)
+    return {"projects_changed": len(project_ids)}
@@ -0,0 +1 @@
+# Tasks Services Package
@@ -0,0 +1,270 @@
+"""
+Batched task writes behind the /tasks/bulk endpoints.
+
+Items are validated one by one (`TaskCreate`/`TaskUpdate`, plus the project,
+sprint and assignee they reference) and invalid ones are reported by index
+instead of failing the request. The valid items are written in the caller's
+transaction, `TASK_BULK_BATCH_SIZE` rows per statement: creates as a multi-row
+`INSERT ... RETURNING`, patches and moves as `UPDATE ... FROM (VALUES ...)
+RETURNING` over rows locked up front. The project and sprint rollups then get
+one combined delta per affected project or sprint, and every created or
+changed task one outbox event, inserted in chunks.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import cast, column, insert, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.events.outbox import outbox_row, record_events, task_payload
+from app.services.stats.rollup import SNAPSHOT_FIELDS, TaskChange, apply_task_changes
+
+TASK_COLUMNS = Task.__table__.columns
+
+# (index in the request, task id, column values)
+BulkItem = Tuple[int, Optional[UUID], Dict[str, Any]]
+
+
+@dataclass
+class BulkResult:
+    tasks: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    changes: List[TaskChange] = field(default_factory=list)
+
+    def error(self, index: int, detail: Any, task_id: Optional[UUID] = None) -> None:
+        self.errors.append({"index": index, "id": task_id, "detail": detail})
+
+    def cache_scopes(self) -> List[str]:
+        """Read-cache scopes to invalidate once the batch is committed."""
+        scopes = set()
+        for before, after in self.changes:
+            for snapshot in (before, after):
+                if snapshot is not None:
+                    scopes.add(f"project:{snapshot['project_id']}")
+        # Newly created tasks have nothing cached yet
+        if any(before is not None for before, _ in self.changes):
+            scopes.update(f"task:{task['id']}" for task in self.tasks)
+        return sorted(scopes)
+
+
+def chunks(items: Sequence, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def validation_detail(e: ValidationError) -> List[Dict[str, Any]]:
+    return [{"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]} for error in e.errors()]
+
+
+def snapshot_row(row) -> Dict[str, Any]:
+    return {name: row[name] for name in SNAPSHOT_FIELDS}
+
+
+def check_required(item_values: Dict[str, Any]) -> Optional[str]:
+    """Explicit nulls for columns that cannot hold them."""
+    required = [name for name, value in item_values.items() if value is None and not TASK_COLUMNS[name].nullable]
+    if required:
+        return f"{', '.join(required)} cannot be null"
+    return None
+
+
+def check_due_date(item_values: Dict[str, Any], now: datetime) -> Optional[str]:
+    """Store due dates as naive UTC like the rest of the table; same rule as Task.validate_due_date."""
+    due_date = item_values.get("due_date")
+    if due_date is None:
+        return None
+    if due_date.tzinfo is not None:
+        due_date = item_values["due_date"] = due_date.astimezone(timezone.utc).replace(tzinfo=None)
+    if due_date < now:
+        return "Due date cannot be in the past"
+    return None
+
+
+async def check_references(
+    db: AsyncSession,
+    items: List[BulkItem],
+    project_of: Dict[int, UUID],
+    result: BulkResult,
+) -> List[BulkItem]:
+    """Drop items whose project, sprint or assignee does not exist; one query per kind."""
+    project_ids = set(project_of.values())
+    sprint_ids = {v["sprint_id"] for _, _, v in items if v.get("sprint_id") is not None}
+    assignee_ids = {v["assignee_id"] for _, _, v in items if v.get("assignee_id") is not None}
+
+    projects = set()
+    if project_ids:
+        projects = set((await db.execute(select(Project.id).where(Project.id.in_(project_ids)))).scalars())
+    sprint_projects = {}
+    if sprint_ids:
+        rows = await db.execute(select(Sprint.id, Sprint.project_id).where(Sprint.id.in_(sprint_ids)))
+        sprint_projects = dict(rows.all())
+    assignees = set()
+    if assignee_ids:
+        assignees = set((await db.execute(select(User.id).where(User.id.in_(assignee_ids)))).scalars())
+
+    valid = []
+    for index, task_id, item_values in items:
+        sprint_id = item_values.get("sprint_id")
+        assignee_id = item_values.get("assignee_id")
+        if project_of[index] not in projects:
+            result.error(index, "Project not found", task_id)
+        elif sprint_id is not None and sprint_projects.get(sprint_id) != project_of[index]:
+            result.error(index, "Sprint not found in this project", task_id)
+        elif assignee_id is not None and assignee_id not in assignees:
+            result.error(index, "Assignee not found", task_id)
+        else:
+            valid.append((index, task_id, item_values))
+    return valid
+
+
+async def create_tasks(db: AsyncSession, payloads: Sequence[Any]) -> BulkResult:
+    result = BulkResult()
+    now = datetime.utcnow()
+    items: List[BulkItem] = []
+    for index, payload in enumerate(payloads):
+        try:
+            item_values = TaskCreate.model_validate(payload).model_dump()
+        except ValidationError as e:
+            result.error(index, validation_detail(e))
+            continue
+        problem = check_due_date(item_values, now)
+        if problem:
+            result.error(index, problem)
+            continue
+        items.append((index, None, item_values))
+
+    items = await check_references(db, items, {index: v["project_id"] for index, _, v in items}, result)
+    items = [(index, uuid.uuid4(), item_values) for index, _, item_values in items]
+
+    rows = []
+    for chunk in chunks(items, settings.TASK_BULK_BATCH_SIZE):
+        stmt = insert(Task.__table__).values([
+            {**item_values, "id": task_id, "created_at": now, "updated_at": now}
+            for _, task_id, item_values in chunk
+        ]).returning(*TASK_COLUMNS)
+        rows.extend((await db.execute(stmt)).mappings().all())
+
+    # RETURNING order is not guaranteed; answer in request order
+    order = {task_id: index for index, task_id, _ in items}
+    rows.sort(key=lambda row: order[row["id"]])
+    result.tasks = [dict(row) for row in rows]
+    result.changes = [(None, snapshot_row(row)) for row in rows]
+    await apply_task_changes(db, result.changes)
+    await record_events(db, (outbox_row("task_created", "task", task_payload(row), now=now) for row in rows))
+    result.errors.sort(key=lambda error: error["index"])
+    return result
+
+
+async def patch_tasks(db: AsyncSession, payloads: Sequence[Any]) -> BulkResult:
+    result = BulkResult()
+    items: List[BulkItem] = []
+    seen = set()
+    for index, payload in enumerate(payloads):
+        try:
+            task_id = UUID(str(payload["id"]))
+        except (KeyError, TypeError, ValueError):
+            result.error(index, "Missing or invalid task id")
+            continue
+        if task_id in seen:
+            result.error(index, "Duplicate task id", task_id)
+            continue
+        seen.add(task_id)
+        try:
+            fields = {name: value for name, value in payload.items() if name != "id"}
+            item_values = TaskUpdate.model_validate(fields).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            result.error(index, validation_detail(e), task_id)
+            continue
+        if not item_values:
+            result.error(index, "No fields to update", task_id)
+            continue
+        items.append((index, task_id, item_values))
+
+    return await update_tasks(db, items, result)
+
+
+async def move_tasks(db: AsyncSession, task_ids: Sequence[UUID], fields: Dict[str, Any]) -> BulkResult:
+    """Set the same sprint and/or status on every task, e.g. dragging cards between sprints."""
+    result = BulkResult()
+    items: List[BulkItem] = []
+    seen = set()
+    for index, task_id in enumerate(task_ids):
+        if task_id in seen:
+            result.error(index, "Duplicate task id", task_id)
+            continue
+        seen.add(task_id)
+        items.append((index, task_id, dict(fields)))
+    return await update_tasks(db, items, result)
+
+
+async def update_tasks(db: AsyncSession, items: List[BulkItem], result: BulkResult) -> BulkResult:
+    now = datetime.utcnow()
+    before = {}
+    for chunk in chunks([task_id for _, task_id, _ in items], settings.TASK_BULK_BATCH_SIZE):
+        # Lock in id order so concurrent batches cannot deadlock each other
+        rows = await db.execute(
+            select(*TASK_COLUMNS).where(Task.id.in_(chunk)).order_by(Task.id).with_for_update()
+        )
+        before.update((row["id"], row) for row in rows.mappings())
+
+    found = []
+    for index, task_id, item_values in items:
+        if task_id not in before:
+            result.error(index, "Task not found", task_id)
+            continue
+        problem = check_required(item_values) or check_due_date(item_values, now)
+        if problem:
+            result.error(index, problem, task_id)
+            continue
+        found.append((index, task_id, item_values))
+
+    items = await check_references(
+        db, found, {index: before[task_id]["project_id"] for index, task_id, _ in found}, result
+    )
+
+    # One statement per chunk of items that set the same columns
+    groups: Dict[Tuple[str, ...], List[BulkItem]] = {}
+    for item in items:
+        groups.setdefault(tuple(sorted(item[2])), []).append(item)
+
+    rows = []
+    for names, group in groups.items():
+        for chunk in chunks(group, settings.TASK_BULK_BATCH_SIZE):
+            patch = values(
+                column("id", Task.id.type),
+                *(column(name, TASK_COLUMNS[name].type) for name in names),
+                name="patch",
+            ).data([(task_id, *(item_values[name] for name in names)) for _, task_id, item_values in chunk])
+            stmt = (
+                update(Task.__table__)
+                .where(Task.id == patch.c.id)
+                # The cast types VALUES columns that hold nothing but NULLs
+                .values({**{name: cast(patch.c[name], TASK_COLUMNS[name].type) for name in names}, "updated_at": now})
+                .returning(*TASK_COLUMNS)
+            )
+            rows.extend((await db.execute(stmt)).mappings().all())
+
+    order = {task_id: index for index, task_id, _ in items}
+    rows.sort(key=lambda row: order[row["id"]])
+    result.tasks = [dict(row) for row in rows]
+    result.changes = [(snapshot_row(before[row["id"]]), snapshot_row(row)) for row in rows]
+    await apply_task_changes(db, result.changes)
+    events = []
+    for row in rows:
+        data, previous = task_payload(row), task_payload(before[row["id"]])
+        if data != previous:
+            events.append(outbox_row("task_updated", "task", data, previous, now=now))
+    await record_events(db, events)
+    result.errors.sort(key=lambda error: error["index"])
+    return result
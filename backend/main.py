@@ -5,18 +5,37 @@ import uvicorn
 
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.core.database import engine
+from app.core.database import AsyncSessionLocal, engine, pool_status
 from app.core.redis import redis_client
+from app.core.metrics import metrics
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.replicas import ReadYourWritesMiddleware, close_replicas, init_replicas
+from app.services.ai.llm_service import init_llm_service, close_llm_service
+from app.services.automations.engine import close_automation_engine, init_automation_engine
+from app.services.automations.scheduler import close_automation_scheduler, init_automation_scheduler
+from app.services.events.dispatcher import close_event_dispatcher, init_event_dispatcher
+from app.services.jobs.queue import init_job_queue, close_job_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting up AI Project Management API...")
-    # TODO: Initialize database, Redis, and other services
+    await init_replicas()
+    init_llm_service()
+    await init_job_queue(run_workers=settings.JOB_RUN_WORKERS)
+    await init_automation_engine(AsyncSessionLocal)
+    await init_event_dispatcher(run=settings.OUTBOX_RUN_DISPATCHER)
+    await init_automation_scheduler(run=settings.AUTOMATION_SCHEDULER_ENABLED)
     yield
     # Shutdown
     print("Shutting down AI Project Management API...")
+    await close_automation_scheduler()
+    await close_event_dispatcher()
+    close_automation_engine()
+    await close_job_queue()
+    await close_llm_service()
+    await close_replicas()
     await redis_client.close()
 
 
@@ -36,6 +55,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Clients that just wrote read from the primary rather than a replica
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Query count, database time and repeated statements per request
+app.add_middleware(QueryStatsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -45,6 +70,16 @@ async def root():
     return {"message": "AI-Powered Project Management API"}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
+
+
+@app.get("/metrics/db")
+async def get_db_pool_metrics():
+    return pool_status()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "ai-project-management-api"}
@@ -0,0 +1,426 @@
+"""
+Benchmark the CRUD endpoints in-process and gate on regressions against a baseline.
+
+Runs every scenario (list with filter combinations and pagination depth and
+get for projects, tasks, sprints and users; task create, update and delete;
+sprint update) through an in-process ASGI client at each concurrency level,
+against a generated tenant (`app.core.mock_data`, loaded on first use and
+reused by seed afterwards).
+
+Per scenario and concurrency level it records latency percentiles,
+throughput, errors, SQL queries and database time per request; a separate
+sequential pass under tracemalloc records the peak memory allocated per request.
+The report is compared with a stored baseline: the run fails when p95 latency
+or allocations grow by more than --threshold, or when any scenario issues more
+queries per request than before, or when a baseline scenario selected for
+this run produced no result. A missing baseline fails too; baselines are not
+committed, so record one with --update-baseline first. Latency and
+allocation baselines only compare on the machine that recorded them; a shared
+baseline can gate on `--metrics queries_per_request` alone.
+
+Project writes and sprint creation are still placeholder handlers and users
+have no write endpoints, so those scenarios are not part of the suite yet.
+
+Usage (from backend/, after `alembic upgrade head`):
+    python -m scripts.benchmark_api --update-baseline          # record a baseline
+    python -m scripts.benchmark_api                            # compare, exit 1 on regression
+    python -m scripts.benchmark_api --scenarios tasks.list --concurrency 1,32 --json results.json
+    python -m scripts.benchmark_api --metrics queries_per_request --baseline shared_baseline.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import delete, event, select
+
+from app.core.config import settings
+from app.core.mock_data import MockDataGenerator, TenantSpec
+from app.models.task import TASK_PRIORITIES
+from scripts.benchmark_ai import percentile
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "api_baseline.json")
+
+# metric -> (uses --threshold, absolute slack below which a change is noise)
+TRACKED_METRICS = {
+    "p95_ms": (True, 2.0),
+    "alloc_peak_kb": (True, 32.0),
+    # Any extra query per request is a regression, whatever the threshold
+    "queries_per_request": (False, 0.5),
+}
+
+
+class QueryCounter:
+    """Counts statements and time spent in them on an engine, across all connections."""
+
+    def __init__(self, engine):
+        self.queries = 0
+        self.seconds = 0.0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context._benchmark_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        self.queries += 1
+        self.seconds += time.perf_counter() - context._benchmark_started
+
+    def reset(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+@dataclass
+class Tenant:
+    """Ids from the generated tenant that the scenarios address."""
+    team_id: Any
+    project_id: Any
+    assignee_id: Any
+    project_ids: List[Any]
+    sprint_ids: List[Any]
+    user_ids: List[Any]
+    task_ids: List[Any]
+    task_priorities: Dict[Any, str]
+    created_task_ids: List[Any] = field(default_factory=list)
+
+    def next_priority(self, task_id) -> str:
+        """A different priority each time, so every update really writes the task and its rollups."""
+        current = TASK_PRIORITIES.index(self.task_priorities[task_id])
+        self.task_priorities[task_id] = TASK_PRIORITIES[(current + 1) % len(TASK_PRIORITIES)]
+        return self.task_priorities[task_id]
+
+
+@dataclass
+class Scenario:
+    name: str
+    request: Callable[[Tenant, int], Dict[str, Any]]
+    status: int = 200
+    # Pages walked through next_cursor before starting over
+    pages: int = 1
+    after: Optional[Callable[[Tenant, httpx.Response], None]] = None
+
+
+def rotate(ids: List[Any], index: int) -> str:
+    return str(ids[index % len(ids)])
+
+
+def record_created(tenant: Tenant, response: httpx.Response) -> None:
+    body = response.json()
+    for task in body.get("tasks", [body]):
+        tenant.created_task_ids.append(task["id"])
+
+
+def scenarios(depth: int) -> List[Scenario]:
+    future = (datetime.utcnow() + timedelta(days=30)).isoformat()
+    return [
+        Scenario("projects.list", lambda t, i: {
+            "method": "GET", "url": "/api/v1/projects/", "params": {"team_id": str(t.team_id), "limit": 50},
+        }, pages=depth),
+        Scenario("projects.get", lambda t, i: {"method": "GET", "url": f"/api/v1/projects/{rotate(t.project_ids, i)}"}),
+        Scenario("tasks.list.project", lambda t, i: {
+            "method": "GET", "url": "/api/v1/tasks/", "params": {"project_id": str(t.project_id), "limit": 100},
+        }, pages=depth),
+        Scenario("tasks.list.project_status", lambda t, i: {
+            "method": "GET", "url": "/api/v1/tasks/",
+            "params": {"project_id": str(t.project_id), "status": "in_progress", "limit": 100},
+        }, pages=depth),
+        Scenario("tasks.list.project_assignee_status", lambda t, i: {
+            "method": "GET", "url": "/api/v1/tasks/",
+            "params": {"project_id": str(t.project_id), "assignee_id": str(t.assignee_id), "status": "todo"},
+        }, pages=depth),
+        Scenario("tasks.list.assignee_due_date", lambda t, i: {
+            "method": "GET", "url": "/api/v1/tasks/",
+            "params": {"assignee_id": str(t.assignee_id), "status": "todo", "sort": "due_date"},
+        }, pages=depth),
+        Scenario("tasks.board", lambda t, i: {
+            "method": "GET", "url": "/api/v1/tasks/board", "params": {"project_id": str(t.project_id)},
+        }),
+        Scenario("tasks.get", lambda t, i: {"method": "GET", "url": f"/api/v1/tasks/{rotate(t.task_ids, i)}"}),
+        Scenario("tasks.create", lambda t, i: {
+            "method": "POST", "url": "/api/v1/tasks/",
+            "json": {"title": f"Benchmark task {i}", "project_id": str(t.project_id), "due_date": future},
+        }, status=201, after=record_created),
+        Scenario("tasks.bulk_create", lambda t, i: {
+            "method": "POST", "url": "/api/v1/tasks/bulk",
+            "json": {"tasks": [
+                {"title": f"Benchmark bulk task {i}-{n}", "project_id": str(t.project_id), "priority": "low"}
+                for n in range(100)
+            ]},
+        }, after=record_created),
+        Scenario("tasks.update", lambda t, i: {
+            "method": "PUT", "url": f"/api/v1/tasks/{rotate(t.task_ids, i)}",
+            "json": {"priority": t.next_priority(t.task_ids[i % len(t.task_ids)])},
+        }),
+        Scenario("tasks.delete", lambda t, i: {
+            "method": "DELETE", "url": f"/api/v1/tasks/{t.created_task_ids.pop()}",
+        }, status=204),
+        Scenario("sprints.list", lambda t, i: {
+            "method": "GET", "url": "/api/v1/sprints/", "params": {"project_id": str(t.project_id)},
+        }, pages=depth),
+        Scenario("sprints.get", lambda t, i: {"method": "GET", "url": f"/api/v1/sprints/{rotate(t.sprint_ids, i)}"}),
+        Scenario("sprints.update", lambda t, i: {
+            "method": "PUT", "url": f"/api/v1/sprints/{rotate(t.sprint_ids, i)}",
+            "json": {"goal": f"Benchmark goal {i}"},
+        }),
+        Scenario("users.list", lambda t, i: {
+            "method": "GET", "url": "/api/v1/users/", "params": {"team_id": str(t.team_id), "limit": 50},
+        }, pages=depth),
+        Scenario("users.get", lambda t, i: {"method": "GET", "url": f"/api/v1/users/{rotate(t.user_ids, i)}"}),
+    ]
+
+
+async def prepare_tenant(spec: TenantSpec) -> Tenant:
+    """Load the tenant unless this seed is already in the database, then pick the ids to address."""
+    from app.core.database import AsyncSessionLocal
+    from app.models.task import Task
+    from app.models.team import Team
+    from app.services.imports.fixtures import load_tenant
+
+    tenant = MockDataGenerator(spec)
+    team_id = tenant.teams[0]["id"]
+    async with AsyncSessionLocal() as db:
+        loaded = await db.get(Team, team_id) is not None
+    if not loaded:
+        print(f"loading tenant (seed {spec.seed}, {spec.tasks} tasks)", file=sys.stderr)
+        async for _ in load_tenant(spec):
+            pass
+
+    counts = tenant.task_counts()
+    team_projects = [(count, project) for count, project in zip(counts, tenant.projects) if project["team_id"] == team_id]
+    project = max(team_projects, key=lambda item: item[0])[1]
+    assignee = next(user for user in tenant.users if user["team_id"] == team_id)
+    async with AsyncSessionLocal() as db:
+        task_priorities = dict((await db.execute(
+            select(Task.id, Task.priority).where(Task.project_id == project["id"]).order_by(Task.id).limit(1000)
+        )).all())
+    return Tenant(
+        team_id=team_id,
+        project_id=project["id"],
+        assignee_id=assignee["id"],
+        project_ids=[project["id"] for project in tenant.projects],
+        sprint_ids=[sprint["id"] for sprint in tenant.sprints if sprint["project_id"] == project["id"]],
+        user_ids=[user["id"] for user in tenant.users if user["team_id"] == team_id],
+        task_ids=list(task_priorities),
+        task_priorities=task_priorities,
+    )
+
+
+async def send(client: httpx.AsyncClient, scenario: Scenario, tenant: Tenant, index: int, cursor: Optional[str]):
+    request = scenario.request(tenant, index)
+    if cursor:
+        request["params"] = {**request.get("params", {}), "cursor": cursor}
+    response = await client.request(**request)
+    ok = response.status_code == scenario.status
+    if ok and scenario.after:
+        scenario.after(tenant, response)
+    next_cursor = response.json().get("next_cursor") if ok and scenario.pages > 1 else None
+    return ok, next_cursor
+
+
+async def run_level(client, scenario: Scenario, tenant: Tenant, concurrency: int, total: int, counter: QueryCounter):
+    latencies: List[float] = []
+    errors = 0
+    sequence = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        cursor, page = None, 0
+        while (index := next(sequence)) < total:
+            started = time.perf_counter()
+            ok, cursor = await send(client, scenario, tenant, index, cursor)
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+            page += 1
+            if cursor is None or page >= scenario.pages:
+                cursor, page = None, 0
+
+    counter.reset()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "queries_per_request": round(counter.queries / requests, 2) if requests else 0.0,
+        "db_ms_per_request": round(counter.seconds * 1000 / requests, 2) if requests else 0.0,
+    }
+
+
+async def profile_allocations(client, scenario: Scenario, tenant: Tenant, requests: int) -> float:
+    """Median peak of memory allocated while serving one request, in KiB."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        cursor, page = None, 0
+        for index in range(requests):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            _, cursor = await send(client, scenario, tenant, index, cursor)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+            page += 1
+            if cursor is None or page >= scenario.pages:
+                cursor, page = None, 0
+    finally:
+        tracemalloc.stop()
+    return round(statistics.median(peaks) / 1024, 1)
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float, metrics: List[str]
+) -> List[Dict[str, Any]]:
+    """Regressions of `results` against `baseline`; a baseline key with no result is one too."""
+    regressions = []
+    for key in sorted(baseline.keys() - results.keys()):
+        regressions.append({"key": key, "metric": "missing", "baseline": None, "current": None})
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in metrics:
+            relative, slack = TRACKED_METRICS[metric]
+            if metric not in current or metric not in previous:
+                continue
+            limit = previous[metric] * (1 + threshold if relative else 1) + slack
+            if current[metric] > limit:
+                regressions.append({
+                    "key": key, "metric": metric, "baseline": previous[metric], "current": current[metric],
+                })
+    return regressions
+
+
+async def cleanup(tenant: Tenant) -> None:
+    """Drop the tasks the write scenarios created so the tenant stays the same size."""
+    from app.core.database import AsyncSessionLocal
+    from app.models.task import Task
+    from app.services.stats.rollup import rebuild_stats
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Task).where(Task.project_id == tenant.project_id, Task.title.like("Benchmark %")))
+        await rebuild_stats(db, project_id=tenant.project_id)
+        await db.commit()
+
+
+async def main(args: argparse.Namespace) -> int:
+    settings.CACHE_ENABLED = args.cache
+
+    import main as app_main
+    from app.core.database import engine
+
+    spec = TenantSpec(seed=args.seed, teams=args.teams, users=args.users, projects=args.projects, tasks=args.tasks)
+    tenant = await prepare_tenant(spec)
+    counter = QueryCounter(engine)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    selected = [
+        scenario for scenario in scenarios(args.depth)
+        if not args.scenarios or any(scenario.name.startswith(prefix) for prefix in args.scenarios.split(","))
+    ]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for scenario in selected:
+            needed = args.warmup + args.profile_requests + len(levels) * args.requests
+            if scenario.name == "tasks.delete" and len(tenant.created_task_ids) < needed:
+                print(f"skipping {scenario.name}: it deletes what tasks.create made", file=sys.stderr)
+                continue
+            for index in range(args.warmup):
+                await send(client, scenario, tenant, index, None)
+            alloc_peak_kb = await profile_allocations(client, scenario, tenant, args.profile_requests)
+            for level in levels:
+                result = await run_level(client, scenario, tenant, level, args.requests, counter)
+                if level == 1:
+                    result["alloc_peak_kb"] = alloc_peak_kb
+                results[f"{scenario.name}@{level}"] = result
+                print(
+                    f"{scenario.name}@{level}: p95 {result['p95_ms']}ms, "
+                    f"{result['throughput_rps']} rps, {result['queries_per_request']} queries/request",
+                    file=sys.stderr,
+                )
+
+    await cleanup(tenant)
+    await engine.dispose()
+
+    config = {
+        "seed": args.seed, "tasks": args.tasks, "users": args.users, "projects": args.projects,
+        "requests": args.requests, "depth": args.depth, "cache": args.cache,
+    }
+    report: Dict[str, Any] = {"config": config, "results": results}
+    status = 1 if any(result["errors"] for result in results.values()) else 0
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config:
+            print(f"warning: baseline was recorded with {baseline.get('config')}", file=sys.stderr)
+        # Only what this run was asked for; --scenarios and --concurrency narrow it
+        requested = {f"{scenario.name}@{level}" for scenario in selected for level in levels}
+        previous = {key: value for key, value in baseline.get("results", {}).items() if key in requested}
+        report["regressions"] = compare(results, previous, args.threshold, args.metrics.split(","))
+        for regression in report["regressions"]:
+            if regression["metric"] == "missing":
+                print(f"REGRESSION {regression['key']}: in the baseline but not in this run", file=sys.stderr)
+                continue
+            print(
+                f"REGRESSION {regression['key']} {regression['metric']}: "
+                f"{regression['baseline']} -> {regression['current']}",
+                file=sys.stderr,
+            )
+        if report["regressions"]:
+            status = 1
+    else:
+        # Nothing to compare with is a failed gate, not a pass
+        print(f"no baseline at {args.baseline}; record one with --update-baseline", file=sys.stderr)
+        status = 1
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42, help="tenant seed; loaded once, reused afterwards")
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--scenarios", default="", help="comma-separated name prefixes, e.g. tasks.list,users")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and level")
+    parser.add_argument("--depth", type=int, default=5, help="pages walked by the list scenarios")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--profile-requests", type=int, default=20, help="requests traced for allocations")
+    parser.add_argument("--cache", action="store_true", help="keep the Redis read cache on")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.3, help="allowed relative growth of latency/allocations")
+    parser.add_argument(
+        "--metrics", default=",".join(TRACKED_METRICS),
+        help="metrics to gate on; queries_per_request alone is machine-independent",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", help="also write the report to this file")
+    sys.exit(asyncio.run(main(parser.parse_args())))
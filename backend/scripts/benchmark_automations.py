@@ -0,0 +1,182 @@
+"""
+Benchmark automation rule matching: compiled and indexed vs. one rule at a time.
+
+Generates --rules rules for one team with a realistic mix of triggers and
+conditions (mostly scoped to a project or assignee, then filtered on priority,
+status, estimate, title keywords or status changes) and a stream of task
+events over the same projects and users. Reports compile time and events/sec for the indexed engine, and
+for a naive evaluator that interprets every rule of the trigger against every
+event, then checks that both found the same matches. No database or Redis is
+needed.
+
+Usage (from backend/):
+    python -m scripts.benchmark_automations
+    python -m scripts.benchmark_automations --rules 50000 --events 200000
+    python -m scripts.benchmark_automations --naive-events 0   # skip the baseline
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from typing import Any, Dict, List
+
+from app.core.mock_data import TASK_SUBJECTS, TASK_VERBS
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES
+from app.services.automations.engine import RuleIndex, compile_rule
+
+TEAM_ID = str(uuid.UUID(int=1))
+
+# Share of rules and events per trigger type
+TRIGGER_WEIGHTS = {"task_updated": 0.6, "task_created": 0.3, "task_deleted": 0.1}
+
+ACTIONS = [{"type": "send_notification", "config": {"recipients": "assignee"}}]
+
+
+def make_scope(rng: random.Random, projects: List[str], users: List[str]) -> List[Dict[str, Any]]:
+    """Most rules are written for one project, some for one person's tasks."""
+    kind = rng.choices(("project", "assignee", "team"), weights=(75, 20, 5))[0]
+    if kind == "project":
+        return [{"field": "project_id", "operator": "equals", "value": rng.choice(projects)}]
+    if kind == "assignee":
+        return [{"field": "assignee_id", "operator": "equals", "value": rng.choice(users)}]
+    return []
+
+
+def make_condition(rng: random.Random, trigger: str) -> Dict[str, Any]:
+    kind = rng.choices(
+        ("priority", "status", "statuses", "estimate", "keyword", "changed"),
+        weights=(35, 20, 10, 10, 15, 10),
+    )[0]
+    if kind == "priority":
+        return {"field": "priority", "operator": "equals", "value": rng.choice(TASK_PRIORITIES)}
+    if kind == "status":
+        return {"field": "status", "operator": "equals", "value": rng.choice(TASK_STATUSES)}
+    if kind == "statuses":
+        return {"field": "status", "operator": "in", "value": rng.sample(TASK_STATUSES, 2)}
+    if kind == "estimate":
+        return {"field": "estimated_hours", "operator": "greater_than", "value": rng.choice((3, 5, 8, 13))}
+    if kind == "keyword" or trigger != "task_updated":
+        return {"field": "title", "operator": "contains", "value": rng.choice(TASK_SUBJECTS).split()[0]}
+    return {"field": "status", "operator": "changed"}
+
+
+def make_rules(count: int, rng: random.Random, projects: List[str], users: List[str]) -> List[Dict[str, Any]]:
+    triggers, weights = zip(*TRIGGER_WEIGHTS.items())
+    rules = []
+    for _ in range(count):
+        trigger = rng.choices(triggers, weights)[0]
+        conditions = make_scope(rng, projects, users) + [
+            make_condition(rng, trigger) for _ in range(rng.choices((0, 1, 2), weights=(15, 55, 30))[0])
+        ]
+        # Scope conditions are not necessarily listed first
+        rng.shuffle(conditions)
+        rules.append({"id": str(uuid.UUID(int=rng.getrandbits(128))), "trigger": trigger, "conditions": conditions})
+    return rules
+
+
+def make_task(rng: random.Random, projects: List[str], users: List[str]) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "title": f"{rng.choice(TASK_VERBS)} {rng.choice(TASK_SUBJECTS)}",
+        "project_id": rng.choice(projects),
+        "assignee_id": rng.choice(users) if rng.random() < 0.8 else None,
+        "status": rng.choice(TASK_STATUSES),
+        "priority": rng.choice(TASK_PRIORITIES),
+        "estimated_hours": rng.choice((None, 1, 2, 3, 5, 8, 13, 21)),
+    }
+
+
+def make_events(count: int, rng: random.Random, projects: List[str], users: List[str]) -> List[Dict[str, Any]]:
+    triggers, weights = zip(*TRIGGER_WEIGHTS.items())
+    events = []
+    for _ in range(count):
+        trigger = rng.choices(triggers, weights)[0]
+        data = make_task(rng, projects, users)
+        previous = None
+        if trigger == "task_updated":
+            previous = dict(data, status=rng.choice(TASK_STATUSES), priority=rng.choice(TASK_PRIORITIES))
+        events.append({"type": trigger, "team_id": TEAM_ID, "data": data, "previous": previous})
+    return events
+
+
+def naive_condition(condition: Dict[str, Any], event: Dict[str, Any]) -> bool:
+    """Interpret one condition against an event, as a rule-by-rule evaluator would."""
+    value = event["data"].get(condition["field"])
+    operator, operand = condition["operator"], condition.get("value")
+    if operator == "equals":
+        return value == operand
+    if operator == "in":
+        return value in operand
+    if operator == "greater_than":
+        return isinstance(value, int) and value > operand
+    if operator == "contains":
+        return isinstance(value, str) and operand.lower() in value.lower()
+    if operator == "changed":
+        previous = event.get("previous")
+        return previous is not None and previous.get(condition["field"]) != value
+    raise ValueError(operator)
+
+
+def naive_match(rules: List[Dict[str, Any]], event: Dict[str, Any]) -> List[str]:
+    return [
+        rule["id"] for rule in rules
+        if rule["trigger"] == event["type"] and all(naive_condition(c, event) for c in rule["conditions"])
+    ]
+
+
+def main(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    projects = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(args.projects)]
+    users = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(args.users)]
+    rules = make_rules(args.rules, rng, projects, users)
+    events = make_events(args.events, rng, projects, users)
+
+    started = time.perf_counter()
+    index = RuleIndex(
+        compile_rule(rule["id"], TEAM_ID, rule["trigger"], rule["conditions"], ACTIONS) for rule in rules
+    )
+    compile_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matches = 0
+    for event in events:
+        matches += len(index.match(event))
+    indexed_seconds = time.perf_counter() - started
+
+    report = {
+        "rules": len(index),
+        "events": len(events),
+        "compile_ms": round(compile_seconds * 1000, 1),
+        "indexed_events_per_second": round(len(events) / indexed_seconds),
+        "matches_per_event": round(matches / len(events), 2),
+    }
+
+    sample = events[:args.naive_events]
+    if sample:
+        started = time.perf_counter()
+        expected = [naive_match(rules, event) for event in sample]
+        naive_seconds = time.perf_counter() - started
+        report["naive_events_per_second"] = round(len(sample) / naive_seconds)
+        report["speedup"] = round(report["indexed_events_per_second"] / report["naive_events_per_second"], 1)
+        mismatches = sum(
+            sorted(rule.id for rule in index.match(event)) != sorted(ids)
+            for event, ids in zip(sample, expected)
+        )
+        report["mismatched_events"] = mismatches
+
+    print(json.dumps(report, indent=2))
+    return 1 if report.get("mismatched_events") else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rules", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--naive-events", type=int, default=2000, help="events replayed through the naive evaluator")
+    parser.add_argument("--seed", type=int, default=42)
+    sys.exit(main(parser.parse_args()))
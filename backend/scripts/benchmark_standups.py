@@ -0,0 +1,167 @@
+"""
+Benchmark batched standup summarization against a local fake OpenAI endpoint.
+
+The fake provider answers chat completions after a fixed latency plus a
+per-token generation time, and returns 429 with Retry-After when more than
+--provider-concurrency requests are in flight, so the adaptive backoff is
+exercised. No network access or API key is needed.
+
+Usage (from backend/):
+    python -m scripts.benchmark_standups
+    python -m scripts.benchmark_standups --teams 300 --provider-concurrency 10
+    python -m scripts.benchmark_standups --sequential-sample 0   # skip the baseline
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import sys
+import time
+
+import httpx
+
+from app.core.config import settings
+
+TEAM_HEADER = re.compile(r"^### TEAM (\d+)$", re.MULTILINE)
+
+
+class FakeOpenAI:
+    """httpx handler imitating the chat completions endpoint."""
+
+    def __init__(self, latency: float, tokens_per_second: float, max_concurrent: int, tokens_per_team: int):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.max_concurrent = max_concurrent
+        self.tokens_per_team = tokens_per_team
+        self.in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.in_flight >= self.max_concurrent:
+            self.throttled += 1
+            return httpx.Response(
+                429,
+                headers={"retry-after": "0.5"},
+                json={"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+            )
+
+        self.in_flight += 1
+        self.calls += 1
+        try:
+            body = json.loads(request.content)
+            prompt = body["messages"][0]["content"]
+            teams = TEAM_HEADER.findall(prompt)
+            if teams:
+                content = "\n".join(f"### TEAM {team}\n- Shipped work\n- No blockers" for team in teams)
+            else:
+                content = "- Shipped work\n- No blockers"
+            output_tokens = self.tokens_per_team * max(len(teams), 1)
+            await asyncio.sleep(self.latency + output_tokens / self.tokens_per_second)
+            return httpx.Response(200, json={
+                "id": f"chatcmpl-{self.calls}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": output_tokens, "total_tokens": output_tokens},
+            })
+        finally:
+            self.in_flight -= 1
+
+
+def make_teams(count: int, seed: int):
+    rng = random.Random(seed)
+    teams = []
+    for index in range(count):
+        # Mostly small teams with a long tail of large ones
+        members = min(int(rng.paretovariate(1.5)) + 2, 40)
+        teams.append({
+            "team_id": f"team-{index}",
+            "updates": [
+                {"name": f"member-{member}", "update": " ".join(rng.choices(WORDS, k=rng.randint(8, 40)))}
+                for member in range(members)
+            ],
+        })
+    return teams
+
+
+WORDS = (
+    "fixed reviewed deployed migrated blocked waiting on api design tests flaky "
+    "release sprint ticket refactor customer bug onboarding docs pairing spike"
+).split()
+
+
+async def run_mode(name: str, teams, provider: FakeOpenAI, batch: bool):
+    from app.services.ai.llm_service import LLMService
+
+    provider.calls = provider.throttled = 0
+    llm = LLMService(http_client=httpx.AsyncClient(transport=httpx.MockTransport(provider)))
+    started = time.monotonic()
+    latencies, failed = [], 0
+    if batch:
+        async for result in llm.summarize_standups(teams, use_cache=False):
+            latencies.append(time.monotonic() - started)
+            failed += result["status"] != "success"
+    else:
+        for team in teams:
+            result = await llm.generate_standup_summary(team["updates"], use_cache=False)
+            latencies.append(time.monotonic() - started)
+            failed += result["status"] != "success"
+    elapsed = time.monotonic() - started
+    await llm.close()
+
+    report = {
+        "mode": name,
+        "teams": len(teams),
+        "seconds": round(elapsed, 2),
+        "teams_per_second": round(len(teams) / elapsed, 2),
+        "provider_calls": provider.calls,
+        "throttled": provider.throttled,
+        "failed": failed,
+        "first_result_seconds": round(latencies[0], 2) if latencies else None,
+        "p50_result_seconds": round(statistics.median(latencies), 2) if latencies else None,
+    }
+    print(json.dumps(report))
+    return report
+
+
+async def main(args: argparse.Namespace) -> int:
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "benchmark"
+    settings.LLM_CACHE_ENABLED = False
+    settings.LLM_BATCH_CONCURRENCY = args.concurrency
+
+    teams = make_teams(args.teams, args.seed)
+    provider = FakeOpenAI(args.latency, args.tokens_per_second, args.provider_concurrency, args.tokens_per_team)
+
+    if args.sequential_sample:
+        sample = teams[:args.sequential_sample]
+        report = await run_mode("sequential", sample, provider, batch=False)
+        print(f"sequential, extrapolated to {len(teams)} teams: {report['seconds'] * len(teams) / len(sample):.0f}s")
+
+    pack_max_teams = settings.LLM_STANDUP_PACK_MAX_TEAMS
+    settings.LLM_STANDUP_PACK_MAX_TEAMS = 1
+    await run_mode("batch, unpacked", teams, provider, batch=True)
+    settings.LLM_STANDUP_PACK_MAX_TEAMS = pack_max_teams
+    report = await run_mode("batch, packed", teams, provider, batch=True)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teams", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--concurrency", type=int, default=settings.LLM_BATCH_CONCURRENCY)
+    parser.add_argument("--latency", type=float, default=0.3, help="fake provider base latency (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--tokens-per-team", type=int, default=150)
+    parser.add_argument("--provider-concurrency", type=int, default=6, help="in-flight requests before 429s")
+    parser.add_argument("--sequential-sample", type=int, default=20)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,46 @@
+"""
+Write a large, reproducible Jira-style export for testing task imports.
+
+Rows come from `mock_data.generate_jira_export` and are written as they are
+generated, so the size of the fixture does not matter.
+
+Usage (from backend/):
+    python -m scripts.generate_import_fixture tasks.csv --rows 200000
+    python -m scripts.generate_import_fixture tasks.jsonl --rows 50000 --seed 7 --projects 10 --users 500
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from app.core.mock_data import JIRA_EXPORT_HEADERS, generate_jira_export
+
+
+def main(args: argparse.Namespace) -> int:
+    rows = generate_jira_export(
+        args.rows, seed=args.seed, projects=args.projects, users=args.users,
+        sprints_per_project=args.sprints,
+    )
+    jsonl = args.path.endswith(".jsonl")
+    with open(args.path, "w", newline="", encoding="utf-8") as f:
+        if jsonl:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=JIRA_EXPORT_HEADERS)
+            writer.writeheader()
+            writer.writerows(rows)
+    print(f"wrote {args.rows} rows to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="output file; .jsonl writes JSON Lines, anything else CSV")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--projects", type=int, default=3)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--sprints", type=int, default=12, help="sprints per project")
+    sys.exit(main(parser.parse_args()))
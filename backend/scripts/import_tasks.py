@@ -0,0 +1,51 @@
+"""
+Import tasks, sprints, projects and assignees from a Jira CSV or JSONL export.
+
+Same pipeline as POST /imports/tasks: the file is streamed into staging tables
+with COPY and merged into the team in one transaction. Progress goes to stderr,
+the final summary to stdout as JSON.
+
+Usage (from backend/):
+    python -m scripts.import_tasks export.csv --team-id UUID --owner-id UUID
+    python -m scripts.import_tasks tasks.jsonl --team-id UUID --owner-id UUID --default-project "Backlog"
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from uuid import UUID
+
+from app.core.database import engine
+from app.services.imports.loader import run_import
+from app.services.imports.readers import IMPORT_FORMATS
+
+
+async def main(args: argparse.Namespace) -> int:
+    fmt = args.format or args.path.rsplit(".", 1)[-1].lower()
+    if fmt not in IMPORT_FORMATS:
+        print(f"unknown format '{fmt}', use --format {'/'.join(IMPORT_FORMATS)}", file=sys.stderr)
+        return 2
+
+    summary = None
+    try:
+        with open(args.path, "rb") as f:
+            async for event in run_import(f, fmt, args.team_id, args.owner_id, args.default_project):
+                if event["stage"] == "done":
+                    summary = event
+                else:
+                    print(json.dumps(event), file=sys.stderr)
+    finally:
+        await engine.dispose()
+    print(json.dumps(summary, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--team-id", type=UUID, required=True)
+    parser.add_argument("--owner-id", type=UUID, required=True, help="owner of projects the import creates")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="defaults to the file extension")
+    parser.add_argument("--default-project", default=None, help="project for rows without one")
+    sys.exit(asyncio.run(main(parser.parse_args())))
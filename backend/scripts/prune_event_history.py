@@ -0,0 +1,50 @@
+"""
+Delete event history older than EVENT_HISTORY_RETENTION_DAYS.
+
+Deletes in batches, each in its own transaction, so a large backlog never
+holds locks or bloats one transaction. Run it daily, e.g. from cron.
+
+Usage (from backend/):
+    python -m scripts.prune_event_history
+    python -m scripts.prune_event_history --days 30 --batch-size 20000
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.event_history import EventHistory
+
+
+async def main(args: argparse.Namespace) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=args.days)
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            # Oldest first through idx_event_history_occurred_at
+            batch = (
+                select(EventHistory.id)
+                .where(EventHistory.occurred_at < cutoff)
+                .order_by(EventHistory.occurred_at)
+                .limit(args.batch_size)
+            )
+            result = await db.execute(delete(EventHistory).where(EventHistory.id.in_(batch.scalar_subquery())))
+            await db.commit()
+        total += result.rowcount
+        if result.rowcount < args.batch_size:
+            break
+    print(f"Deleted {total} events that occurred before {cutoff.isoformat()}")
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=settings.EVENT_HISTORY_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    sys.exit(asyncio.run(main(parser.parse_args())))
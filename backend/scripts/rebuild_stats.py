@@ -0,0 +1,72 @@
+"""
+Rebuild or refresh the project_stats/sprint_stats rollups.
+
+Usage (from backend/):
+    python -m scripts.rebuild_stats                    # full rebuild from tasks
+    python -m scripts.rebuild_stats --project-id UUID  # rebuild one project
+    python -m scripts.rebuild_stats --refresh-overdue  # only recount overdue tasks (also a periodic job)
+    python -m scripts.rebuild_stats --check            # report drift, change nothing
+"""
+
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.redis import redis_client
+from app.models.project import Project
+from app.models.task import Task
+from app.services.stats.rollup import invalidate_project_reads, rebuild_stats, refresh_overdue_counts
+
+
+async def check_drift() -> int:
+    """Compare project rollups with a live aggregate; return the number of drifted projects."""
+    drifted = 0
+    async with AsyncSessionLocal() as db:
+        live = await db.execute(
+            select(
+                Task.project_id,
+                func.count(Task.id),
+                func.count(Task.id).filter(Task.status == "done"),
+            ).group_by(Task.project_id)
+        )
+        live_counts = {project_id: (total, done) for project_id, total, done in live}
+        stored = await db.execute(select(Project).options(joinedload(Project.stats)))
+        for project in stored.scalars():
+            rollup = (project.stats.task_count, project.stats.done_count) if project.stats else (0, 0)
+            counted = live_counts.get(project.id, (0, 0))
+            if rollup != counted:
+                drifted += 1
+                print(f"drift {project.id}: rollup={rollup} live={counted}")
+    return drifted
+
+
+async def main(args: argparse.Namespace) -> int:
+    if args.check:
+        drifted = await check_drift()
+        await engine.dispose()
+        return 1 if drifted else 0
+
+    async with AsyncSessionLocal() as db:
+        if args.refresh_overdue:
+            project_ids = await refresh_overdue_counts(db)
+        else:
+            project_ids = await rebuild_stats(db, project_id=args.project_id)
+        await db.commit()
+    await invalidate_project_reads(project_ids)
+    await engine.dispose()
+    await redis_client.close()
+    print(f"{len(project_ids)} projects changed")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--project-id", type=UUID, default=None)
+    parser.add_argument("--refresh-overdue", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,54 @@
+"""
+Deliver domain events from the outbox outside the API process.
+
+Any number of dispatchers can run side by side; each claims its own batches.
+
+Usage (from backend/):
+    python -m scripts.run_event_dispatcher
+    python -m scripts.run_event_dispatcher --drain     # deliver what is pending, then exit
+
+Set OUTBOX_RUN_DISPATCHER=false on the API processes to leave delivery to these.
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import metrics
+from app.core.redis import redis_client
+from app.services.events.dispatcher import close_event_dispatcher, init_event_dispatcher
+
+
+async def main(args: argparse.Namespace) -> int:
+    if settings.OUTBOX_BACKEND == "memory":
+        print("OUTBOX_BACKEND=memory only delivers events inside the API process", file=sys.stderr)
+        return 1
+
+    dispatcher = await init_event_dispatcher(run=not args.drain)
+    if args.drain:
+        delivered = await dispatcher.drain()
+        print(json.dumps({"claimed": delivered, **{
+            name: value for name, value in metrics.snapshot().items() if name.startswith("events.")
+        }}, indent=2))
+    else:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        print(f"Event dispatcher running (batches of {settings.OUTBOX_BATCH_SIZE})")
+        await stop.wait()
+
+    await close_event_dispatcher()
+    await redis_client.close()
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--drain", action="store_true", help="deliver pending events and exit")
+    sys.exit(asyncio.run(main(parser.parse_args())))
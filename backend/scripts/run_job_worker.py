@@ -0,0 +1,51 @@
+"""
+Run background job workers outside the API process.
+
+Usage (from backend/):
+    python -m scripts.run_job_worker                     # all lanes
+    python -m scripts.run_job_worker --lane batch        # only batch jobs
+    python -m scripts.run_job_worker --concurrency 16
+
+Set JOB_RUN_WORKERS=false on the API processes to leave execution to these.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.services.ai.llm_service import close_llm_service, init_llm_service
+from app.services.jobs.job import JOB_LANES
+from app.services.jobs.queue import close_job_queue, init_job_queue
+
+
+async def main(args: argparse.Namespace) -> int:
+    if settings.JOB_BROKER == "memory":
+        print("JOB_BROKER=memory only runs jobs inside the API process", file=sys.stderr)
+        return 1
+    if args.concurrency:
+        settings.JOB_WORKER_CONCURRENCY = args.concurrency
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    init_llm_service()
+    await init_job_queue(lanes=args.lane or JOB_LANES)
+    print(f"Job workers running ({settings.JOB_WORKER_CONCURRENCY}) on {', '.join(args.lane or JOB_LANES)}")
+    await stop.wait()
+
+    await close_job_queue()
+    await close_llm_service()
+    await redis_client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lane", action="append", choices=JOB_LANES)
+    parser.add_argument("--concurrency", type=int, default=None)
+    sys.exit(asyncio.run(main(parser.parse_args())))
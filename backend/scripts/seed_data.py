@@ -0,0 +1,66 @@
+"""
+Load a generated tenant of realistic size into the database.
+
+Teams, users, projects, overlapping sprints, tasks with skewed status,
+priority and assignee distributions, and a task dependency graph, all derived
+from --seed and streamed in with COPY. Use a new seed for every extra tenant
+in the same database. Progress goes to stderr, the summary to stdout as JSON.
+
+Usage (from backend/, after `alembic upgrade head`):
+    python -m scripts.seed_data                                    # small sample tenant
+    python -m scripts.seed_data --users 3000 --projects 40 --tasks 150000 --seed 1
+    python -m scripts.seed_data --tasks 20000 --dependency-rate 0.6 --anchor 2025-09-01
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+
+from app.core.database import engine
+from app.core.mock_data import TenantSpec
+from app.services.imports.fixtures import load_tenant
+
+
+async def main(args: argparse.Namespace) -> int:
+    spec = TenantSpec(
+        seed=args.seed,
+        teams=args.teams,
+        users=args.users,
+        projects=args.projects,
+        tasks=args.tasks,
+        sprints_per_project=args.sprints,
+        sprint_days=args.sprint_days,
+        sprint_overlap_days=args.sprint_overlap_days,
+        dependency_rate=args.dependency_rate,
+        anchor=args.anchor,
+    )
+    summary = None
+    try:
+        async for event in load_tenant(spec, args.batch_size):
+            if event["stage"] == "done":
+                summary = event
+            else:
+                print(json.dumps(event), file=sys.stderr)
+    finally:
+        await engine.dispose()
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    defaults = TenantSpec()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--teams", type=int, default=defaults.teams)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--tasks", type=int, default=defaults.tasks)
+    parser.add_argument("--sprints", type=int, default=defaults.sprints_per_project, help="sprints per project")
+    parser.add_argument("--sprint-days", type=int, default=defaults.sprint_days)
+    parser.add_argument("--sprint-overlap-days", type=int, default=defaults.sprint_overlap_days)
+    parser.add_argument("--dependency-rate", type=float, default=defaults.dependency_rate)
+    parser.add_argument("--anchor", type=datetime.fromisoformat, default=None, help="'today' of the tenant")
+    parser.add_argument("--batch-size", type=int, default=None, help="rows per COPY (IMPORT_BATCH_ROWS)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,62 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.database import AsyncSessionLocal
+from app.models import Automation, EventHistory, OutboxEvent, Project, Sprint, Task, Team, User
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # One loop for the whole run: the app's engine and pools outlive a single test
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def database_url() -> str:
+    """The migrated Postgres to test against; tests that need one skip without it."""
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        pytest.skip("DATABASE_URL is not set (needs a database at `alembic upgrade head`)")
+    return url
+
+
+@pytest.fixture
+async def db(database_url):
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def tenant(db):
+    """Ids of a team with one user, project and sprint; removed with everything added to it afterwards."""
+    team = Team(id=uuid4(), name="Test team")
+    user = User(id=uuid4(), email=f"{uuid4().hex}@example.com", name="Tester", hashed_password="-", team_id=team.id)
+    project = Project(id=uuid4(), name="Test project", owner_id=user.id, team_id=team.id)
+    now = datetime.utcnow()
+    sprint = Sprint(id=uuid4(), name="Sprint 1", project_id=project.id, start_date=now, end_date=now + timedelta(days=14))
+    db.add_all([team, user, project, sprint])
+    await db.commit()
+
+    ids = SimpleNamespace(team_id=team.id, user_id=user.id, project_id=project.id, sprint_id=sprint.id)
+    yield ids
+
+    await db.rollback()
+    await db.execute(delete(Task).where(Task.project_id == ids.project_id))
+    await db.execute(delete(OutboxEvent).where(
+        (OutboxEvent.project_id == ids.project_id) | (OutboxEvent.team_id == ids.team_id)
+    ))
+    await db.execute(delete(EventHistory).where(EventHistory.team_id == ids.team_id))
+    await db.execute(delete(Automation).where(Automation.team_id == ids.team_id))
+    await db.execute(delete(Sprint).where(Sprint.project_id == ids.project_id))
+    await db.execute(delete(Project).where(Project.id == ids.project_id))
+    await db.execute(delete(User).where(User.team_id == ids.team_id))
+    await db.execute(delete(Team).where(Team.id == ids.team_id))
+    await db.commit()
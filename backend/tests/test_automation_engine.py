@@ -0,0 +1,56 @@
+"""
+Keeping a worker's automation rules in step with the version in Redis: a
+worker's own change does not trigger a reload, but one that follows another
+worker's change does not hide it either.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.automations import engine as engine_module
+from app.services.automations.engine import VERSION_KEY, AutomationEngine
+
+
+class VersionStore:
+    """Just the two Redis commands the engine uses for its version."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    store = VersionStore()
+    monkeypatch.setattr(engine_module, "redis_client", store)
+    monkeypatch.setattr(settings, "AUTOMATION_RELOAD_SECONDS", 3600)
+    return store
+
+
+@pytest.fixture
+async def engine(versions, database_url):
+    engine = AutomationEngine()
+    assert await engine.refresh(AsyncSessionLocal, force=True)
+    return engine
+
+
+async def test_own_change_is_not_reloaded(engine, versions):
+    await engine.publish()
+    assert engine.version == versions.values[VERSION_KEY] == "1"
+    assert not await engine.refresh(AsyncSessionLocal)
+
+
+async def test_change_after_another_workers_is_reloaded(engine, versions):
+    await versions.incr(VERSION_KEY)  # another worker's write
+    await engine.publish()
+    assert engine.version is None
+
+    assert await engine.refresh(AsyncSessionLocal)
+    assert engine.version == "2"
@@ -0,0 +1,148 @@
+"""
+Bulk task writes (app.services.tasks.bulk): per-item errors by index, results
+in request order, statements chunked at TASK_BULK_BATCH_SIZE, and rollups that
+stay exact when only part of a batch is valid.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, select
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models import OutboxEvent, ProjectStats, SprintStats, Task
+from app.models.stats import PRIORITY_COUNT_COLUMNS, STATUS_COUNT_COLUMNS
+from app.services.tasks import bulk
+
+
+@pytest.fixture
+def statements():
+    """SQL statements run while the test does, in order."""
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def assert_rollup_exact(db, model, key_column, key):
+    """The stored rollup row equals a recount of the tasks it covers."""
+    db.expire_all()
+    tasks = (await db.execute(select(Task).where(getattr(Task, key_column) == key))).scalars().all()
+    stats = await db.get(model, key)
+    if not tasks:
+        assert stats is None or stats.task_count == 0
+        return
+    expected = Counter(task_count=len(tasks))
+    for task in tasks:
+        expected[STATUS_COUNT_COLUMNS[task.status]] += 1
+        expected[PRIORITY_COUNT_COLUMNS[task.priority]] += 1
+        expected["estimated_hours_total"] += task.estimated_hours or 0
+        expected["actual_hours_total"] += task.actual_hours or 0
+        if task.due_date is not None and task.status != "done" and task.due_date < stats.overdue_as_of:
+            expected["overdue_count"] += 1
+    columns = ["task_count", "estimated_hours_total", "actual_hours_total", "overdue_count",
+               *STATUS_COUNT_COLUMNS.values(), *PRIORITY_COUNT_COLUMNS.values()]
+    assert {column: getattr(stats, column) for column in columns} == {column: expected[column] for column in columns}
+
+
+def task_inserts(statements):
+    return [s for s in statements if s.startswith("INSERT INTO tasks")]
+
+
+async def test_mixed_create_batch_commits_only_valid_items(db, tenant, statements, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_BULK_BATCH_SIZE", 2)
+    project_id, due = str(tenant.project_id), (datetime.utcnow() + timedelta(days=3)).isoformat()
+    payloads = [
+        {"title": "a", "project_id": project_id, "estimated_hours": 3, "sprint_id": str(tenant.sprint_id)},
+        {"project_id": project_id},  # no title
+        {"title": "b", "project_id": project_id, "sprint_id": str(uuid4())},
+        {"title": "c", "project_id": project_id, "status": "done", "priority": "urgent", "estimated_hours": 5},
+        {"title": "d", "project_id": project_id, "due_date": "2000-01-01T00:00:00"},
+        {"title": "e", "project_id": str(uuid4())},
+        {"title": "f", "project_id": project_id, "assignee_id": str(tenant.user_id), "due_date": due},
+        {"title": "g", "project_id": project_id, "assignee_id": str(uuid4())},
+        {"title": "h", "project_id": project_id, "priority": "high"},
+    ]
+
+    result = await bulk.create_tasks(db, payloads)
+    await db.commit()
+
+    assert [error["index"] for error in result.errors] == [1, 2, 4, 5, 7]
+    assert [error["detail"] for error in result.errors[1:]] == [
+        "Sprint not found in this project", "Due date cannot be in the past",
+        "Project not found", "Assignee not found",
+    ]
+    assert [task["title"] for task in result.tasks] == ["a", "c", "f", "h"]
+    # Four valid rows at two per statement
+    assert len(task_inserts(statements)) == 2
+
+    stored = (await db.execute(select(Task.title).where(Task.project_id == tenant.project_id))).scalars().all()
+    assert sorted(stored) == ["a", "c", "f", "h"]
+    events = await db.scalar(select(OutboxEvent.id).where(OutboxEvent.project_id == tenant.project_id).limit(1))
+    assert events is not None
+    await assert_rollup_exact(db, ProjectStats, "project_id", tenant.project_id)
+    await assert_rollup_exact(db, SprintStats, "sprint_id", tenant.sprint_id)
+
+
+async def test_patch_batch_reports_errors_by_index_in_request_order(db, tenant, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_BULK_BATCH_SIZE", 2)
+    project_id = str(tenant.project_id)
+    created = await bulk.create_tasks(db, [
+        {"title": f"t{n}", "project_id": project_id, "estimated_hours": n} for n in range(6)
+    ])
+    await db.commit()
+    ids = [str(task["id"]) for task in created.tasks]
+
+    result = await bulk.patch_tasks(db, [
+        {"id": ids[3], "status": "done", "actual_hours": 4},
+        {"id": str(uuid4()), "status": "done"},
+        {"id": ids[0], "priority": "urgent", "sprint_id": str(tenant.sprint_id)},
+        {"id": ids[3], "status": "review"},  # duplicate
+        {"id": ids[1], "title": None},
+        {"id": ids[2]},
+        {"status": "done"},
+        {"id": ids[4], "status": "in_progress", "estimated_hours": 10},
+        {"id": ids[5], "priority": "bogus"},
+    ])
+    await db.commit()
+
+    assert [(error["index"], error["detail"]) for error in result.errors if isinstance(error["detail"], str)] == [
+        (1, "Task not found"), (3, "Duplicate task id"), (4, "title cannot be null"),
+        (5, "No fields to update"), (6, "Missing or invalid task id"),
+    ]
+    assert [error["index"] for error in result.errors] == [1, 3, 4, 5, 6, 8]
+    assert [str(task["id"]) for task in result.tasks] == [ids[3], ids[0], ids[4]]
+    assert [task["status"] for task in result.tasks] == ["done", "todo", "in_progress"]
+    await assert_rollup_exact(db, ProjectStats, "project_id", tenant.project_id)
+    await assert_rollup_exact(db, SprintStats, "sprint_id", tenant.sprint_id)
+
+
+async def test_move_updates_sprint_rollups(db, tenant, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_BULK_BATCH_SIZE", 2)
+    created = await bulk.create_tasks(db, [
+        {"title": f"t{n}", "project_id": str(tenant.project_id), "estimated_hours": 2} for n in range(5)
+    ])
+    await db.commit()
+    ids = [task["id"] for task in created.tasks]
+
+    result = await bulk.move_tasks(
+        db, [ids[4], ids[0], ids[4], uuid4(), ids[2]], {"sprint_id": tenant.sprint_id, "status": "in_progress"}
+    )
+    await db.commit()
+
+    assert [error["index"] for error in result.errors] == [2, 3]
+    assert [task["id"] for task in result.tasks] == [ids[4], ids[0], ids[2]]
+    await assert_rollup_exact(db, ProjectStats, "project_id", tenant.project_id)
+    await assert_rollup_exact(db, SprintStats, "sprint_id", tenant.sprint_id)
+
+    # Out of the sprint again
+    await bulk.move_tasks(db, [ids[0]], {"sprint_id": None})
+    await db.commit()
+    await assert_rollup_exact(db, SprintStats, "sprint_id", tenant.sprint_id)
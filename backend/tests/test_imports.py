@@ -0,0 +1,66 @@
+"""
+Task imports (app.services.imports.loader): importing the same export twice
+updates the tasks the first import created, with or without external ids.
+"""
+
+import io
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models import Task
+from app.services.imports.loader import run_import
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+
+
+def export(rows) -> io.BytesIO:
+    return io.BytesIO("".join(json.dumps(row) + "\n" for row in rows).encode())
+
+
+async def import_rows(tenant, rows):
+    events = [
+        event async for event in run_import(
+            export(rows), "jsonl", tenant.team_id, tenant.user_id, default_project="Test project",
+        )
+    ]
+    return events[-1]
+
+
+async def project_tasks(db, tenant):
+    rows = await db.execute(
+        select(Task.external_id, Task.title, Task.due_date.is_not(None), Task.status)
+        .where(Task.project_id == tenant.project_id)
+        .order_by(Task.title, Task.due_date)
+    )
+    return rows.all()
+
+
+async def test_reimport_updates_tasks_with_and_without_external_ids(db, tenant):
+    rows = [
+        {"key": "T-1", "summary": "Keyed", "status": "To Do"},
+        {"summary": "Keyless", "status": "To Do", "due": "2030-01-01"},
+        {"summary": "Keyless", "status": "To Do"},
+        {"summary": "Repeated", "status": "To Do"},
+        {"summary": "Repeated", "status": "Done"},
+    ]
+    first = await import_rows(tenant, rows)
+    assert (first["tasks_created"], first["tasks_updated"]) == (4, 0)
+
+    rows[0]["status"] = rows[1]["status"] = "Done"
+    second = await import_rows(tenant, rows)
+    assert (second["tasks_created"], second["tasks_updated"]) == (0, 4)
+
+    assert await project_tasks(db, tenant) == [
+        ("T-1", "Keyed", False, "done"),
+        (None, "Keyless", True, "done"),
+        (None, "Keyless", False, "todo"),
+        (None, "Repeated", False, "done"),
+    ]
+    count = await db.scalar(select(func.count()).select_from(Task).where(Task.project_id == tenant.project_id))
+    assert count == 4
@@ -0,0 +1,61 @@
+"""
+Background jobs on the in-process broker (JOB_BROKER=memory): a job that runs
+past its visibility timeout keeps its lease, so a second delivery of it is
+skipped rather than run alongside the first.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.jobs.broker import InMemoryBroker
+from app.services.jobs.queue import JobQueue, JobWorkerPool
+
+
+@pytest.fixture
+def runs():
+    return []
+
+
+@pytest.fixture
+def queue(monkeypatch, runs):
+    monkeypatch.setattr(settings, "JOB_VISIBILITY_TIMEOUT_SECONDS", 0.3)
+
+    async def slow(payload):
+        runs.append(payload["n"])
+        await asyncio.sleep(1.0)
+        return {"n": payload["n"]}
+
+    return JobQueue(InMemoryBroker(), {"slow": slow})
+
+
+async def test_redelivered_job_runs_once(queue, runs):
+    workers = JobWorkerPool(queue, concurrency=2)
+    workers.start()
+    try:
+        job = await queue.submit("slow", {"n": 1})
+        # Past the visibility timeout, as a reclaim of the still-running job would
+        await asyncio.sleep(0.6)
+        assert (await queue.get(job.id)).status == "running"
+        await queue.broker.push(job)
+
+        finished = await queue.wait(job.id, timeout=3.0)
+    finally:
+        await workers.stop()
+
+    assert finished.status == "succeeded"
+    assert finished.attempts == 1
+    assert runs == [1]
+
+
+async def test_expired_lease_is_taken_over(queue, runs):
+    # A worker that died mid-run leaves the job running with a lapsed lease
+    job = await queue.submit("slow", {"n": 2})
+    stale = await queue.get(job.id)
+    stale.status, stale.attempts, stale.lease_until = "running", 1, 0.0
+    await queue.broker.save(stale)
+
+    assert await queue.execute(job.id)
+    finished = await queue.get(job.id)
+    assert (finished.status, finished.attempts, runs) == ("succeeded", 2, [2])
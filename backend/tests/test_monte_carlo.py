@@ -0,0 +1,78 @@
+"""
+Delivery forecasts: the Monte Carlo simulation (app.services.forecasting.monte_carlo)
+and how the forecast reports trials that never finish.
+"""
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.models import Project, Task
+from app.services.forecasting.forecast import forecast
+from app.services.forecasting.monte_carlo import SimulationInputs, percentiles, simulate
+
+
+def inputs(estimates, logged=None, ratios=(), weekly_hours=(30.0,)):
+    return SimulationInputs(
+        estimates=np.array(estimates, dtype=np.float64),
+        logged=np.array(logged if logged is not None else [0] * len(estimates), dtype=np.float64),
+        ratios=np.array(ratios, dtype=np.float64),
+        weekly_hours=np.array(weekly_hours, dtype=np.float64),
+    )
+
+
+OBSERVED_RATIOS = [0.6, 0.9, 1.0, 1.2, 1.5, 2.5]
+
+
+def spread(ratios=OBSERVED_RATIOS):
+    """Twenty tasks with varied estimates, estimate errors and weekly capacity."""
+    return inputs(estimates=[2, 3, 5, 8, 13] * 4, ratios=ratios, weekly_hours=[10, 25, 30, 40, 55])
+
+
+def test_same_seed_gives_the_same_trials():
+    first = simulate(spread(), 5000, seed=11)
+    assert np.array_equal(first, simulate(spread(), 5000, seed=11))
+    assert not np.array_equal(first, simulate(spread(), 5000, seed=12))
+
+
+@pytest.mark.parametrize("ratios", [OBSERVED_RATIOS, []], ids=["observed", "log-normal"])
+def test_percentiles_are_ordered(ratios):
+    days = simulate(spread(ratios), 5000, seed=3)
+    p50, p85, p95 = percentiles(days, (50, 85, 95))
+    assert 0 < p50 <= p85 <= p95 < np.inf
+
+
+def test_no_remaining_tasks_is_done_now():
+    days = simulate(inputs([]), 100, seed=1)
+    assert np.array_equal(days, np.zeros(100))
+    assert list(percentiles(days, (50, 85, 95))) == [0, 0, 0]
+
+
+def test_work_beyond_the_horizon_never_finishes():
+    days = simulate(inputs([1000], ratios=[1.0], weekly_hours=[10]), 100, seed=1, max_weeks=4)
+    assert np.isinf(days).all()
+    assert np.isinf(percentiles(days, (50, 85, 95))).all()
+
+
+def test_logged_hours_come_off_the_remaining_work():
+    # With exact estimates and an hour of capacity a week, days = 7 x remaining hours
+    untouched = simulate(inputs([10, 10], ratios=[1.0], weekly_hours=[1.0]), 10, seed=1)
+    assert np.allclose(untouched, 7 * 20)
+    # 6 hours left on the first task; the second is over its estimate, never below zero
+    partly_done = simulate(inputs([10, 10], logged=[4, 15], ratios=[1.0], weekly_hours=[1.0]), 10, seed=1)
+    assert np.allclose(partly_done, 7 * 6)
+
+
+async def test_forecast_reports_no_date_past_the_horizon(db, tenant, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "FORECAST_MAX_WEEKS", 4)
+    db.add(Task(
+        title="Too big", project_id=tenant.project_id, assignee_id=tenant.user_id, estimated_hours=10000,
+    ))
+    await db.commit()
+    project = await db.get(Project, tenant.project_id)
+
+    result = await forecast(db, project, trials=200, seed=5)
+
+    assert result["percentiles"] == {"p50": None, "p85": None, "p95": None}
+    assert result["beyond_horizon"] == 1.0
@@ -0,0 +1,119 @@
+"""
+Domain events through the in-process outbox (OUTBOX_BACKEND=memory): events
+reach the queue only when their transaction commits, and the dispatcher
+retries a failed batch one event at a time before dead-lettering the culprit.
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.events.dispatcher import Consumer, InMemoryDispatcher, savepoint
+from app.services.events.outbox import memory_outbox, outbox_row, record_event
+
+EVENT = "test.event"
+FOLLOW_UP = "test.follow_up"
+
+
+@pytest.fixture
+def outbox(monkeypatch, database_url):
+    monkeypatch.setattr(settings, "OUTBOX_BACKEND", "memory")
+    memory_outbox.take(len(memory_outbox))
+    yield memory_outbox
+    memory_outbox.take(len(memory_outbox))
+
+
+def queued(outbox):
+    return [(row["event_type"], row["payload"]["data"]["id"], row["attempts"]) for row in outbox.events]
+
+
+def record(db, event_type=EVENT):
+    aggregate_id = str(uuid4())
+    record_event(db, event_type, "task", {"id": aggregate_id})
+    return aggregate_id
+
+
+def publish(outbox, *failing):
+    """Committed events, one per flag; the flagged ones make `Failing` raise."""
+    rows = [outbox_row(EVENT, "task", {"id": str(uuid4()), "fail": fail}) for fail in failing]
+    outbox.publish(rows)
+    return [row["payload"]["data"]["id"] for row in rows]
+
+
+class Recording(Consumer):
+    """Records each batch, a follow-up event per event and an effect per event."""
+    name = "recording"
+
+    def __init__(self):
+        self.batches = []
+        self.effects_run = []
+
+    async def handle(self, db, events, effects):
+        events = [event for event in events if event["type"] == EVENT]
+        if not events:
+            return
+        self.batches.append([event["data"]["id"] for event in events])
+        for event in events:
+            aggregate_id = event["data"]["id"]
+            record_event(db, FOLLOW_UP, "task", {"id": aggregate_id})
+
+            async def effect(aggregate_id=aggregate_id):
+                self.effects_run.append(aggregate_id)
+
+            effects.append(effect)
+
+
+class Failing(Consumer):
+    name = "failing"
+
+    async def handle(self, db, events, effects):
+        if any(event["data"].get("fail") for event in events):
+            raise RuntimeError("consumer failed")
+
+
+async def test_only_committed_events_are_queued(outbox, db):
+    committed = record(db)
+    await db.commit()
+    assert queued(outbox) == [(EVENT, committed, 0)]
+
+    record(db)
+    await db.rollback()
+    assert len(outbox) == 1
+
+    kept = record(db)
+    with pytest.raises(RuntimeError):
+        async with savepoint(db):
+            record(db)
+            raise RuntimeError("rolled back to the savepoint")
+    await db.commit()
+    assert queued(outbox) == [(EVENT, committed, 0), (EVENT, kept, 0)]
+
+    # Releasing a savepoint commits nothing yet
+    async with savepoint(db):
+        record(db)
+    await db.rollback()
+    assert len(outbox) == 2
+
+
+async def test_failed_batch_is_retried_one_event_at_a_time(outbox, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+    recording = Recording()
+    dispatcher = InMemoryDispatcher([recording, Failing()])
+    ids = publish(outbox, False, False, True, False)
+
+    assert await dispatcher.drain_once() == 4
+    assert recording.batches == [ids, [ids[0]], [ids[1]], [ids[2]], [ids[3]]]
+    # Nothing from the failed attempts survives: no follow-ups or effects for them
+    assert recording.effects_run == [ids[0], ids[1], ids[3]]
+    assert queued(outbox) == [
+        (FOLLOW_UP, ids[0], 0), (FOLLOW_UP, ids[1], 0), (FOLLOW_UP, ids[3], 0), (EVENT, ids[2], 1),
+    ]
+
+    dead = metrics.counters["events.dead"]
+    assert await dispatcher.drain_once() == 4
+    assert recording.batches[-1] == [ids[2]]
+    assert recording.effects_run == [ids[0], ids[1], ids[3]]
+    assert metrics.counters["events.dead"] == dead + 1
+    assert len(outbox) == 0
@@ -0,0 +1,111 @@
+"""
+Query-plan regression tests for the task board queries.
+
+Runs EXPLAIN on the queries issued by the task endpoints and fails when any of
+them would read `tasks` with a sequential scan, or stops using the index it was
+designed around. Sequential scans are disabled for the session so the planner
+picks an index whenever one can serve the query, which keeps the check
+meaningful on a small development database.
+
+Needs DATABASE_URL pointing at a database at `alembic upgrade head`.
+"""
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.api.v1.endpoints.tasks import (
+    TASK_SORT_KEYS, board_column_query, filter_tasks_query,
+)
+from app.core.pagination import paginate
+from app.models.task import Task
+
+
+def plan_checks() -> List[Tuple[str, Any, str]]:
+    """(name, statement, index the plan must use) for every tracked query."""
+    project_id, assignee_id = uuid.uuid4(), uuid.uuid4()
+    by_updated, by_due_date = TASK_SORT_KEYS
+
+    def tasks(**filters):
+        params = {"project_id": None, "assignee_id": None, "status": None, "priority": None}
+        params.update(filters)
+        return filter_tasks_query(select(Task), **params)
+
+    return [
+        (
+            "project tasks, newest first",
+            paginate(tasks(project_id=project_id), by_updated, None, 100),
+            "idx_tasks_project_updated",
+        ),
+        (
+            "project tasks by status, newest first",
+            paginate(tasks(project_id=project_id, status="in_progress"), by_updated, None, 100),
+            "idx_tasks_project_status_updated",
+        ),
+        (
+            "project tasks by assignee and status",
+            paginate(
+                tasks(project_id=project_id, assignee_id=assignee_id, status="todo"),
+                by_updated, None, 100,
+            ),
+            "idx_tasks_project_assignee_status",
+        ),
+        (
+            "assignee tasks by status, soonest due",
+            paginate(tasks(assignee_id=assignee_id, status="todo"), by_due_date, None, 100),
+            "idx_tasks_assignee_status_due_date",
+        ),
+        (
+            "kanban column",
+            board_column_query(project_id, "in_progress", 50),
+            "idx_tasks_board_column",
+        ),
+        (
+            "open overdue tasks",
+            select(Task.id).where(
+                Task.project_id == project_id,
+                Task.status != "done",
+                Task.due_date < datetime.utcnow(),
+            ),
+            "idx_tasks_open_due_date",
+        ),
+    ]
+
+
+def walk(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+@pytest.fixture
+async def connection(database_url):
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    async with engine.connect() as connection:
+        await connection.exec_driver_sql("SET enable_seqscan = off")
+        yield connection
+    await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "statement, expected_index",
+    [(statement, index) for _, statement, index in plan_checks()],
+    ids=[name for name, _, _ in plan_checks()],
+)
+async def test_task_query_uses_index(connection, statement, expected_index):
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes = list(walk(plan[0]["Plan"]))
+
+    seq_scans = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+    assert not seq_scans, f"sequential scan on {seq_scans}"
+    indexes = {node["Index Name"] for node in nodes if "Index Name" in node}
+    assert expected_index in indexes, f"plan used {sorted(indexes)}"
@@ -0,0 +1,44 @@
+"""
+Per-request SQL accounting (app.core.query_stats), through the engine events
+installed on the application's engine.
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.core.query_stats import QueryBudgetExceeded, track_queries
+from app.models import Task
+
+
+def task_query(task_id):
+    return select(Task.id).where(Task.id == task_id)
+
+
+async def test_identical_statement_raises_when_strict(db):
+    task_id = uuid4()
+    with track_queries(strict=True) as stats:
+        await db.execute(task_query(task_id))
+        # Same shape, other parameters: not a repeat
+        await db.execute(task_query(uuid4()))
+        with pytest.raises(QueryBudgetExceeded, match="identical statement repeated"):
+            await db.execute(task_query(task_id))
+    assert stats.duplicates == 1
+
+
+async def test_identical_statement_is_reported_once(db):
+    task_id = uuid4()
+    with track_queries() as stats:
+        for _ in range(3):
+            await db.execute(task_query(task_id))
+    assert stats.duplicates == 2
+    assert [reason for reason, _ in stats.problems] == ["identical statement repeated"]
+
+
+async def test_budget_and_repeat_threshold(db):
+    with track_queries(budget=2, repeat_threshold=3) as stats:
+        for _ in range(3):
+            await db.execute(task_query(uuid4()))
+    assert stats.queries == 3 and stats.max_repeats == 3
+    assert [reason for reason, _ in stats.problems] == ["more than 2 queries", "same statement run 3 times"]
@@ -0,0 +1,123 @@
+"""
+Read routing between the primary and a replica, using two local databases:
+the one at DATABASE_URL as the primary and a `<name>_replica` database created
+beside it as the replica. Each read reports which database served it and
+whether it may use the read cache.
+"""
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core import replicas
+from app.core.replicas import PRIMARY_COOKIE, ReadYourWritesMiddleware, ReplicaRouter, get_read_db, uses_read_cache
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/read")
+    async def read(request: Request, db: AsyncSession = Depends(get_read_db)):
+        return {
+            "database": await db.scalar(text("SELECT current_database()")),
+            "cached": uses_read_cache(request, db),
+        }
+
+    @app.post("/write")
+    async def write():
+        return {}
+
+    return app
+
+
+@pytest.fixture
+async def replica_url(database_url):
+    """A second, empty database on the same server."""
+    url = make_url(database_url)
+    replica = url.set(database=f"{url.database}_replica")
+    admin = create_async_engine(url, isolation_level="AUTOCOMMIT")
+    async with admin.connect() as connection:
+        exists = await connection.scalar(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": replica.database}
+        )
+        if not exists:
+            await connection.execute(text(f'CREATE DATABASE "{replica.database}"'))
+    await admin.dispose()
+    return replica.render_as_string(hide_password=False)
+
+
+@pytest.fixture
+async def router(monkeypatch, replica_url):
+    router = ReplicaRouter([replica_url])
+    await router.check_all()
+    monkeypatch.setattr(replicas, "replica_router", router)
+    yield router
+    await router.close()
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(app=build_app(), base_url="http://testserver") as client:
+        yield client
+
+
+async def read(client: httpx.AsyncClient) -> dict:
+    response = await client.get("/read")
+    assert response.status_code == 200
+    return response.json()
+
+
+async def served_by(client: httpx.AsyncClient) -> str:
+    return (await read(client))["database"]
+
+
+async def test_reads_go_to_the_replica(router, client, database_url, replica_url):
+    assert router.replicas[0].healthy
+    assert await served_by(client) == make_url(replica_url).database
+    assert await served_by(client) != make_url(database_url).database
+
+
+async def test_a_write_keeps_the_client_on_the_primary(router, client, database_url):
+    response = await client.post("/write")
+    assert PRIMARY_COOKIE in response.cookies
+    assert await served_by(client) == make_url(database_url).database
+
+    # Other clients still read from the replica
+    async with httpx.AsyncClient(app=build_app(), base_url="http://testserver") as other:
+        assert await served_by(other) != make_url(database_url).database
+
+
+async def test_only_primary_reads_use_the_read_cache(monkeypatch, router, client, database_url):
+    # Replica pages can miss writes the cache version already covers
+    assert await read(client) == {"database": make_url(router.replicas[0].name).database, "cached": False}
+
+    # A client that just wrote skips the cache even on the primary
+    await client.post("/write")
+    assert await read(client) == {"database": make_url(database_url).database, "cached": False}
+
+    client.cookies.clear()
+    monkeypatch.setattr(replicas, "replica_router", None)
+    assert await read(client) == {"database": make_url(database_url).database, "cached": True}
+
+
+async def test_failed_writes_set_no_cookie(router, client):
+    response = await client.post("/missing")
+    assert response.status_code == 404
+    assert PRIMARY_COOKIE not in response.cookies
+
+
+async def test_unhealthy_replica_falls_back_to_the_primary(monkeypatch, client, database_url):
+    unreachable = make_url(database_url).set(database="no_such_replica_database")
+    router = ReplicaRouter([unreachable.render_as_string(hide_password=False)])
+    await router.check_all()
+    monkeypatch.setattr(replicas, "replica_router", router)
+    try:
+        assert not router.replicas[0].healthy
+        assert router.pick() is None
+        assert await served_by(client) == make_url(database_url).database
+    finally:
+        await router.close()
@@ -0,0 +1,65 @@
+"""
+The automation scheduler's due-date window (app.services.automations.scheduler):
+tasks whose changes never reached the leader are picked up by the periodic
+rescan of the loaded window.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import Task
+from app.services.automations.scheduler import AutomationScheduler
+
+HOURS = 24.0
+
+
+@pytest.fixture
+def scheduler(monkeypatch, database_url, tenant):
+    monkeypatch.setattr(settings, "AUTOMATION_SCHEDULER_HORIZON_SECONDS", 3600)
+    monkeypatch.setattr(settings, "AUTOMATION_SCHEDULER_RESCAN_SECONDS", 300)
+    scheduler = AutomationScheduler(AsyncSessionLocal)
+    scheduler.leading = True
+    scheduler.offsets = {str(tenant.team_id): (HOURS,)}
+    return scheduler
+
+
+def timer(scheduler, task):
+    return scheduler.timers.timers.get(("task", str(task.id), HOURS))
+
+
+async def test_rescan_picks_up_unannounced_tasks(scheduler, db, tenant):
+    now = datetime.utcnow()
+    await scheduler.extend_window(now)
+    assert len(scheduler.timers) == 0
+
+    # Written without a message to the leader, like an import
+    task = Task(title="imported", project_id=tenant.project_id, due_date=now + timedelta(hours=HOURS, minutes=30))
+    db.add(task)
+    await db.commit()
+
+    assert await scheduler.rescan_window(now + timedelta(seconds=299)) == 0
+    assert timer(scheduler, task) is None
+
+    assert await scheduler.rescan_window(now + timedelta(seconds=300)) == 1
+    assert timer(scheduler, task)[1] == task.due_date - timedelta(hours=HOURS)
+    # Not again until the next interval
+    assert await scheduler.rescan_window(now + timedelta(seconds=301)) == 0
+
+
+async def test_rescan_moves_a_timer_whose_change_was_missed(scheduler, db, tenant):
+    now = datetime.utcnow()
+    task = Task(title="moved", project_id=tenant.project_id, due_date=now + timedelta(hours=HOURS, minutes=10))
+    db.add(task)
+    await db.commit()
+    await scheduler.extend_window(now)
+    assert len(scheduler.timers) == 1
+
+    task.due_date = now + timedelta(hours=HOURS, minutes=40)
+    await db.commit()
+    await scheduler.rescan_window(now + timedelta(seconds=300))
+
+    assert len(scheduler.timers) == 1
+    assert timer(scheduler, task)[1] == now + timedelta(minutes=40)
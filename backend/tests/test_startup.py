@@ -0,0 +1,49 @@
+"""
+Application startup (main.lifespan) with the database and Redis unreachable:
+services start anyway and retry their connections in the background.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import main
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import redis_client
+from app.services.automations.engine import AutomationEngine, get_automation_engine
+from app.services.jobs.queue import get_job_queue
+
+# Nothing listens on port 1
+UNREACHABLE_DATABASE_URL = "postgresql+asyncpg://nobody@127.0.0.1:1/nothing"
+
+
+@pytest.fixture
+async def unreachable(monkeypatch):
+    monkeypatch.setitem(redis_client.connection_pool.connection_kwargs, "port", 1)
+    engine = create_async_engine(UNREACHABLE_DATABASE_URL)
+    sessions = async_sessionmaker(engine)
+    monkeypatch.setattr(main, "AsyncSessionLocal", sessions)
+    yield sessions
+    await engine.dispose()
+    await redis_client.connection_pool.disconnect()
+
+
+async def test_lifespan_starts_without_database_or_redis(unreachable, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_BROKER", "redis")
+    monkeypatch.setattr(settings, "JOB_RUN_WORKERS", True)
+    monkeypatch.setattr(settings, "AUTOMATION_SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(settings, "OUTBOX_RUN_DISPATCHER", False)
+
+    async with main.lifespan(main.app):
+        engine = get_automation_engine()
+        assert not engine.loaded and len(engine.index) == 0
+        assert not get_job_queue().broker.groups_created
+
+
+async def test_rules_load_on_the_first_refresh_after_a_failed_load(unreachable, database_url):
+    engine = AutomationEngine()
+    with pytest.raises(OSError):
+        await engine.refresh(unreachable, force=True)
+    # Not held back by AUTOMATION_RELOAD_SECONDS, nor by an unchanged version
+    assert await engine.refresh(AsyncSessionLocal)
+    assert engine.loaded
@@ -0,0 +1,72 @@
+"""
+Single-task writes (POST/PUT /api/v1/tasks): bad values and unknown references
+are answered with 422/404 before anything is written, like the bulk endpoints.
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+
+import main
+from app.core.config import settings
+from app.models import Task
+
+
+@pytest.fixture
+async def client(monkeypatch, database_url):
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+    async with httpx.AsyncClient(app=main.app, base_url="http://testserver") as client:
+        yield client
+
+
+def later(days=3, tz=None):
+    return (datetime.now(tz) + timedelta(days=days)).replace(microsecond=0)
+
+
+async def test_create_checks_values_and_references(client, db, tenant):
+    project_id = str(tenant.project_id)
+    cases = [
+        ({"project_id": str(uuid4())}, 404, "Project not found"),
+        ({"project_id": project_id, "assignee_id": str(uuid4())}, 404, "Assignee not found"),
+        ({"project_id": project_id, "sprint_id": str(uuid4())}, 404, "Sprint not found in this project"),
+        ({"project_id": project_id, "due_date": "2000-01-01T00:00:00"}, 422, "Due date cannot be in the past"),
+    ]
+    for fields, status_code, detail in cases:
+        response = await client.post("/api/v1/tasks/", json={"title": "t", **fields})
+        assert (response.status_code, response.json()["detail"]) == (status_code, detail)
+    count = await db.scalar(select(func.count()).select_from(Task).where(Task.project_id == tenant.project_id))
+    assert count == 0
+
+    # Time-zone aware due dates are stored as naive UTC
+    due = later(tz=timezone(timedelta(hours=2)))
+    response = await client.post("/api/v1/tasks/", json={
+        "title": "t", "project_id": project_id, "sprint_id": str(tenant.sprint_id), "due_date": due.isoformat(),
+    })
+    assert response.status_code == 201
+    assert response.json()["due_date"] == due.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+async def test_update_checks_values_and_references(client, tenant):
+    created = await client.post("/api/v1/tasks/", json={"title": "t", "project_id": str(tenant.project_id)})
+    url = f"/api/v1/tasks/{created.json()['id']}"
+
+    cases = [
+        ({"title": None}, 422, "title cannot be null"),
+        ({"status": None, "priority": None}, 422, "status, priority cannot be null"),
+        ({"due_date": "2000-01-01T00:00:00"}, 422, "Due date cannot be in the past"),
+        ({"sprint_id": str(uuid4())}, 404, "Sprint not found in this project"),
+        ({"assignee_id": str(uuid4())}, 404, "Assignee not found"),
+    ]
+    for fields, status_code, detail in cases:
+        response = await client.put(url, json=fields)
+        assert (response.status_code, response.json()["detail"]) == (status_code, detail)
+
+    response = await client.put(url, json={
+        "sprint_id": str(tenant.sprint_id), "assignee_id": str(tenant.user_id),
+        "due_date": later(tz=timezone.utc).isoformat(),
+    })
+    assert response.status_code == 200
+    assert response.json()["sprint_id"] == str(tenant.sprint_id)
@@ -0,0 +1,59 @@
+"""
+Project and sprint task counts (app.models.base.TaskStatsMixin): from the
+rollup row, a query-time aggregate, or a loaded `tasks` collection, never
+from a lazy load.
+"""
+
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import Project, Sprint, Task
+
+
+async def add_tasks(db, tenant):
+    db.add_all([
+        Task(title="a", project_id=tenant.project_id, sprint_id=tenant.sprint_id, status="done"),
+        Task(title="b", project_id=tenant.project_id, sprint_id=tenant.sprint_id, status="todo"),
+        Task(title="c", project_id=tenant.project_id, status="done"),
+        Task(title="d", project_id=tenant.project_id, status="in_progress"),
+    ])
+    await db.commit()
+
+
+async def load(db, query):
+    return (await db.execute(query.execution_options(populate_existing=True))).unique().scalar_one()
+
+
+async def test_counts_aggregated_in_sql(db, tenant):
+    await add_tasks(db, tenant)
+
+    project = await load(db, Project.with_task_stats(select(Project).where(Project.id == tenant.project_id)))
+    assert "stats" not in project.__dict__ and "tasks" not in project.__dict__
+    assert (project.task_count, project.completion_percentage) == (4, 50)
+
+    sprint = await load(db, Sprint.with_task_stats(select(Sprint).where(Sprint.id == tenant.sprint_id)))
+    assert (sprint.task_count, sprint.completion_percentage) == (2, 50)
+
+
+async def test_counts_from_loaded_tasks(db, tenant):
+    await add_tasks(db, tenant)
+    project = await load(
+        db, select(Project).where(Project.id == tenant.project_id).options(selectinload(Project.tasks))
+    )
+    assert (project.task_count, project.completion_percentage) == (4, 50)
+
+
+async def test_counts_without_anything_loaded_do_not_raise(db, tenant, caplog):
+    project = await load(db, select(Project).where(Project.id == tenant.project_id))
+    with caplog.at_level(logging.WARNING, logger="app.models.base"):
+        assert (project.task_count, project.completion_percentage) == (0, 0)
+    assert "joinedload(Project.stats)" in caplog.text
+
+
+async def test_rollup_row_comes_first(db, tenant):
+    project = await load(
+        db, select(Project).where(Project.id == tenant.project_id).options(joinedload(Project.stats))
+    )
+    assert project.task_count == (project.stats.task_count if project.stats else 0)